@@ -1,4 +1,5 @@
 import os
+import logging
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -6,34 +7,49 @@ from openai import AsyncOpenAI
 from agents import Agent, Runner, OpenAIChatCompletionsModel, function_tool
 from agents.run import RunConfig
 from sqlalchemy import select
-from sqlalchemy.orm import Session
-from uni.database.connection import get_db
+from sqlalchemy.orm import contains_eager
 from uni.utils.security import verify_password
-from uni.database.connection import get_db, AsyncSessionLocal
+from uni.database.agent_session import agent_turn, tool_session
+from uni.utils.chat_history import ChatHistory
+from uni.utils.token_stream import TokenCoalescer
+from uni.utils.metrics import serve_metrics
+from uni.logics.agent_cache_logics import get_profile, set_profile
 from uni.models.users_table import User
 
 from uni.models.students_table import Student
-from fastapi import HTTPException, Depends
-from uni.logics.students_logics import create
+from fastapi import HTTPException
 from datetime import datetime, date
-from uni.schemas.students import StudentCreate
-import asyncio
 from openai.types.responses import ResponseTextDeltaEvent
 import chainlit as cl
 from typing import List, Dict, Optional
+from dataclasses import dataclass
 
+logger = logging.getLogger(__name__)
 
 gemini_api_key = os.getenv("GEMINI_API_KEY")
 ADMIN_EMAIL = os.getenv("ADMIN_EMAIL")
 ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD")
+# Any OpenAI-compatible endpoint; benchmarks/agent_eval.py points these at a
+# scripted local model
+AGENT_MODEL = os.getenv("AGENT_MODEL", "gemini-2.5-flash")
+AGENT_MODEL_BASE_URL = os.getenv(
+    "AGENT_MODEL_BASE_URL",
+    "https://generativelanguage.googleapis.com/v1beta/openai/",
+)
+# Tool, stream and cache metrics of this process (the API's /metrics only
+# has the API's own)
+AGENT_METRICS_PORT = int(os.getenv("AGENT_METRICS_PORT", "0"))
+
+if AGENT_METRICS_PORT:
+    serve_metrics(AGENT_METRICS_PORT)
 
 client = AsyncOpenAI(
     api_key=gemini_api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
+    base_url=AGENT_MODEL_BASE_URL,
 )
 
 model = OpenAIChatCompletionsModel(
-    model="gemini-2.5-flash",
+    model=AGENT_MODEL,
     openai_client=client,
 )
 
@@ -45,52 +61,49 @@ config = RunConfig(model=model, model_provider=client)
 async def get_my_profile(email: str):
     """Fetch ONLY the profile of the logged-in student using their email."""
 
-    generator = None
-    db = None
-
     try:
-        generator = get_db()
-        db = await anext(generator)
-
-        stmt = (
-            select(Student)
-            .join(User, Student.user_id == User.user_id)
-            .where(User.email == email)
-        )
+        async with tool_session("get_my_profile") as db:
+            # Repeated profile questions only check that nothing changed
+            profile = await get_profile(db, email)
+            if profile is not None:
+                return profile
+
+            stmt = (
+                select(Student)
+                .join(User, Student.user_id == User.user_id)
+                .options(contains_eager(Student.user))
+                .where(User.email == email)
+            )
 
-        result = await db.execute(stmt)
-        student = result.scalar_one_or_none()
-
-        if not student:
-            return "No record found for this email."
-
-        return {
-            "student_id": student.student_id,
-            "first_name": student.first_name,
-            "last_name": student.last_name,
-            "father_name": student.father_name,
-            "mother_name": student.mother_name,
-            "roll_number": student.roll_number,
-            "batch_id": student.batch_id,
-            "department_id": student.department_id,
-            "date_of_birth": str(student.date_of_birth),
-            "address": student.address,
-            "phone_number": student.phone_number,
-            "created_at": str(student.created_at),
-            "updated_at": str(student.updated_at),
-            "email": student.user.email,
-            "user_id": student.user_id,
-        }
+            result = await db.execute(stmt)
+            student = result.scalar_one_or_none()
+
+            if not student:
+                return "No record found for this email."
+
+            profile = {
+                "student_id": student.student_id,
+                "first_name": student.first_name,
+                "last_name": student.last_name,
+                "father_name": student.father_name,
+                "mother_name": student.mother_name,
+                "roll_number": student.roll_number,
+                "batch_id": student.batch_id,
+                "department_id": student.department_id,
+                "date_of_birth": str(student.date_of_birth),
+                "address": student.address,
+                "phone_number": student.phone_number,
+                "created_at": str(student.created_at),
+                "updated_at": str(student.updated_at),
+                "email": student.user.email,
+                "user_id": student.user_id,
+            }
+            set_profile(email, student, profile)
+            return profile
 
     except Exception as e:
         return f"Error fetching profile: {str(e)}"
 
-    finally:
-        if db:
-            await db.close()  # DB band kiya
-        if generator:
-            await generator.aclose()
-
 
 @function_tool
 async def add_student(
@@ -108,9 +121,13 @@ async def add_student(
     password: str,
 ):
     """Add a new student to the database."""
+    # Only admins ever call this tool, so the logics/schema imports (and
+    # email-validator behind StudentCreate) are deferred to the first call.
+    from uni.logics.students_logics import create
+    from uni.schemas.students import StudentCreate
 
     try:
-        async with AsyncSessionLocal() as db:
+        async with tool_session("add_student") as db:
             student = StudentCreate(
                 first_name=first_name,
                 last_name=last_name,
@@ -137,46 +154,77 @@ async def add_student(
 
 
 @function_tool
-async def students_data():
-    """Fetch all students from the Neon database with full details."""
-    generator = None
-    db = None
+async def students_data(
+    department_id: Optional[int] = None,
+    batch_id: Optional[int] = None,
+    roll_prefix: Optional[str] = None,
+    name: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+    page_size: int = 25,
+    after_student_id: Optional[int] = None,
+):
+    """List students matching the filters, one page at a time.
+
+    Args:
+        department_id: Only students of this department.
+        batch_id: Only students of this batch.
+        roll_prefix: Only roll numbers starting with this, e.g. "D01-B1".
+        name: Part of the first or last name.
+        fields: Columns to return (default: student_id, roll_number, first_name,
+            last_name, batch_id, department_id, email). Also available:
+            user_id, father_name, mother_name, date_of_birth, address,
+            phone_number, created_at, updated_at.
+        page_size: Rows per page, at most 100.
+        after_student_id: The "next_after" of the previous page.
+    """
+    from uni.logics.students_logics import search_students
+
     try:
-        generator = get_db()
-        db = await anext(generator)
-        data = []
-        result = await db.execute(select(Student))
-        for s in result.scalars().all():
-            data.append(
-                {
-                    "student_id": s.student_id,
-                    "first_name": s.first_name,
-                    "last_name": s.last_name,
-                    "father_name": s.father_name,
-                    "mother_name": s.mother_name,
-                    "roll_number": s.roll_number,
-                    "batch_id": s.batch_id,
-                    "department_id": s.department_id,
-                    "date_of_birth": str(s.date_of_birth),
-                    "address": s.address,
-                    "phone_number": s.phone_number,
-                    "created_at": str(s.created_at),
-                    "updated_at": str(s.updated_at),
-                    "email": s.user.email,
-                    "user_id": s.user_id,
-                }
+        async with tool_session("students_data") as db:
+            return await search_students(
+                db,
+                department_id,
+                batch_id,
+                roll_prefix,
+                name,
+                fields,
+                page_size,
+                after_student_id,
             )
-        return data
+    except HTTPException as e:
+        return {"status": "error", "detail": e.detail}
+    except Exception as e:
+        return {"status": "error", "detail": f"Error fetching students: {str(e)}"}
+
+
+@function_tool
+async def students_summary(
+    department_id: Optional[int] = None,
+    batch_id: Optional[int] = None,
+    roll_prefix: Optional[str] = None,
+    name: Optional[str] = None,
+    group_by: Optional[str] = None,
+):
+    """Count students matching the filters without fetching them.
 
+    Args:
+        department_id: Only students of this department.
+        batch_id: Only students of this batch.
+        roll_prefix: Only roll numbers starting with this.
+        name: Part of the first or last name.
+        group_by: "department" or "batch" to get a count per group.
+    """
+    from uni.logics.students_logics import count_students
+
+    try:
+        async with tool_session("students_summary") as db:
+            return await count_students(
+                db, department_id, batch_id, roll_prefix, name, group_by
+            )
+    except HTTPException as e:
+        return {"status": "error", "detail": e.detail}
     except Exception as e:
-        raise HTTPException(
-            status_code=500, detail=f"Error fetching students: {str(e)}"
-        )
-    finally:
-        if db:
-            await db.close()
-        if generator:
-            await generator.aclose()
+        return {"status": "error", "detail": f"Error counting students: {str(e)}"}
 
 
 @cl.password_auth_callback
@@ -191,14 +239,10 @@ async def auth_callback(username: str, password: str):
                 "user_id": "admin_100",
             },
         )
-    generator = None
-    db = None
-
     try:
-        generator = get_db()
-        db = await anext(generator)
-        result = await db.execute(select(User).where(User.email == username))
-        user = result.scalar_one_or_none()
+        async with tool_session("auth_callback") as db:
+            result = await db.execute(select(User).where(User.email == username))
+            user = result.scalar_one_or_none()
 
         if user and verify_password(password, user.password):
             return cl.User(
@@ -212,37 +256,31 @@ async def auth_callback(username: str, password: str):
             )
         return None
 
-    except Exception as e:
-        print(f"Login Error: {e}")
+    except Exception:
+        logger.exception("Login failed for %s", username)
         return None
-    finally:
-        if db:
-            await db.close()
-        if generator:
-            await generator.aclose()
 
 
-final_instructions = ""
-tools_list = []
+# -------------------- Agents (built once per role) -------------------- #
+@dataclass
+class ChatUser:
+    """Per-user fields, passed to the run as its context."""
 
+    name: str
+    role: str
+    email: str
 
-@cl.on_chat_start
-async def on_chat_start():
-    user = cl.user_session.get("user")
-    user_role = user.metadata.get("role", "student")
-    user_name = user.metadata.get("name", "User")
-    user_email = user.metadata.get("email", user.identifier)
 
-    base_instructions = f"""
+BASE_INSTRUCTIONS = """
     You are a specialized Student Management System Agent talking to {user_name}.
-    Current User Role: {user_role.upper()}.
+    Current User Role: {role}.
     Your email/identifier is: {user_email}.
 
     🔴 **CRITICAL SYSTEM RULES (MUST FOLLOW):**
     1. **STRICT SCOPE:** You are NOT a general AI assistant. You are ONLY a database interface.
     2. **OFF-TOPIC REFUSAL:** If the user asks about anything unrelated to Student Records (e.g., weather, coding, general knowledge, jokes, writing emails), you MUST politely refuse.
        - *Example Response:* "I am restricted to Student Management tasks only."
-    3. **ROLE ADHERENCE:** Do NOT perform any action that is not explicitly allowed for the role "{user_role.upper()}".
+    3. **ROLE ADHERENCE:** Do NOT perform any action that is not explicitly allowed for the role "{role}".
     4. **DATA PRIVACY:** Do NOT share or expose any sensitive data.
     5. RESPONSE FORMAT: Always reply in the same language, tone, and writing style as the user, never use Hindi, always use Roman Urdu unless the user writes pure Urdu (then you may reply in pure Urdu).
     6. ALWAYS think step-by-step before answering.
@@ -252,8 +290,8 @@ async def on_chat_start():
     10. Display all  data in a clean, structured format with proper labels and line breaks, showing only the logged-in student's information, and respond in a friendly, readable style.
 """
 
-    if user_role == "admin":
-        specific_instructions = """
+ROLE_INSTRUCTIONS = {
+    "admin": """
         You are a strict and reliable ADMIN. Follow these rules:
         1. Your responsibilities:
            - Add a student record
@@ -270,12 +308,11 @@ async def on_chat_start():
         5. Never add a student without full details and explicit confirmation.
         6. Always confirm before deleting or updating  any student record.
         7. When showing student data, present it in a clear, structured format.
-        """
-
-        tools_list = [students_data, add_student]
-
-    elif user_role == "student":
-        specific_instructions = f"""
+        8. For "how many" questions use students_summary, never count rows yourself.
+        9. students_data returns one page: narrow it with filters and fields, and
+           only fetch the next page (after_student_id) when the user asks for more.
+        """,
+    "student": """
         You are a STUDENT. Your access is RESTRICTED.
         
         RULES:
@@ -288,50 +325,103 @@ async def on_chat_start():
         - ONLY show the record where the 'email' matches exactly with: "{user_email}".
         - If no record matches your email, say "No record found for your account."
         
-        """
-
-        tools_list = [get_my_profile]
-
-    elif user_role == "teacher":
-        specific_instructions = """
+        """,
+    "teacher": """
         You are a TEACHER.
         Currently, you do not have permission to access this system.
         Politely inform the user that Teacher access is coming soon.
         Do NOT run any tools.
-        """
-
-        tools_list = []
-
-    else:
-        specific_instructions = "You have no access."
-        tools_list = []
+        """,
+}
+NO_ACCESS_INSTRUCTIONS = "You have no access."
+
+ROLE_TOOLS = {
+    "admin": [students_data, students_summary, add_student],
+    "student": [get_my_profile],
+    "teacher": [],
+}
+
+
+def build_agent(role: str = None) -> Agent:
+    """The agent of one role; only the user fields are filled in per run."""
+    template = (
+        BASE_INSTRUCTIONS
+        + "\n"
+        + ROLE_INSTRUCTIONS.get(role, NO_ACCESS_INSTRUCTIONS)
+    )
 
-    final_instructions = base_instructions + "\n" + specific_instructions
+    def instructions(run_context, agent) -> str:
+        user = run_context.context
+        return template.format(
+            user_name=user.name, role=user.role.upper(), user_email=user.email
+        )
 
-    agent = Agent(
+    return Agent(
         name="Student Management Agent",
-        instructions=final_instructions,
+        instructions=instructions,
         model=model,
-        tools=tools_list,
+        tools=ROLE_TOOLS.get(role, []),
+    )
+
+
+# Built at import so a chat start only looks its agent up
+ROLE_AGENTS = {role: build_agent(role) for role in ROLE_INSTRUCTIONS}
+NO_ACCESS_AGENT = build_agent()
+
+
+@cl.on_chat_start
+async def on_chat_start():
+    user = cl.user_session.get("user")
+    chat_user = ChatUser(
+        name=user.metadata.get("name", "User"),
+        role=user.metadata.get("role", "student"),
+        email=user.metadata.get("email", user.identifier),
+    )
+
+    cl.user_session.set("chat_user", chat_user)
+    cl.user_session.set(
+        "current_agent", ROLE_AGENTS.get(chat_user.role, NO_ACCESS_AGENT)
     )
-    cl.user_session.set("current_agent", agent)
-    cl.user_session.set("history", [])
+    cl.user_session.set("history", ChatHistory())
 
     await cl.Message(
-        content=f"Welcome {user_name}! You are logged in as {user_role.upper()}. How can I help you?"
+        content=f"Welcome {chat_user.name}! You are logged in as {chat_user.role.upper()}. How can I help you?"
     ).send()
 
 
-@cl.on_message
-async def main(message: cl.Message):
-    history = cl.user_session.get("history", [])
+async def stream_turn(agent, history, chat_user, send_token):
+    """Run the agent on the history and stream the reply through send_token.
+
+    The history must already hold the user's message; the run's items are
+    added to it afterwards.
+    """
+    # Every tool called during this turn shares the one session
+    async with agent_turn():
+        result = Runner.run_streamed(
+            agent,
+            history.input_items(),
+            context=chat_user,
+        )
+
+        async for event in result.stream_events():
+            if event.type == "raw_response_event" and isinstance(
+                event.data, ResponseTextDeltaEvent
+            ):
+                await send_token(event.data.delta)
+
+    # Tool calls and outputs stay in the history too; stale outputs are
+    # trimmed and old turns summarized to stay inside the token budget
+    history.add_items(item.to_input_item() for item in result.new_items)
+    history.end_turn()
+    return result
 
-    history.append({"role": "user", "content": message.content})
 
-    formatted_history = []
-    for msg in history:
-        role = "user" if msg["role"] == "user" else "assistant"
-        formatted_history.append({"role": role, "content": msg["content"]})
+@cl.on_message
+async def main(message: cl.Message):
+    history = cl.user_session.get("history")
+    if history is None:
+        history = ChatHistory()
+        cl.user_session.set("history", history)
 
     current_agent = cl.user_session.get("current_agent")
 
@@ -341,20 +431,18 @@ async def main(message: cl.Message):
         ).send()
         return
 
-    result = Runner.run_streamed(current_agent, formatted_history)
+    history.add_user(message.content)
 
     msg = cl.Message(content="")
     await msg.send()
 
-    async for event in result.stream_events():
-        if event.type == "raw_response_event" and isinstance(
-            event.data, ResponseTextDeltaEvent
-        ):
-            token = event.data.delta
-
-            await msg.stream_token(token)
+    # Deltas are merged into fewer websocket frames (see token_stream.py)
+    stream = TokenCoalescer(msg.stream_token)
+    try:
+        await stream_turn(
+            current_agent, history, cl.user_session.get("chat_user"), stream.push
+        )
+    finally:
+        await stream.close()
 
     await msg.update()
-
-    history.append({"role": "assistant", "content": msg.content})
-    cl.user_session.set("history", history)
@@ -0,0 +1,61 @@
+"""semester aware teaching assignments
+
+Revision ID: 8d4f2b6a1e07
+Revises: 5c1e7a9d3b20
+Create Date: 2026-10-19 13:40:07.291634
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d4f2b6a1e07'
+down_revision: Union[str, Sequence[str], None] = '5c1e7a9d3b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('batches', sa.Column('current_semester', sa.Integer(), server_default='1', nullable=False))
+    # Existing batches are in the latest semester they have teachers for, so
+    # the assignments they already have keep granting access.
+    op.execute(
+        "UPDATE batches SET current_semester = ("
+        " SELECT COALESCE(MAX(ta.semester), 1) FROM teaching_assignments ta"
+        " WHERE ta.batch_id = batches.batch_id)"
+    )
+    # Assignments made before semesters were tracked belong to that term
+    op.execute(
+        "UPDATE teaching_assignments SET semester = ("
+        " SELECT b.current_semester FROM batches b"
+        " WHERE b.batch_id = teaching_assignments.batch_id)"
+        " WHERE semester IS NULL"
+    )
+    op.create_index('ix_teaching_assignments_semester_teacher', 'teaching_assignments', ['semester', 'teacher_id'], unique=False)
+    op.create_table(
+        'teaching_assignment_history',
+        sa.Column('assignment_id', sa.Integer(), nullable=False),
+        sa.Column('teacher_id', sa.Integer(), nullable=False),
+        sa.Column('department_id', sa.Integer(), nullable=False),
+        sa.Column('batch_id', sa.Integer(), nullable=False),
+        sa.Column('semester', sa.Integer(), nullable=True),
+        sa.Column('subject_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('archived_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('assignment_id'),
+    )
+    op.create_index(op.f('ix_teaching_assignment_history_batch_id'), 'teaching_assignment_history', ['batch_id'], unique=False)
+    op.create_index('ix_teaching_assignment_history_semester_teacher', 'teaching_assignment_history', ['semester', 'teacher_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_teaching_assignment_history_semester_teacher', table_name='teaching_assignment_history')
+    op.drop_index(op.f('ix_teaching_assignment_history_batch_id'), table_name='teaching_assignment_history')
+    op.drop_table('teaching_assignment_history')
+    op.drop_index('ix_teaching_assignments_semester_teacher', table_name='teaching_assignments')
+    op.drop_column('batches', 'current_semester')
@@ -0,0 +1,105 @@
+"""partition results by academic term
+
+Revision ID: b7e3c9a4d512
+Revises: 8d4f2b6a1e07
+Create Date: 2026-10-19 15:02:33.870412
+
+Adds results.term, the academic term of exam_date (uni/utils/terms.py, with
+the ACADEMIC_TERM_START_MONTHS in effect), and on Postgres rebuilds results as
+a LIST-partitioned table with one partition per term present plus a default
+partition, copying the rows over. Later terms are added with
+``python -m uni.database.partitions``. Takes an exclusive lock on results
+while it copies.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from uni.utils.terms import term_expression
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e3c9a4d512'
+down_revision: Union[str, Sequence[str], None] = '8d4f2b6a1e07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXED_COLUMNS = (
+    'result_id',
+    'student_id',
+    'subject_id',
+    'batch_id',
+    'department_id',
+    'semester',
+    'term',
+    'exam_type',
+    'grade',
+    'exam_date',
+)
+FOREIGN_KEYS = (
+    ('student_id', 'students'),
+    ('subject_id', 'subjects'),
+    ('batch_id', 'batches'),
+    ('department_id', 'departments'),
+)
+
+
+def _rebuild(old_name: str, partitioned: bool) -> None:
+    """Recreate results from ``old_name`` with the same columns and defaults."""
+    op.execute(f'ALTER TABLE results RENAME TO {old_name}')
+    op.execute(f'ALTER TABLE {old_name} RENAME CONSTRAINT results_pkey TO {old_name}_pkey')
+    for column in INDEXED_COLUMNS:
+        op.execute(f'DROP INDEX IF EXISTS ix_results_{column}')
+
+    op.execute(
+        f'CREATE TABLE results (LIKE {old_name} INCLUDING DEFAULTS)'
+        + (' PARTITION BY LIST (term)' if partitioned else '')
+    )
+    op.create_primary_key(
+        'results_pkey', 'results', ['result_id', 'term'] if partitioned else ['result_id']
+    )
+    for column, table in FOREIGN_KEYS:
+        op.create_foreign_key(
+            f'results_{column}_fkey', 'results', table, [column], [column], ondelete='CASCADE'
+        )
+    for column in INDEXED_COLUMNS:
+        op.create_index(op.f(f'ix_results_{column}'), 'results', [column], unique=False)
+
+    if partitioned:
+        terms = op.get_bind().execute(
+            sa.text(f'SELECT DISTINCT term FROM {old_name} ORDER BY term')
+        ).scalars().all()
+        for term in terms:
+            op.execute(
+                f'CREATE TABLE results_t{int(term)} PARTITION OF results '
+                f'FOR VALUES IN ({int(term)})'
+            )
+        op.execute('CREATE TABLE results_default PARTITION OF results DEFAULT')
+
+    op.execute(f'INSERT INTO results SELECT * FROM {old_name}')
+    op.execute('ALTER SEQUENCE IF EXISTS results_result_id_seq OWNED BY results.result_id')
+    op.execute(f'DROP TABLE {old_name}')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('results', sa.Column('term', sa.Integer(), nullable=True))
+    results = sa.table('results', sa.column('term'), sa.column('exam_date'))
+    op.execute(results.update().values(term=term_expression(results.c.exam_date)))
+    with op.batch_alter_table('results') as batch_op:
+        batch_op.alter_column('term', existing_type=sa.Integer(), nullable=False)
+
+    if op.get_bind().dialect.name != 'postgresql':
+        op.create_index(op.f('ix_results_term'), 'results', ['term'], unique=False)
+        return
+    _rebuild('results_unpartitioned', partitioned=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        _rebuild('results_partitioned', partitioned=False)
+    op.drop_index(op.f('ix_results_term'), table_name='results')
+    with op.batch_alter_table('results') as batch_op:
+        batch_op.drop_column('term')
@@ -0,0 +1,51 @@
+"""add results archive
+
+Revision ID: e2a8f61c9d47
+Revises: b7e3c9a4d512
+Create Date: 2026-10-19 16:21:54.118305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a8f61c9d47'
+down_revision: Union[str, Sequence[str], None] = 'b7e3c9a4d512'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'results_archive',
+        sa.Column('result_id', sa.Integer(), nullable=False),
+        sa.Column('student_id', sa.Integer(), nullable=False),
+        sa.Column('subject_id', sa.Integer(), nullable=False),
+        sa.Column('batch_id', sa.Integer(), nullable=False),
+        sa.Column('department_id', sa.Integer(), nullable=False),
+        sa.Column('semester', sa.Integer(), nullable=False),
+        sa.Column('term', sa.Integer(), nullable=False),
+        sa.Column('exam_type', sa.String(), nullable=False),
+        sa.Column('marks_obtained', sa.Float(), nullable=False),
+        sa.Column('total_marks', sa.Float(), nullable=False),
+        sa.Column('grade', sa.String(), nullable=True),
+        sa.Column('exam_date', sa.DateTime(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('archived_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+        sa.Column('job_id', sa.Integer(), nullable=True),
+        sa.PrimaryKeyConstraint('result_id'),
+    )
+    op.create_index('ix_results_archive_student_semester', 'results_archive', ['student_id', 'semester'], unique=False)
+    op.create_index(op.f('ix_results_archive_job_id'), 'results_archive', ['job_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_results_archive_job_id'), table_name='results_archive')
+    op.drop_index('ix_results_archive_student_semester', table_name='results_archive')
+    op.drop_table('results_archive')
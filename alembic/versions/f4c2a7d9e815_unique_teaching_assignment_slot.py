@@ -0,0 +1,65 @@
+"""unique teaching assignment slot
+
+Revision ID: f4c2a7d9e815
+Revises: e2a8f61c9d47
+Create Date: 2026-10-19 18:05:12.640931
+
+Only one teacher can hold a subject of a batch in a semester. Duplicate
+slots already in the table keep their oldest assignment; the others are
+moved to teaching_assignment_history first. The history's teacher_id,
+department_id and subject_id become nullable, as in teaching_assignments,
+so duplicates that lost their teacher or department are archived too.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4c2a7d9e815'
+down_revision: Union[str, Sequence[str], None] = 'e2a8f61c9d47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DUPLICATES = (
+    'SELECT ta.assignment_id FROM teaching_assignments ta WHERE EXISTS ('
+    ' SELECT 1 FROM teaching_assignments kept'
+    ' WHERE kept.batch_id = ta.batch_id AND kept.subject_id = ta.subject_id'
+    ' AND kept.semester = ta.semester AND kept.assignment_id < ta.assignment_id)'
+)
+
+
+HISTORY_NULLABLE = ('teacher_id', 'department_id', 'subject_id')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('teaching_assignment_history') as batch_op:
+        for column in HISTORY_NULLABLE:
+            batch_op.alter_column(column, existing_type=sa.Integer(), nullable=True)
+    op.execute(
+        'INSERT INTO teaching_assignment_history'
+        ' (assignment_id, teacher_id, department_id, batch_id, semester, subject_id, created_at)'
+        ' SELECT assignment_id, teacher_id, department_id, batch_id, semester, subject_id, created_at'
+        f' FROM teaching_assignments WHERE assignment_id IN ({DUPLICATES})'
+    )
+    op.execute(f'DELETE FROM teaching_assignments WHERE assignment_id IN ({DUPLICATES})')
+    with op.batch_alter_table('teaching_assignments') as batch_op:
+        batch_op.create_unique_constraint(
+            'uq_teaching_assignments_slot', ['batch_id', 'subject_id', 'semester']
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('teaching_assignments') as batch_op:
+        batch_op.drop_constraint('uq_teaching_assignments_slot', type_='unique')
+    # History rows with gaps cannot go back under NOT NULL
+    op.execute(
+        'DELETE FROM teaching_assignment_history WHERE '
+        + ' OR '.join(f'{column} IS NULL' for column in HISTORY_NULLABLE)
+    )
+    with op.batch_alter_table('teaching_assignment_history') as batch_op:
+        for column in HISTORY_NULLABLE:
+            batch_op.alter_column(column, existing_type=sa.Integer(), nullable=False)
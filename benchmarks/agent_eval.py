@@ -0,0 +1,240 @@
+"""Offline end-to-end timing of the chat agent against a scripted model.
+
+Replays the chat transcripts in ``benchmarks/agent_transcripts.json`` through
+``agent.stream_turn`` (``Runner.run_streamed`` with the real tools, history
+and shared tool session) while the model is ``benchmarks/fake_llm.py``
+serving scripted tool calls and streamed text on a local port. The tools hit
+the database in ``STUDENT_DB_URL``, seeded by ``benchmarks/seed.py``, whose
+manifest fills the ``{student_email}``-style placeholders of the transcripts.
+
+Reports per turn and per scenario: time to first token, tool latency, DB
+time and statements of the tools, model round trips and total turn time.
+Since the model's latency is fixed by the script, a change in these numbers
+between two commits is a change in the tools or the streaming loop.
+
+    python benchmarks/seed.py --create-tables --students-per-batch 20
+    python benchmarks/agent_eval.py [--scenario student_profile] [--repeat 5]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_llm import create_app, fill, Script  # noqa: E402
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_fake_model(script: Script, port: int):
+    """Serve the script on its own thread and event loop, off the agent's."""
+    import uvicorn
+
+    server = uvicorn.Server(
+        uvicorn.Config(
+            create_app(script), host="127.0.0.1", port=port, log_level="warning"
+        )
+    )
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            raise RuntimeError(f"fake model could not start on port {port}")
+        time.sleep(0.01)
+    return server, thread
+
+
+def placeholders(manifest: dict) -> dict:
+    return {
+        "student_email": manifest["student_emails"][0],
+        "student_roll": manifest["roll_numbers"][0],
+        "admin_email": manifest["admin_email"],
+        "batch_id": manifest["batches"][0]["batch_id"],
+    }
+
+
+def ms(seconds) -> float:
+    return round(seconds * 1000, 2) if seconds is not None else None
+
+
+async def run_turn(agent_module, current_agent, history, chat_user, turn, script):
+    from uni.utils.metrics import registry
+    from uni.utils.token_stream import TokenCoalescer
+
+    registry.reset()
+    requests_before = script.requests
+    started = time.perf_counter()
+    first_token = None
+    deltas = []
+
+    async def send_token(token):
+        nonlocal first_token
+        if first_token is None:
+            first_token = time.perf_counter()
+        deltas.append(token)
+
+    # Same coalescing as agent.main, so "frames" is what the client receives
+    stream = TokenCoalescer(send_token, record_metrics=False)
+    history.add_user(turn["user"])
+    try:
+        await agent_module.stream_turn(current_agent, history, chat_user, stream.push)
+    finally:
+        await stream.close()
+    elapsed = time.perf_counter() - started
+
+    tools = registry.snapshot("TOOL").items()
+    expected = next(
+        (step["text"] for step in reversed(turn["model"]) if "text" in step), None
+    )
+    return {
+        "ttft_ms": ms(first_token - started if first_token else None),
+        "turn_ms": ms(elapsed),
+        "model_requests": script.requests - requests_before,
+        "tool_calls": sum(t["count"] for _, t in tools),
+        "tool_errors": sum(t["count"] for key, t in tools if key[2] != "ok"),
+        "tool_ms": ms(sum(t["latency_s"] for _, t in tools)),
+        "db_ms": ms(sum(t["db_time_s"] for _, t in tools)),
+        "statements": sum(t["statements"] for _, t in tools),
+        "deltas": stream.deltas,
+        "frames": stream.frames,
+        "reply_matches": expected is None or "".join(deltas) == expected,
+    }
+
+
+async def run_scenario(agent_module, scenario, script):
+    from uni.logics.agent_cache_logics import tool_cache
+    from uni.utils.chat_history import ChatHistory
+
+    tool_cache.clear()  # every run starts cold
+    role = scenario["role"]
+    chat_user = agent_module.ChatUser(
+        name=role.title(), role=role, email=scenario["email"]
+    )
+    current_agent = agent_module.ROLE_AGENTS.get(role, agent_module.NO_ACCESS_AGENT)
+    history = ChatHistory()
+    return [
+        await run_turn(agent_module, current_agent, history, chat_user, turn, script)
+        for turn in scenario["turns"]
+    ]
+
+
+def summarize(scenario, runs) -> dict:
+    """Median of each number over the runs, per turn and for the scenario."""
+
+    def median(values):
+        values = [v for v in values if v is not None]
+        return round(statistics.median(values), 2) if values else None
+
+    turns = []
+    for index, turn in enumerate(scenario["turns"]):
+        samples = [run[index] for run in runs]
+        summary = {"user": turn["user"]}
+        for key in samples[0]:
+            if key == "reply_matches":
+                summary[key] = all(s[key] for s in samples)
+            else:
+                summary[key] = median(s[key] for s in samples)
+        turns.append(summary)
+    totals = {
+        key: median(sum(t[key] or 0 for t in run) for run in runs)
+        for key in ("turn_ms", "tool_ms", "db_ms", "tool_calls", "statements")
+    }
+    totals["ttft_ms_mean"] = median(
+        statistics.mean(t["ttft_ms"] for t in run if t["ttft_ms"] is not None)
+        for run in runs
+    )
+    totals["replies_match"] = all(t["reply_matches"] for t in turns)
+    return {"role": scenario["role"], "totals": totals, "turns": turns}
+
+
+async def run(args, scenarios, script):
+    import agent as agent_module
+    from uni.database.connection import engine
+
+    report = {}
+    try:
+        for scenario in scenarios:
+            runs = [
+                await run_scenario(agent_module, scenario, script)
+                for _ in range(args.repeat)
+            ]
+            report[scenario["name"]] = summarize(scenario, runs)
+    finally:
+        await engine.dispose()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline agent evaluation")
+    parser.add_argument(
+        "--transcripts", default=os.path.join(BENCH_DIR, "agent_transcripts.json")
+    )
+    parser.add_argument(
+        "--manifest", default=os.path.join(RESULTS_DIR, "seed_manifest.json")
+    )
+    parser.add_argument("--scenario", default="all")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--first-token-ms", type=float, default=300.0)
+    parser.add_argument("--chunk-ms", type=float, default=15.0)
+    parser.add_argument("--chunk-chars", type=int, default=12)
+    parser.add_argument("--output", help="also write the report to this file")
+    args = parser.parse_args()
+
+    with open(args.manifest) as f:
+        manifest = json.load(f)
+    with open(args.transcripts) as f:
+        scenarios = fill(json.load(f), placeholders(manifest))["scenarios"]
+    if args.scenario != "all":
+        scenarios = [s for s in scenarios if s["name"] == args.scenario]
+        if not scenarios:
+            parser.error(f"unknown scenario {args.scenario!r}")
+
+    script = Script(
+        {turn["user"]: turn["model"] for s in scenarios for turn in s["turns"]},
+        first_token_ms=args.first_token_ms,
+        chunk_ms=args.chunk_ms,
+        chunk_chars=args.chunk_chars,
+    )
+    port = free_port()
+    # agent.py reads these at import
+    os.environ["AGENT_MODEL_BASE_URL"] = f"http://127.0.0.1:{port}/v1"
+    os.environ["AGENT_MODEL"] = "fake-model"
+    os.environ.setdefault("GEMINI_API_KEY", "fake")
+    os.environ.setdefault("OPENAI_AGENTS_DISABLE_TRACING", "1")
+
+    server, thread = start_fake_model(script, port)
+    try:
+        report = {
+            "first_token_ms": args.first_token_ms,
+            "chunk_ms": args.chunk_ms,
+            "chunk_chars": args.chunk_chars,
+            "repeat": args.repeat,
+            "scenarios": asyncio.run(run(args, scenarios, script)),
+        }
+    finally:
+        server.should_exit = True
+        thread.join(timeout=5)
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
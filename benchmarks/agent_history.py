@@ -0,0 +1,133 @@
+"""Per-turn latency of the chat agent's history handling.
+
+Replays a synthetic chat against a stubbed model whose latency grows with the
+prompt (``--us-per-token``, a stand-in for prefill time) and compares:
+
+* ``rebuild`` - the old ``agent.main``: keep every message and rebuild the
+  formatted transcript each turn (tool outputs were never kept);
+* ``managed`` - ``ChatHistory`` with its token budget, which also keeps
+  recent tool calls and outputs.
+
+Reports the latency and prompt size of the turns at 10/50/200.
+
+    python benchmarks/agent_history.py [--turns 200] [--us-per-token 20]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from uni.utils.chat_history import ChatHistory, estimate_tokens  # noqa: E402
+
+CHECKPOINTS = (10, 50, 200)
+TOOL_ROW = '{"student_id": %d, "roll_number": "D01-B1-%04d", "first_name": "Ali", "last_name": "Khan", "batch_id": 1, "department_id": 1, "email": "d01-b1-%04d@seed.ums"}'
+
+
+class StubModel:
+    """Sleeps in proportion to the prompt and returns a canned turn."""
+
+    def __init__(self, us_per_token: float, rng):
+        self.us_per_token = us_per_token
+        self.rng = rng
+
+    async def run(self, turn: int, items):
+        prompt_tokens = sum(estimate_tokens(item) for item in items)
+        await asyncio.sleep(prompt_tokens * self.us_per_token / 1e6)
+        new_items = []
+        if turn % 2 == 0:  # every other turn looks students up
+            call_id = f"call_{turn}"
+            rows = ", ".join(TOOL_ROW % (i, i, i) for i in range(25))
+            new_items += [
+                {
+                    "type": "function_call",
+                    "call_id": call_id,
+                    "name": "students_data",
+                    "arguments": '{"batch_id": 1, "page_size": 25}',
+                },
+                {
+                    "type": "function_call_output",
+                    "call_id": call_id,
+                    "output": f'{{"students": [{rows}], "next_after": 25}}',
+                },
+            ]
+        reply = " ".join(
+            self.rng.choice(["student", "batch", "roll", "record", "ok", "haan"])
+            for _ in range(120)
+        )
+        new_items.append({"role": "assistant", "content": reply})
+        return prompt_tokens, new_items
+
+
+def user_message(turn: int) -> str:
+    return f"Turn {turn}: batch 1 ke students dikhao jin ka naam A se shuru ho"
+
+
+async def run_rebuild(model, turns):
+    history, samples = [], {}
+    for turn in range(1, turns + 1):
+        started = time.perf_counter()
+        history.append({"role": "user", "content": user_message(turn)})
+        formatted = [
+            {
+                "role": "user" if msg["role"] == "user" else "assistant",
+                "content": msg["content"],
+            }
+            for msg in history
+        ]
+        prompt_tokens, new_items = await model.run(turn, formatted)
+        history.append({"role": "assistant", "content": new_items[-1]["content"]})
+        samples[turn] = (time.perf_counter() - started, prompt_tokens)
+    return samples
+
+
+async def run_managed(model, turns, budget):
+    history, samples = ChatHistory(token_budget=budget), {}
+    for turn in range(1, turns + 1):
+        started = time.perf_counter()
+        history.add_user(user_message(turn))
+        prompt_tokens, new_items = await model.run(turn, history.input_items())
+        history.add_items(new_items)
+        history.end_turn()
+        samples[turn] = (time.perf_counter() - started, prompt_tokens)
+    return samples, history.compactions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Agent history benchmark")
+    parser.add_argument("--turns", type=int, default=max(CHECKPOINTS))
+    parser.add_argument("--us-per-token", type=float, default=20.0)
+    parser.add_argument("--budget", type=int, default=6000)
+    args = parser.parse_args()
+
+    rebuild = asyncio.run(
+        run_rebuild(StubModel(args.us_per_token, random.Random(1)), args.turns)
+    )
+    managed, compactions = asyncio.run(
+        run_managed(
+            StubModel(args.us_per_token, random.Random(1)), args.turns, args.budget
+        )
+    )
+
+    report = {"us_per_token": args.us_per_token, "budget": args.budget, "turns": {}}
+    for turn in CHECKPOINTS:
+        if turn > args.turns:
+            continue
+        report["turns"][turn] = {
+            name: {
+                "latency_ms": round(samples[turn][0] * 1000, 2),
+                "prompt_tokens": samples[turn][1],
+            }
+            for name, samples in (("rebuild", rebuild), ("managed", managed))
+        }
+    report["managed_compactions"] = compactions
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
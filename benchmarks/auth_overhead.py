@@ -0,0 +1,155 @@
+"""Per-request JWT verification cost, with and without the token cache.
+
+For each algorithm the measurement runs in a fresh process, with SECRET_KEY,
+JWT_PUBLIC_KEY and ALGORITHM set the way a deployment would (an HMAC secret
+for HS256, a generated private/public key pair for RS256 and ES256), and
+reports in microseconds:
+
+* ``miss_us`` - ``get_current_user`` on a token it has not seen (full
+  ``jwt.decode`` with signature check, plus the cache insert);
+* ``hit_us`` - the same tokens again, answered from the cache;
+* ``mixed_us`` / ``hit_rate`` - ``--users`` users making ``--requests``
+  requests each in random order, i.e. the steady state of a server.
+
+    python benchmarks/auth_overhead.py [--algorithms HS256 RS256 ES256]
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def key_pair(algorithm):
+    """(signing key, verification key) as the env vars would hold them."""
+    if algorithm.startswith("HS"):
+        secret = os.urandom(32).hex()
+        return secret, secret
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import ec, rsa
+
+    if algorithm.startswith("RS"):
+        private = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    elif algorithm.startswith("ES"):
+        curves = {"ES256": ec.SECP256R1, "ES384": ec.SECP384R1, "ES512": ec.SECP521R1}
+        private = ec.generate_private_key(curves[algorithm]())
+    else:
+        raise SystemExit(f"unsupported algorithm {algorithm}")
+    private_pem = private.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    public_pem = (
+        private.public_key()
+        .public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        .decode()
+    )
+    return private_pem, public_pem
+
+
+def timed(calls):
+    samples = []
+    for call in calls:
+        started = time.perf_counter()
+        call()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def us(samples):
+    return round(statistics.median(samples) * 1e6, 1)
+
+
+def measure(args):
+    """Runs in the child process, configured through the environment."""
+    from datetime import timedelta
+    from uni.utils import security
+
+    rng = random.Random(1)
+    tokens = [
+        security.create_access_token(
+            {"email": f"user{i}@seed.ums", "user_id": i, "user_role": "student"},
+            expires_delta=timedelta(hours=1),
+        )
+        for i in range(args.users)
+    ]
+    miss = timed(
+        lambda token=token: security.get_current_user(token) for token in tokens
+    )
+    hit = timed(
+        lambda token=token: security.get_current_user(token) for token in tokens
+    )
+
+    security._verified_tokens.clear()
+    cache = security._verified_tokens
+    hits_before, misses_before = cache.hits, cache.misses
+    requests = [token for token in tokens for _ in range(args.requests)]
+    rng.shuffle(requests)
+    mixed = timed(
+        lambda token=token: security.get_current_user(token) for token in requests
+    )
+    hits, misses = cache.hits - hits_before, cache.misses - misses_before
+    return {
+        "miss_us": us(miss),
+        "hit_us": us(hit),
+        "speedup": round(statistics.median(miss) / statistics.median(hit), 1),
+        "mixed_us": round(statistics.mean(mixed) * 1e6, 1),
+        "hit_rate": round(hits / (hits + misses), 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JWT verification overhead")
+    parser.add_argument("--algorithms", nargs="+", default=["HS256", "RS256", "ES256"])
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(args)))
+        return
+
+    report = {"users": args.users, "requests_per_user": args.requests}
+    for algorithm in args.algorithms:
+        signing_key, verification_key = key_pair(algorithm)
+        env = {
+            **os.environ,
+            "SECRET_KEY": signing_key,
+            "JWT_PUBLIC_KEY": verification_key,
+            "ALGORITHM": algorithm,
+        }
+        output = subprocess.run(
+            [
+                sys.executable,
+                os.path.abspath(__file__),
+                "--child",
+                algorithm,
+                "--users",
+                str(args.users),
+                "--requests",
+                str(args.requests),
+            ],
+            env=env,
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        report[algorithm] = json.loads(output.strip().splitlines()[-1])
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Cold-start benchmark for the UMS API.
+
+Each run starts a fresh interpreter and measures:
+
+* ``import_ms``  - time to ``import uni.main`` (module graph only)
+* ``startup_ms`` - time for the app lifespan to finish (DB warm-up and the
+  autocomplete index build); needs STUDENT_DB_URL to point at a reachable DB
+* ``ready_ms``   - both together, i.e. when a worker would report ready
+
+    python benchmarks/cold_start.py --runs 5 [--import-only]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import asyncio, json, time
+started = time.perf_counter()
+from uni.main import app
+imported = time.perf_counter()
+startup = None
+if not {import_only}:
+    async def run():
+        async with app.router.lifespan_context(app):
+            return time.perf_counter()
+    startup = asyncio.run(run())
+print(json.dumps({{
+    "import_ms": (imported - started) * 1000,
+    "startup_ms": (startup - imported) * 1000 if startup else None,
+    "ready_ms": ((startup or imported) - started) * 1000,
+}}))
+"""
+
+
+def summarize(values):
+    values = [v for v in values if v is not None]
+    if not values:
+        return None
+    return {
+        "min": round(min(values), 1),
+        "median": round(statistics.median(values), 1),
+        "max": round(max(values), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="UMS cold-start benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--import-only", action="store_true", help="skip the DB warm-up phase"
+    )
+    args = parser.parse_args()
+
+    code = CHILD.format(import_only=args.import_only)
+    samples = []
+    for _ in range(args.runs):
+        proc = subprocess.run(
+            [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True
+        )
+        if proc.returncode:
+            sys.exit(proc.stderr)
+        samples.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+    print(
+        json.dumps(
+            {
+                "runs": args.runs,
+                **{
+                    key: summarize([sample[key] for sample in samples])
+                    for key in ("import_ms", "startup_ms", "ready_ms")
+                },
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+"""A scripted, OpenAI-compatible chat completions server for offline runs.
+
+Serves ``POST /v1/chat/completions`` (streamed or not) from a script instead
+of a real model, so ``agent.py`` can be exercised end to end without network
+access or an API key. A script maps the text of a user message to the steps
+the model takes for it, in order::
+
+    {
+      "How many students are in D01-B1?": [
+        {"tool_calls": [{"name": "students_summary",
+                         "arguments": {"batch_id": 1}}]},
+        {"text": "D01-B1 mein 20 students hain."}
+      ]
+    }
+
+The step to answer with is the number of assistant tool-call messages after
+the last user message, i.e. step 0 answers the user and step N the Nth round
+of tool outputs. Unknown messages get a short canned reply.
+
+Latency is simulated per response: ``first_token_ms`` before the first chunk
+and ``chunk_ms`` between text chunks of ``chunk_chars`` characters (a step
+may override any of them).
+
+    python benchmarks/fake_llm.py --script transcripts.json --port 8081
+    AGENT_MODEL_BASE_URL=http://127.0.0.1:8081/v1 GEMINI_API_KEY=fake \\
+        chainlit run agent.py
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI, Request  # noqa: E402
+from fastapi.responses import StreamingResponse  # noqa: E402
+from uni.utils.chat_history import estimate_tokens  # noqa: E402
+
+DEFAULT_REPLY = "Theek hai."
+
+
+def _content_text(content) -> str:
+    if isinstance(content, list):
+        return "".join(
+            part.get("text", "") for part in content if isinstance(part, dict)
+        )
+    return content or ""
+
+
+class Script:
+    """Model steps per user message, plus the simulated latency."""
+
+    def __init__(
+        self,
+        steps: dict,
+        first_token_ms: float = 300.0,
+        chunk_ms: float = 15.0,
+        chunk_chars: int = 12,
+    ):
+        self.steps = {" ".join(text.split()): turn for text, turn in steps.items()}
+        self.first_token_ms = first_token_ms
+        self.chunk_ms = chunk_ms
+        self.chunk_chars = chunk_chars
+        self.requests = 0
+
+    def step_for(self, messages) -> dict:
+        last_user = max(
+            (i for i, m in enumerate(messages) if m.get("role") == "user"),
+            default=None,
+        )
+        if last_user is None:
+            return {"text": DEFAULT_REPLY}
+        text = " ".join(_content_text(messages[last_user].get("content")).split())
+        rounds = sum(
+            1
+            for m in messages[last_user + 1 :]
+            if m.get("role") == "assistant" and m.get("tool_calls")
+        )
+        turn = self.steps.get(text, [])
+        return turn[rounds] if rounds < len(turn) else {"text": DEFAULT_REPLY}
+
+
+def _chunk(completion_id, model, created, delta=None, finish_reason=None, usage=None):
+    chunk = {
+        "id": completion_id,
+        "object": "chat.completion.chunk",
+        "created": created,
+        "model": model,
+        "choices": (
+            []
+            if delta is None
+            else [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+        ),
+    }
+    if usage is not None:
+        chunk["usage"] = usage
+    return f"data: {json.dumps(chunk)}\n\n"
+
+
+def _tool_calls(step):
+    return [
+        {
+            "id": call.get("id") or f"call_{uuid.uuid4().hex[:12]}",
+            "type": "function",
+            "function": {
+                "name": call["name"],
+                "arguments": json.dumps(call.get("arguments", {})),
+            },
+        }
+        for call in step.get("tool_calls", [])
+    ]
+
+
+def _usage(messages, step) -> dict:
+    prompt = sum(
+        estimate_tokens({"content": _content_text(m.get("content"))})
+        for m in messages
+    )
+    completion = estimate_tokens(step.get("text", "")) if "text" in step else 10
+    return {
+        "prompt_tokens": prompt,
+        "completion_tokens": completion,
+        "total_tokens": prompt + completion,
+    }
+
+
+def create_app(script: Script) -> FastAPI:
+    app = FastAPI(title="Fake LLM")
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        script.requests += 1
+        messages = body.get("messages", [])
+        step = script.step_for(messages)
+        model = body.get("model", "fake")
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:16]}"
+        created = int(time.time())
+        tool_calls = _tool_calls(step)
+        usage = _usage(messages, step)
+        first_token_ms = step.get("first_token_ms", script.first_token_ms)
+        chunk_ms = step.get("chunk_ms", script.chunk_ms)
+        chunk_chars = step.get("chunk_chars", script.chunk_chars)
+
+        if not body.get("stream"):
+            await asyncio.sleep(first_token_ms / 1000)
+            message = {"role": "assistant", "content": step.get("text")}
+            if tool_calls:
+                message["tool_calls"] = tool_calls
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": message,
+                        "finish_reason": "tool_calls" if tool_calls else "stop",
+                    }
+                ],
+                "usage": usage,
+            }
+
+        async def events():
+            await asyncio.sleep(first_token_ms / 1000)
+            yield _chunk(completion_id, model, created, {"role": "assistant"})
+            text = step.get("text", "")
+            for start in range(0, len(text), chunk_chars):
+                if start:
+                    await asyncio.sleep(chunk_ms / 1000)
+                yield _chunk(
+                    completion_id,
+                    model,
+                    created,
+                    {"content": text[start : start + chunk_chars]},
+                )
+            for index, call in enumerate(tool_calls):
+                yield _chunk(
+                    completion_id,
+                    model,
+                    created,
+                    {"tool_calls": [{"index": index, **call}]},
+                )
+            yield _chunk(
+                completion_id,
+                model,
+                created,
+                {},
+                finish_reason="tool_calls" if tool_calls else "stop",
+            )
+            if (body.get("stream_options") or {}).get("include_usage"):
+                yield _chunk(completion_id, model, created, usage=usage)
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return app
+
+
+def fill(value, variables: dict):
+    """Replace ``{name}`` placeholders in every string of a JSON value.
+
+    A string that is just one placeholder takes the variable's own type, so
+    ``"{batch_id}"`` in tool arguments becomes a number.
+    """
+    if isinstance(value, str):
+        if value[:1] == "{" and value[-1:] == "}" and value[1:-1] in variables:
+            return variables[value[1:-1]]
+        for name, replacement in variables.items():
+            value = value.replace("{" + name + "}", str(replacement))
+        return value
+    if isinstance(value, list):
+        return [fill(item, variables) for item in value]
+    if isinstance(value, dict):
+        return {key: fill(item, variables) for key, item in value.items()}
+    return value
+
+
+def load_script(path: str, variables: dict = None, **latency) -> Script:
+    """A script file: either the steps mapping or a transcripts file."""
+    with open(path) as f:
+        data = fill(json.load(f), variables or {})
+    if isinstance(data, dict) and "scenarios" in data:
+        steps = {
+            turn["user"]: turn["model"]
+            for scenario in data["scenarios"]
+            for turn in scenario["turns"]
+        }
+    else:
+        steps = data
+    return Script(steps, **latency)
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Scripted OpenAI-compatible model")
+    parser.add_argument("--script", required=True)
+    parser.add_argument(
+        "--var",
+        action="append",
+        default=[],
+        help="placeholder value as name=value, e.g. student_email=a@b.c",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--first-token-ms", type=float, default=300.0)
+    parser.add_argument("--chunk-ms", type=float, default=15.0)
+    parser.add_argument("--chunk-chars", type=int, default=12)
+    args = parser.parse_args()
+    script = load_script(
+        args.script,
+        {
+            name: int(value) if value.isdigit() else value
+            for name, value in (var.split("=", 1) for var in args.var)
+        },
+        first_token_ms=args.first_token_ms,
+        chunk_ms=args.chunk_ms,
+        chunk_chars=args.chunk_chars,
+    )
+    uvicorn.run(create_app(script), host=args.host, port=args.port, log_level="warning")
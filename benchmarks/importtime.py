@@ -0,0 +1,98 @@
+"""Import-time breakdown for the UMS entry points.
+
+Runs ``python -X importtime -c "import <module>"`` in a fresh interpreter and
+prints the slowest imports by cumulative and self time.
+
+    python benchmarks/importtime.py uni.main agent my_mcp --top 25
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def profile_module(module: str):
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        # "import time:  self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|", 2)
+        rows.append(
+            {
+                "module": name.strip(),
+                "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+                "self_us": int(self_us),
+                "cumulative_us": int(cumulative_us),
+            }
+        )
+    return proc.returncode, rows, proc.stderr if proc.returncode else ""
+
+
+def top_level_packages(rows):
+    totals = {}
+    for row in rows:
+        if row["depth"] == 0:
+            package = row["module"].split(".")[0]
+            totals[package] = totals.get(package, 0) + row["cumulative_us"]
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=["uni.main"])
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--json", action="store_true", help="print JSON only")
+    args = parser.parse_args()
+
+    report = {}
+    for module in args.modules:
+        returncode, rows, error = profile_module(module)
+        if returncode:
+            report[module] = {"error": error.strip().splitlines()[-1]}
+            continue
+        total = sum(row["cumulative_us"] for row in rows if row["depth"] == 0)
+        report[module] = {
+            "total_ms": round(total / 1000, 1),
+            "by_package_ms": {
+                name: round(us / 1000, 1)
+                for name, us in top_level_packages(rows)[: args.top]
+            },
+            "slowest_self_ms": {
+                row["module"]: round(row["self_us"] / 1000, 1)
+                for row in sorted(rows, key=lambda r: r["self_us"], reverse=True)[
+                    : args.top
+                ]
+            },
+        }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    for module, data in report.items():
+        print(f"== {module}")
+        if "error" in data:
+            print(f"   failed: {data['error']}")
+            continue
+        print(f"   total: {data['total_ms']} ms")
+        print("   by top-level package (cumulative):")
+        for name, ms in data["by_package_ms"].items():
+            print(f"     {ms:>9.1f} ms  {name}")
+        print("   slowest modules (self):")
+        for name, ms in data["slowest_self_ms"].items():
+            print(f"     {ms:>9.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+"""Load scenarios for the UMS API.
+
+Drives the FastAPI app either in-process through ``httpx.ASGITransport`` or
+over HTTP against a local uvicorn, using the manifest written by
+``benchmarks/seed.py``. Reports throughput and p50/p95/p99 per endpoint as
+JSON so releases can be compared run to run.
+
+    python benchmarks/load.py --scenario all --concurrency 20 --duration 30
+    python benchmarks/load.py --scenario admin_search --base-url http://127.0.0.1:8000
+
+Scenarios: login_storm, marks_entry, admin_search, dashboard_polling,
+result_listing.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx  # noqa: E402
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def percentile(ordered, pct):
+    if not ordered:
+        return None
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+
+    async def call(self, client, label, method, url, **kwargs):
+        started = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        self.latencies[label].append(time.perf_counter() - started)
+        self.statuses[label][response.status_code] += 1
+        return response
+
+    def report(self, elapsed):
+        endpoints = {}
+        for label, values in sorted(self.latencies.items()):
+            ordered = sorted(values)
+            endpoints[label] = {
+                "requests": len(values),
+                "throughput_rps": round(len(values) / elapsed, 2),
+                "p50_ms": round(percentile(ordered, 50) * 1000, 2),
+                "p95_ms": round(percentile(ordered, 95) * 1000, 2),
+                "p99_ms": round(percentile(ordered, 99) * 1000, 2),
+                "max_ms": round(ordered[-1] * 1000, 2),
+                "status": dict(self.statuses[label]),
+            }
+        total = sum(len(v) for v in self.latencies.values())
+        return {
+            "elapsed_s": round(elapsed, 2),
+            "requests": total,
+            "throughput_rps": round(total / elapsed, 2) if elapsed else None,
+            "endpoints": endpoints,
+        }
+
+
+async def login(client, recorder, email, password):
+    response = await recorder.call(
+        client,
+        "POST /users/login",
+        "POST",
+        "/users/login",
+        json={"email": email, "password": password},
+    )
+    token = response.json().get("user_token") if response.status_code == 200 else None
+    return {"Authorization": f"Bearer {token}"} if token else {}
+
+
+# =========================
+# Scenarios: each runs one "iteration" of a user's behaviour
+# =========================
+async def login_storm(client, recorder, manifest, rng, state):
+    await login(
+        client, recorder, rng.choice(manifest["student_emails"]), manifest["password"]
+    )
+
+
+async def marks_entry(client, recorder, manifest, rng, state):
+    teacher = rng.choice(manifest["teachers"])
+    headers = state["teacher_tokens"].get(teacher["email"])
+    if headers is None:
+        headers = await login(client, recorder, teacher["email"], manifest["password"])
+        state["teacher_tokens"][teacher["email"]] = headers
+    batch_name = rng.choice(teacher["batch_names"])
+    response = await recorder.call(
+        client,
+        "GET /results/{batch_name}/{subject_name}/{exam_type}",
+        "GET",
+        f"/results/{batch_name}/{teacher['subject_name']}/QUIZ",
+        headers=headers,
+    )
+    if response.status_code != 200:
+        return
+    rows = response.json()
+    for row in rng.sample(rows, min(5, len(rows))):
+        body = {
+            key: row[key]
+            for key in (
+                "student_id",
+                "subject_id",
+                "batch_id",
+                "department_id",
+                "semester",
+                "exam_type",
+                "total_marks",
+                "exam_date",
+            )
+        }
+        body["marks_obtained"] = round(rng.uniform(0.3, 1.0) * row["total_marks"], 1)
+        await recorder.call(
+            client,
+            "PUT /results/update/{result_id}",
+            "PUT",
+            f"/results/update/{row['result_id']}",
+            json=body,
+            headers=headers,
+        )
+
+
+async def admin_search(client, recorder, manifest, rng, state):
+    headers = state["admin_headers"]
+    term = rng.choice(manifest["search_terms"])
+    await recorder.call(
+        client,
+        "GET /autocomplete/",
+        "GET",
+        "/autocomplete/",
+        params={"q": term[: rng.randint(1, len(term))]},
+        headers=headers,
+    )
+    batch = rng.choice(manifest["batches"])
+    await recorder.call(
+        client,
+        "GET /students/",
+        "GET",
+        "/students/",
+        params={"batch_id": batch["batch_id"], "search": term},
+        headers=headers,
+    )
+    await recorder.call(
+        client,
+        "GET /students/get/{roll_number}",
+        "GET",
+        f"/students/get/{rng.choice(manifest['roll_numbers'])}",
+        headers=headers,
+    )
+
+
+async def dashboard_polling(client, recorder, manifest, rng, state):
+    headers = state["admin_headers"]
+    await recorder.call(
+        client,
+        "GET /users/dashboard_stats",
+        "GET",
+        "/users/dashboard_stats",
+        headers=headers,
+    )
+    await recorder.call(
+        client, "GET /departments/all", "GET", "/departments/all", headers=headers
+    )
+
+
+async def result_listing(client, recorder, manifest, rng, state):
+    headers = state["admin_headers"]
+    batch = rng.choice(manifest["batches"])
+    subject = rng.choice(
+        [s for s in manifest["subjects"] if s["department_id"] == batch["department_id"]]
+    )
+    await recorder.call(
+        client,
+        "GET /results/{batch_name}/{subject_name}/{exam_type}",
+        "GET",
+        f"/results/{batch['batch_name']}/{subject['subject_name']}/ALL",
+        headers=headers,
+    )
+    await recorder.call(
+        client,
+        "GET /batches/get_results/{batch_name}",
+        "GET",
+        f"/batches/get_results/{batch['batch_name']}",
+        headers=headers,
+    )
+
+
+SCENARIOS = {
+    "login_storm": login_storm,
+    "marks_entry": marks_entry,
+    "admin_search": admin_search,
+    "dashboard_polling": dashboard_polling,
+    "result_listing": result_listing,
+}
+
+
+async def run_scenario(name, client, manifest, args):
+    recorder = Recorder()
+    scenario = SCENARIOS[name]
+    state = {"teacher_tokens": {}, "admin_headers": {}}
+    if manifest.get("admin_email"):
+        state["admin_headers"] = await login(
+            client, Recorder(), manifest["admin_email"], manifest["admin_password"]
+        )
+    deadline = time.perf_counter() + args.duration
+    remaining = [args.iterations] if args.iterations else None
+
+    async def worker(worker_id):
+        rng = random.Random(args.seed + worker_id)
+        while time.perf_counter() < deadline:
+            if remaining is not None:
+                if remaining[0] <= 0:
+                    return
+                remaining[0] -= 1
+            try:
+                await scenario(client, recorder, manifest, rng, state)
+            except httpx.HTTPError as e:
+                recorder.statuses[f"{name}:error"][type(e).__name__] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(args.concurrency)))
+    return recorder.report(time.perf_counter() - started)
+
+
+async def main_async(args):
+    with open(args.manifest) as f:
+        manifest = json.load(f)
+
+    if args.base_url:
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=60)
+        lifespan = None
+    else:
+        from uni.main import app
+
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://ums.local",
+            timeout=60,
+        )
+        lifespan = app.router.lifespan_context(app)
+        await lifespan.__aenter__()
+
+    names = list(SCENARIOS) if args.scenario == "all" else args.scenario.split(",")
+    report = {
+        "mode": "http" if args.base_url else "asgi",
+        "concurrency": args.concurrency,
+        "scenarios": {},
+    }
+    try:
+        async with client:
+            for name in names:
+                report["scenarios"][name] = await run_scenario(
+                    name, client, manifest, args
+                )
+    finally:
+        if lifespan is not None:
+            await lifespan.__aexit__(None, None, None)
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            f.write(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="UMS API load scenarios")
+    parser.add_argument("--scenario", default="all", help="name, comma list or all")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds")
+    parser.add_argument(
+        "--iterations", type=int, default=0, help="stop after N iterations"
+    )
+    parser.add_argument("--base-url", help="hit a running server instead of ASGI")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument(
+        "--manifest", default=os.path.join(RESULTS_DIR, "seed_manifest.json")
+    )
+    parser.add_argument("--output", help="also write the JSON report here")
+    args = parser.parse_args()
+    unknown = set(args.scenario.split(",")) - set(SCENARIOS) - {"all"}
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(sorted(unknown))}")
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
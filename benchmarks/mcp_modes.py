@@ -0,0 +1,182 @@
+"""Per-call latency of the MCP server in its two modes.
+
+Calls equivalent tools through an in-memory ``fastmcp.Client`` on
+
+* ``inprocess`` - the curated tools of ``my_mcp.py``, which call the logics
+  modules on a pooled session;
+* ``http`` - ``my_mcp.api_server()``, where the tool call is turned into an
+  HTTP request through the FastAPI app (CORS and metrics middleware, JWT
+  and DB dependencies, response model validation, JSON encode/decode);
+
+against the database in ``STUDENT_DB_URL`` seeded by ``benchmarks/seed.py``.
+``list_batch_students`` pits the curated ``find_students`` against the
+student list route; ``batch_lookup`` runs the same logic and response model
+as its route in an in-process tool, so its difference is only the HTTP hop.
+Reports p50/p95/mean per operation and mode.
+
+    python benchmarks/mcp_modes.py [--calls 200] [--concurrency 1]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def percentile(ordered, pct):
+    if not ordered:
+        return None
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def operations(manifest):
+    """label -> (in-process tool and arguments, API route and arguments)."""
+    batch = manifest["batches"][0]
+    return {
+        "list_batch_students": (
+            ("find_students", {"batch_id": batch["batch_id"], "page_size": 100}),
+            (("GET", "/students/"), {"batch_id": batch["batch_id"]}),
+        ),
+        "batch_lookup": (
+            ("batch_lookup", {"batch_name": batch["batch_name"]}),
+            (("GET", "/batches/get/{batch_name}"), {"batch_name": batch["batch_name"]}),
+        ),
+    }
+
+
+def same_logic_tools(server):
+    """In-process twins of API routes: same logic and response model."""
+    import my_mcp
+    from uni.logics import batches_logic
+    from uni.schemas.batches import BatchResponse
+
+    @server.tool
+    async def batch_lookup(batch_name: str) -> dict:
+        batch = await my_mcp._call(
+            "batch_lookup", batches_logic.get_by_name, batch_name
+        )
+        return BatchResponse.model_validate(batch, from_attributes=True).model_dump(
+            mode="json"
+        )
+
+    return server
+
+
+def route_tool_names(api, ops) -> dict:
+    """Name the API tools after the operations (by route operation id)."""
+    from fastapi.routing import APIRoute
+
+    names = {}
+    for label, (_, ((method, path), _)) in ops.items():
+        route = next(
+            route
+            for route in api.routes
+            if isinstance(route, APIRoute)
+            and route.path == path
+            and method in route.methods
+        )
+        names[route.unique_id] = f"api_{label}"
+    return names
+
+
+async def measure(client, tool, arguments, calls, concurrency):
+    for _ in range(5):  # warm up the pool and statement caches
+        await client.call_tool(tool, arguments)
+    latencies = []
+
+    async def worker(count):
+        for _ in range(count):
+            started = time.perf_counter()
+            await client.call_tool(tool, arguments)
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(worker(calls // concurrency) for _ in range(concurrency)))
+    ordered = sorted(latencies)
+    return {
+        "calls": len(ordered),
+        "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 3),
+        "mean_ms": round(statistics.mean(ordered) * 1000, 3),
+    }
+
+
+async def run(args, manifest):
+    from fastmcp import Client, FastMCP
+    from uni.utils.security import create_access_token
+
+    token = create_access_token(
+        {"email": manifest["admin_email"], "user_id": 0, "user_role": "admin"},
+        expires_delta=timedelta(hours=1),
+    )
+    # Both modes authenticate as the admin; my_mcp reads this at import
+    os.environ["MCP_API_TOKEN"] = token
+    import my_mcp
+    from uni.database.connection import engine
+    from uni.main import app as api
+
+    ops = operations(manifest)
+    http_server = my_mcp.api_server(token, route_tool_names(api, ops))
+    # The curated tools plus the same-logic twins, all in-process
+    inprocess_server = FastMCP(name="inprocess")
+    inprocess_server.mount(my_mcp.server)
+    same_logic_tools(inprocess_server)
+
+    report = {}
+    try:
+        async with Client(inprocess_server) as inprocess, Client(http_server) as http:
+            for label, ((tool, tool_args), (_, route_args)) in ops.items():
+                report[label] = {
+                    "inprocess": await measure(
+                        inprocess, tool, tool_args, args.calls, args.concurrency
+                    ),
+                    "http": await measure(
+                        http, f"api_{label}", route_args, args.calls, args.concurrency
+                    ),
+                }
+                report[label]["http_over_inprocess"] = round(
+                    report[label]["http"]["p50_ms"]
+                    / report[label]["inprocess"]["p50_ms"],
+                    2,
+                )
+    finally:
+        await engine.dispose()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MCP in-process vs HTTP mode")
+    parser.add_argument(
+        "--manifest", default=os.path.join(RESULTS_DIR, "seed_manifest.json")
+    )
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=1)
+    args = parser.parse_args()
+
+    with open(args.manifest) as f:
+        manifest = json.load(f)
+    # Read by uni.utils.security at import: the admin routes compare against it
+    os.environ.setdefault("SECRET_KEY", "mcp-benchmark-secret")
+    os.environ.setdefault("ALGORITHM", "HS256")
+    os.environ["ADMIN_EMAIL"] = manifest["admin_email"]
+    os.environ["MCP_MODE"] = "inprocess"
+    os.environ.setdefault("JOB_WORKERS", "0")
+
+    report = {
+        "calls": args.calls,
+        "concurrency": args.concurrency,
+        "operations": asyncio.run(run(args, manifest)),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,448 @@
+"""Seed a local database with realistic UMS data for load testing.
+
+At the default scale this creates 8 departments, 32 batches, 64 subjects,
+64 teachers, 3,840 students and ~983k results. ``--scale`` multiplies the
+students per batch, so ``--scale 3`` gives roughly 3M results.
+
+    DB_SSL=disable STUDENT_DB_URL=postgresql+asyncpg://... \\
+        python benchmarks/seed.py --create-tables --scale 1
+
+Teachers are inserted before any other user so that on an empty database
+teacher_id == user_id, which is what the results permission check compares
+against. A manifest with credentials and sample names is written for the
+scenarios in ``benchmarks/load.py``.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert, select, func  # noqa: E402
+from uni.database.connection import engine, Base  # noqa: E402
+from uni.database.partitions import ensure_results_partitions  # noqa: E402
+from uni.utils.terms import academic_term  # noqa: E402
+from uni.models import (  # noqa: E402
+    User,
+    Department,
+    Batch,
+    Subject,
+    Teacher,
+    Student,
+    Result,
+    batch_subjects,
+    department_subjects,
+    teaching_assignments,
+)
+from uni.schemas.roles import UserRole  # noqa: E402
+from uni.logics.results_logics import calculate_grade  # noqa: E402
+from uni.utils.security import hash_password  # noqa: E402
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+SEED_PASSWORD = "password123"
+EXAM_TYPES = ["MIDTERM", "FINAL", "QUIZ", "ASSIGNMENT"]
+FIRST_NAMES = [
+    "Ali",
+    "Ahmed",
+    "Sara",
+    "Fatima",
+    "Usman",
+    "Ayesha",
+    "Bilal",
+    "Hina",
+    "Hamza",
+    "Zainab",
+    "Omar",
+    "Maryam",
+    "Hassan",
+    "Iqra",
+    "Saad",
+    "Noor",
+]
+LAST_NAMES = [
+    "Khan",
+    "Ahmed",
+    "Malik",
+    "Hussain",
+    "Raza",
+    "Iqbal",
+    "Siddiqui",
+    "Qureshi",
+    "Sheikh",
+    "Butt",
+    "Chaudhry",
+    "Mirza",
+    "Baig",
+    "Javed",
+]
+CHUNK = 10_000
+
+
+async def insert_chunks(conn, target, rows):
+    for start in range(0, len(rows), CHUNK):
+        await conn.execute(insert(target), rows[start : start + CHUNK])
+
+
+def exam_date(now, semesters, semester):
+    """Semesters are six months apart, the last one ending now."""
+    return now - timedelta(days=180 * (semesters - semester))
+
+
+async def seed(args):
+    rng = random.Random(args.seed)
+    password = hash_password(SEED_PASSWORD)  # bcrypt once, reused for every user
+    students_per_batch = int(args.students_per_batch * args.scale)
+    now = datetime.utcnow()
+    timings = {}
+
+    async with engine.begin() as conn:
+        if args.create_tables:
+            await conn.run_sync(Base.metadata.create_all)
+            await ensure_results_partitions(
+                conn,
+                [
+                    academic_term(exam_date(now, args.semesters, semester))
+                    for semester in range(1, args.semesters + 1)
+                ],
+            )
+
+        existing = (await conn.execute(select(func.count()).select_from(User))).scalar()
+        if existing:
+            sys.exit("Refusing to seed: users table is not empty")
+
+        started = time.perf_counter()
+        departments = [
+            {
+                "department_name": f"DEPARTMENT {d + 1}",
+                "department_code": f"D{d + 1:02d}",
+            }
+            for d in range(args.departments)
+        ]
+        department_ids = (
+            (
+                await conn.execute(
+                    insert(Department).returning(
+                        Department.department_id, sort_by_parameter_order=True
+                    ),
+                    departments,
+                )
+            )
+            .scalars()
+            .all()
+        )
+
+        batches = []
+        for department_id, department in zip(department_ids, departments):
+            for b in range(args.batches_per_department):
+                batches.append(
+                    {
+                        "batch_name": f"{department['department_code']}-B{b + 1}",
+                        "department_id": department_id,
+                        "seats_limit": students_per_batch,
+                        "current_semester": args.semesters,
+                    }
+                )
+        batch_ids = (
+            (
+                await conn.execute(
+                    insert(Batch).returning(
+                        Batch.batch_id, sort_by_parameter_order=True
+                    ),
+                    batches,
+                )
+            )
+            .scalars()
+            .all()
+        )
+        for batch_id, batch in zip(batch_ids, batches):
+            batch["batch_id"] = batch_id
+
+        subjects = []
+        for department_id, department in zip(department_ids, departments):
+            for s in range(args.subjects_per_department):
+                subjects.append(
+                    {
+                        "subject_name": f"{department['department_code']} SUBJECT {s + 1}",
+                        "description": "Seeded subject",
+                        "credits": rng.choice([2, 3, 4]),
+                        "department_id": department_id,
+                    }
+                )
+        subject_ids = (
+            (
+                await conn.execute(
+                    insert(Subject).returning(
+                        Subject.subject_id, sort_by_parameter_order=True
+                    ),
+                    [
+                        {k: v for k, v in s.items() if k != "department_id"}
+                        for s in subjects
+                    ],
+                )
+            )
+            .scalars()
+            .all()
+        )
+        for subject_id, subject in zip(subject_ids, subjects):
+            subject["subject_id"] = subject_id
+
+        await insert_chunks(
+            conn,
+            department_subjects,
+            [
+                {"department_id": s["department_id"], "subject_id": s["subject_id"]}
+                for s in subjects
+            ],
+        )
+        subjects_by_department = {}
+        for subject in subjects:
+            subjects_by_department.setdefault(subject["department_id"], []).append(
+                subject
+            )
+        await insert_chunks(
+            conn,
+            batch_subjects,
+            [
+                {"batch_id": batch["batch_id"], "subject_id": subject["subject_id"]}
+                for batch in batches
+                for subject in subjects_by_department[batch["department_id"]]
+            ],
+        )
+        timings["catalog_s"] = time.perf_counter() - started
+
+        # One teacher per (department, subject), teaching it in every batch
+        started = time.perf_counter()
+        teacher_users = [
+            {
+                "user_name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                "user_role": UserRole.TEACHER,
+                "email": f"teacher{i + 1}@seed.ums",
+                "password": password,
+                "is_active": True,
+            }
+            for i in range(len(subjects))
+        ]
+        teacher_user_ids = (
+            (
+                await conn.execute(
+                    insert(User).returning(User.user_id, sort_by_parameter_order=True),
+                    teacher_users,
+                )
+            )
+            .scalars()
+            .all()
+        )
+        teachers = []
+        for user_id, user in zip(teacher_user_ids, teacher_users):
+            first_name, last_name = user["user_name"].split(" ", 1)
+            teachers.append(
+                {
+                    "user_id": user_id,
+                    "first_name": first_name,
+                    "last_name": last_name,
+                    "phone_number": f"0300{rng.randint(1000000, 9999999)}",
+                    "address": "Seeded address",
+                    "hire_date": now - timedelta(days=rng.randint(100, 4000)),
+                }
+            )
+        teacher_ids = (
+            (
+                await conn.execute(
+                    insert(Teacher).returning(
+                        Teacher.teacher_id, sort_by_parameter_order=True
+                    ),
+                    teachers,
+                )
+            )
+            .scalars()
+            .all()
+        )
+
+        assignments = []
+        teacher_manifest = []
+        for teacher_id, user, subject in zip(teacher_ids, teacher_users, subjects):
+            department_batches = [
+                b for b in batches if b["department_id"] == subject["department_id"]
+            ]
+            for batch in department_batches:
+                assignments.append(
+                    {
+                        "teacher_id": teacher_id,
+                        "department_id": subject["department_id"],
+                        "batch_id": batch["batch_id"],
+                        "subject_id": subject["subject_id"],
+                        "semester": args.semesters,
+                    }
+                )
+            teacher_manifest.append(
+                {
+                    "email": user["email"],
+                    "subject_name": subject["subject_name"],
+                    "batch_names": [b["batch_name"] for b in department_batches],
+                }
+            )
+        await insert_chunks(conn, teaching_assignments, assignments)
+
+        student_users = []
+        students = []
+        for batch in batches:
+            for n in range(students_per_batch):
+                first_name = rng.choice(FIRST_NAMES)
+                last_name = rng.choice(LAST_NAMES)
+                student_users.append(
+                    {
+                        "user_name": f"{first_name} {last_name}",
+                        "user_role": UserRole.STUDENT,
+                        "email": f"{batch['batch_name'].lower()}-{n + 1:04d}@seed.ums",
+                        "password": password,
+                        "is_active": True,
+                    }
+                )
+                students.append(
+                    {
+                        "first_name": first_name,
+                        "last_name": last_name,
+                        "father_name": f"{rng.choice(FIRST_NAMES)} {last_name}",
+                        "mother_name": f"{rng.choice(FIRST_NAMES)} {last_name}",
+                        "roll_number": f"{batch['batch_name']}-{n + 1:04d}",
+                        "batch_id": batch["batch_id"],
+                        "department_id": batch["department_id"],
+                        "date_of_birth": date(2000, 1, 1)
+                        + timedelta(days=rng.randint(0, 2500)),
+                        "address": "Seeded address",
+                        "phone_number": f"0300{rng.randint(1000000, 9999999)}",
+                    }
+                )
+        student_user_ids = []
+        for start in range(0, len(student_users), CHUNK):
+            student_user_ids.extend(
+                (
+                    await conn.execute(
+                        insert(User).returning(
+                            User.user_id, sort_by_parameter_order=True
+                        ),
+                        student_users[start : start + CHUNK],
+                    )
+                )
+                .scalars()
+                .all()
+            )
+        for user_id, student in zip(student_user_ids, students):
+            student["user_id"] = user_id
+        student_ids = []
+        for start in range(0, len(students), CHUNK):
+            student_ids.extend(
+                (
+                    await conn.execute(
+                        insert(Student).returning(
+                            Student.student_id, sort_by_parameter_order=True
+                        ),
+                        students[start : start + CHUNK],
+                    )
+                )
+                .scalars()
+                .all()
+            )
+        timings["people_s"] = time.perf_counter() - started
+
+        # Results are generated and flushed chunk by chunk to bound memory
+        started = time.perf_counter()
+        result_count = 0
+        pending = []
+        for student_id, student in zip(student_ids, students):
+            for subject in subjects_by_department[student["department_id"]]:
+                for semester in range(1, args.semesters + 1):
+                    held_on = exam_date(now, args.semesters, semester)
+                    for exam_type in EXAM_TYPES:
+                        total = 100.0 if exam_type in ("MIDTERM", "FINAL") else 20.0
+                        marks = round(rng.uniform(0.3, 1.0) * total, 1)
+                        pending.append(
+                            {
+                                "student_id": student_id,
+                                "subject_id": subject["subject_id"],
+                                "batch_id": student["batch_id"],
+                                "department_id": student["department_id"],
+                                "semester": semester,
+                                "exam_type": exam_type,
+                                "marks_obtained": marks,
+                                "total_marks": total,
+                                "grade": calculate_grade(marks, total),
+                                "exam_date": held_on,
+                            }
+                        )
+                        if len(pending) >= CHUNK:
+                            await conn.execute(insert(Result), pending)
+                            result_count += len(pending)
+                            pending = []
+        if pending:
+            await conn.execute(insert(Result), pending)
+            result_count += len(pending)
+        timings["results_s"] = time.perf_counter() - started
+
+    manifest = {
+        "password": SEED_PASSWORD,
+        "admin_email": os.getenv("ADMIN_EMAIL"),
+        "admin_password": os.getenv("ADMIN_PASSWORD"),
+        "departments": [
+            {"department_id": i, **d} for i, d in zip(department_ids, departments)
+        ],
+        "batches": [
+            {k: b[k] for k in ("batch_id", "batch_name", "department_id")}
+            for b in batches
+        ],
+        "subjects": [
+            {k: s[k] for k in ("subject_id", "subject_name", "department_id")}
+            for s in subjects
+        ],
+        "teachers": teacher_manifest,
+        "student_emails": [
+            u["email"] for u in student_users[:: max(1, len(student_users) // 500)]
+        ],
+        "roll_numbers": [
+            s["roll_number"] for s in students[:: max(1, len(students) // 500)]
+        ],
+        "search_terms": FIRST_NAMES + LAST_NAMES,
+        "counts": {
+            "departments": len(departments),
+            "batches": len(batches),
+            "subjects": len(subjects),
+            "teachers": len(teachers),
+            "students": len(students),
+            "results": result_count,
+        },
+        "timings": {k: round(v, 2) for k, v in timings.items()},
+    }
+    os.makedirs(os.path.dirname(args.manifest), exist_ok=True)
+    with open(args.manifest, "w") as f:
+        json.dump(manifest, f, indent=2, default=str)
+    print(json.dumps({"counts": manifest["counts"], "timings": manifest["timings"]}))
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed UMS data for load tests")
+    parser.add_argument("--departments", type=int, default=8)
+    parser.add_argument("--batches-per-department", type=int, default=4)
+    parser.add_argument("--subjects-per-department", type=int, default=8)
+    parser.add_argument("--students-per-batch", type=int, default=120)
+    parser.add_argument("--semesters", type=int, default=8)
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--create-tables", action="store_true")
+    parser.add_argument(
+        "--manifest", default=os.path.join(RESULTS_DIR, "seed_manifest.json")
+    )
+    args = parser.parse_args()
+    if args.batches_per_department > 4:
+        parser.error("the API allows at most 4 batches per department")
+    asyncio.run(seed(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""CPU cost of the results-path lookups: rebuilt per call vs prebuilt.
+
+For every hot lookup the results endpoints issue, times ``Session.execute`` of
+a statement built inline (as the logics used to do) against the prebuilt one
+from ``uni.database.statements``, on an in-memory SQLite database so the
+number is Python-side work only (statement construction, cache key, compiled
+cache lookup, result processing). The per-endpoint rows add up the lookups
+each results route runs. Each inline statement is the exact equivalent of its
+prebuilt one; the benchmark refuses to run if their SQL differs.
+
+    python benchmarks/statement_cache.py --iterations 20000
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("STUDENT_DB_URL", "sqlite+aiosqlite://")
+
+from sqlalchemy import create_engine, select  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from uni.database import statements  # noqa: E402
+from uni.database.connection import Base  # noqa: E402
+from uni.models import (  # noqa: E402
+    Batch,
+    Department,
+    Result,
+    Student,
+    Subject,
+    department_subjects,
+    teaching_assignments,
+)
+
+# name -> (inline builder, prebuilt statement, params)
+LOOKUPS = {
+    "batch_by_name": (
+        lambda p: select(Batch).where(Batch.batch_name == p["batch_name"]),
+        statements.BATCH_BY_NAME,
+        {"batch_name": "D01-B1"},
+    ),
+    "subject_by_name": (
+        lambda p: select(Subject).where(Subject.subject_name == p["subject_name"]),
+        statements.SUBJECT_BY_NAME,
+        {"subject_name": "D01 SUBJECT 1"},
+    ),
+    "batch_by_id": (
+        lambda p: select(Batch).where(Batch.batch_id == p["batch_id"]),
+        statements.BATCH_BY_ID,
+        {"batch_id": 1},
+    ),
+    "subject_by_id": (
+        lambda p: select(Subject).where(Subject.subject_id == p["subject_id"]),
+        statements.SUBJECT_BY_ID,
+        {"subject_id": 1},
+    ),
+    "department_by_id": (
+        lambda p: select(Department).where(
+            Department.department_id == p["department_id"]
+        ),
+        statements.DEPARTMENT_BY_ID,
+        {"department_id": 1},
+    ),
+    "student_by_id": (
+        lambda p: select(Student).where(Student.student_id == p["student_id"]),
+        statements.STUDENT_BY_ID,
+        {"student_id": 1},
+    ),
+    "result_by_id": (
+        lambda p: select(Result).where(Result.result_id == p["result_id"]),
+        statements.RESULT_BY_ID,
+        {"result_id": 1},
+    ),
+    "department_subject": (
+        lambda p: select(department_subjects.c.subject_id)
+        .where(
+            department_subjects.c.department_id == p["department_id"],
+            department_subjects.c.subject_id == p["subject_id"],
+        )
+        .limit(1),
+        statements.DEPARTMENT_SUBJECT,
+        {"department_id": 1, "subject_id": 1},
+    ),
+    "teaching_assignment": (
+        lambda p: select(teaching_assignments.c.teacher_id)
+        .join(
+            Batch,
+            (Batch.batch_id == teaching_assignments.c.batch_id)
+            & (Batch.current_semester == teaching_assignments.c.semester),
+        )
+        .where(
+            teaching_assignments.c.teacher_id == p["teacher_id"],
+            teaching_assignments.c.department_id == p["department_id"],
+            teaching_assignments.c.batch_id == p["batch_id"],
+            teaching_assignments.c.subject_id == p["subject_id"],
+        )
+        .limit(1),
+        statements.TEACHING_ASSIGNMENT,
+        {"teacher_id": 1, "department_id": 1, "batch_id": 1, "subject_id": 1},
+    ),
+}
+
+# Teacher permission checks on reads are answered from the in-memory ACL and
+# only hit TEACHING_ASSIGNMENT on a miss, so the GET does not count it. Writes
+# confirm against the database (can_teacher_access(..., confirm=True)) on
+# every call: create always, update and delete when a teacher makes them.
+ENDPOINTS = {
+    "GET /results/{batch_name}/{subject_name}/{exam_type}": [
+        "batch_by_name",
+        "subject_by_name",
+    ],
+    "POST /results/create": [
+        "student_by_id",
+        "subject_by_id",
+        "batch_by_id",
+        "department_by_id",
+        "department_subject",
+        "teaching_assignment",
+    ],
+    "PUT /results/update/{result_id}": ["result_by_id", "teaching_assignment"],
+    "DELETE /results/delete/{result_id}": ["result_by_id", "teaching_assignment"],
+}
+
+_BIND = re.compile(r":\w+")
+
+
+def same_sql(inline, prebuilt) -> bool:
+    """Equal SQL once bind parameter names (value-generated vs given) go."""
+    return _BIND.sub("?", str(inline)) == _BIND.sub("?", str(prebuilt))
+
+
+def cpu_per_call(session, make_statement, iterations):
+    # Warm the compiled cache first so both sides measure steady state
+    for _ in range(50):
+        session.execute(*make_statement()).all()
+    started = time.process_time()
+    for _ in range(iterations):
+        session.execute(*make_statement()).all()
+    return (time.process_time() - started) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prebuilt statement benchmark")
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    for name, (build, prebuilt, params) in LOOKUPS.items():
+        if not same_sql(build(params), prebuilt):
+            raise SystemExit(f"{name}: the inline statement is not the prebuilt one")
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+
+    lookups = {}
+    with Session(engine) as session:
+        for name, (build, prebuilt, params) in LOOKUPS.items():
+            inline_us = cpu_per_call(session, lambda: (build(params),), args.iterations)
+            prebuilt_us = cpu_per_call(
+                session, lambda: (prebuilt, params), args.iterations
+            )
+            lookups[name] = {
+                "inline_us": round(inline_us, 1),
+                "prebuilt_us": round(prebuilt_us, 1),
+                "saved_us": round(inline_us - prebuilt_us, 1),
+            }
+
+    endpoints = {
+        route: {
+            "lookups": len(names),
+            "saved_us_per_request": round(
+                sum(lookups[name]["saved_us"] for name in names), 1
+            ),
+        }
+        for route, names in ENDPOINTS.items()
+    }
+    print(
+        json.dumps(
+            {"iterations": args.iterations, "lookups": lookups, "endpoints": endpoints},
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
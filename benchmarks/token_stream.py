@@ -0,0 +1,157 @@
+"""Websocket frames and delivery delay of streamed agent replies.
+
+Simulates ``--chats`` concurrent replies, each a stream of small text deltas
+arriving in bursts (as they come off the model's HTTP stream), sent to a
+fake client whose every frame costs ``--frame-us`` of event-loop CPU (the
+socket.io encode and emit). Compares:
+
+* ``direct`` - ``msg.stream_token`` per delta, as before;
+* ``coalesced`` - ``TokenCoalescer`` with ``--flush-ms`` / ``--flush-chars``.
+
+Reports frames per message, total emit CPU, how long a delta waits before
+its frame goes out (p50/p95/max), time to first frame and reply duration.
+
+    python benchmarks/token_stream.py [--chats 200] [--deltas 300]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from uni.utils.token_stream import TokenCoalescer  # noqa: E402
+
+
+def percentile(ordered, pct):
+    if not ordered:
+        return None
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def delta_stream(rng, deltas, burst_gap_ms):
+    """(gap before, text) pairs: bursts of 1-8 deltas of 1-3 words each."""
+    stream = []
+    while len(stream) < deltas:
+        gap = rng.expovariate(1000 / burst_gap_ms)
+        for i in range(min(rng.randint(1, 8), deltas - len(stream))):
+            text = (
+                " ".join(
+                    rng.choice(["haan", "student", "ka", "record", "yeh"])
+                    for _ in range(rng.randint(1, 3))
+                )
+                + " "
+            )
+            stream.append((gap if i == 0 else 0.0, text))
+    return stream
+
+
+class Client:
+    """Counts frames, burns ``frame_us`` per frame and tracks delta delays."""
+
+    def __init__(self, frame_us):
+        self.frame_s = frame_us / 1e6
+        self.frames = 0
+        self.emit_cpu = 0.0
+        self.delays = []
+
+    def sink(self, pending):
+        """A send callable for one message; ``pending`` holds arrival times."""
+
+        async def send(text):
+            started = time.perf_counter()
+            while time.perf_counter() - started < self.frame_s:
+                pass
+            self.frames += 1
+            self.emit_cpu += time.perf_counter() - started
+            sent = len(text)
+            while sent > 0 and pending:
+                arrived, size = pending.pop(0)
+                self.delays.append(started - arrived)
+                sent -= size
+
+        return send
+
+
+async def one_reply(mode, stream, client, args):
+    pending = []
+    send = client.sink(pending)
+    if mode == "coalesced":
+        coalescer = TokenCoalescer(
+            send, args.flush_ms / 1000, args.flush_chars, record_metrics=False
+        )
+        push, close = coalescer.push, coalescer.close
+    else:
+        push, close = send, None
+    started = time.perf_counter()
+    first_frame = None
+    frames_before = client.frames
+    for gap, text in stream:
+        if gap:
+            await asyncio.sleep(gap)
+        pending.append((time.perf_counter(), len(text)))
+        await push(text)
+        if first_frame is None and client.frames > frames_before:
+            first_frame = time.perf_counter() - started
+    if close is not None:
+        await close()
+    return first_frame, time.perf_counter() - started
+
+
+async def run(mode, streams, args):
+    client = Client(args.frame_us)
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(one_reply(mode, stream, client, args) for stream in streams)
+    )
+    elapsed = time.perf_counter() - started
+    delays = sorted(client.delays)
+    first = sorted(r[0] for r in results if r[0] is not None)
+    durations = sorted(r[1] for r in results)
+    return {
+        "frames": client.frames,
+        "frames_per_message": round(client.frames / len(streams), 1),
+        "emit_cpu_ms": round(client.emit_cpu * 1000, 1),
+        "delta_delay_p50_ms": round(percentile(delays, 50) * 1000, 2),
+        "delta_delay_p95_ms": round(percentile(delays, 95) * 1000, 2),
+        "delta_delay_max_ms": round(delays[-1] * 1000, 2),
+        "first_frame_p95_ms": round(percentile(first, 95) * 1000, 2),
+        "reply_p95_ms": round(percentile(durations, 95) * 1000, 1),
+        "elapsed_ms": round(elapsed * 1000, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streamed token batching benchmark")
+    parser.add_argument("--chats", type=int, default=200)
+    parser.add_argument("--deltas", type=int, default=300)
+    parser.add_argument("--burst-gap-ms", type=float, default=25.0)
+    parser.add_argument("--frame-us", type=float, default=60.0)
+    parser.add_argument("--flush-ms", type=float, default=20.0)
+    parser.add_argument("--flush-chars", type=int, default=256)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    streams = [
+        delta_stream(rng, args.deltas, args.burst_gap_ms) for _ in range(args.chats)
+    ]
+    report = {
+        "chats": args.chats,
+        "deltas_per_message": args.deltas,
+        "frame_us": args.frame_us,
+        "flush_ms": args.flush_ms,
+        "flush_chars": args.flush_chars,
+    }
+    for mode in ("direct", "coalesced"):
+        report[mode] = asyncio.run(run(mode, streams, args))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
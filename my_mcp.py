@@ -1,8 +1,228 @@
+"""MCP server of the student management system.
+
+Two modes, picked with MCP_MODE:
+
+* ``inprocess`` (default) - a small, curated set of admin tools that call the
+  logics modules directly on a pooled agent session (statement timeout and
+  ``method="TOOL"`` metrics, see ``uni/database/agent_session.py``): list
+  tools are paginated and projected, counts and statistics are aggregated by
+  the database, and every response is capped at MCP_MAX_RESPONSE_BYTES (a
+  list that does not fit is cut short and marked ``truncated``, with the
+  cursor moved to the last row returned). Every call is authenticated like
+  the admin routes: the bearer JWT of the MCP request's Authorization header
+  (HTTP transports) or else MCP_API_TOKEN must belong to the admin.
+* ``http`` - every FastAPI route as a tool. Each call becomes a request
+  through the ASGI app (middleware, dependencies, JSON both ways),
+  authenticated with MCP_API_TOKEN. Only for clients that need a route the
+  curated tools do not cover.
+
+    MCP_API_TOKEN=... python my_mcp.py
+    MCP_MODE=http MCP_API_TOKEN=... python my_mcp.py
+
+Run as a script (stdio) it refuses to start without MCP_API_TOKEN, in either
+mode, and in ``inprocess`` mode also when the token is not the admin's. With
+MCP_METRICS_PORT set it serves its own ``/metrics`` on that port (tool calls
+are ``method="TOOL"``).
+
+``benchmarks/mcp_modes.py`` compares the per-call latency of both.
+"""
+
+import json
+import os
+from typing import List, Optional
+from fastapi import HTTPException
 from fastmcp import FastMCP
-from uni.main import app
+from fastmcp.exceptions import ToolError
+from uni.database.agent_session import tool_session
+from uni.logics import batches_logic, students_logics
+from uni.utils.metrics import serve_metrics
+from uni.utils.security import get_current_user, is_admin_user
+
+MCP_MODE = os.getenv("MCP_MODE", "inprocess")
+MCP_API_TOKEN = os.getenv("MCP_API_TOKEN")
+MCP_MAX_RESPONSE_BYTES = int(os.getenv("MCP_MAX_RESPONSE_BYTES", "32768"))
+MCP_METRICS_PORT = int(os.getenv("MCP_METRICS_PORT", "0"))
+
+server = FastMCP(name="students_management", version="1.0.0")
+
+
+def _size(payload) -> int:
+    return len(json.dumps(payload, default=str))
+
+
+def cap_response(payload: dict, items_key: str, cursor_key=None, id_key=None):
+    """Drop trailing items of ``payload[items_key]`` until it fits the cap."""
+    if _size(payload) <= MCP_MAX_RESPONSE_BYTES:
+        return payload
+    items = payload[items_key]
+    low, high = 0, len(items)
+    while low < high:  # the most items that still fit
+        middle = (low + high + 1) // 2
+        if _size({**payload, items_key: items[:middle]}) <= MCP_MAX_RESPONSE_BYTES:
+            low = middle
+        else:
+            high = middle - 1
+    capped = {**payload, items_key: items[:low], "truncated": True}
+    if cursor_key and low:
+        capped[cursor_key] = items[low - 1][id_key]
+    return capped
+
+
+def _bearer_token():
+    """The MCP request's bearer token, else MCP_API_TOKEN (stdio)."""
+    from fastmcp.server.dependencies import get_http_headers
+
+    header = get_http_headers(include_all=True).get("authorization", "")
+    scheme, _, token = header.partition(" ")
+    if scheme.lower() == "bearer" and token:
+        return token
+    return MCP_API_TOKEN
+
+
+def authorize():
+    """The same checks as ``Depends(is_admin_user)`` on the admin routes."""
+    token = _bearer_token()
+    if not token:
+        raise ToolError("Not authenticated")
+    try:
+        is_admin_user(get_current_user(token))
+    except HTTPException as e:
+        raise ToolError(str(e.detail))
+
+
+async def _call(tool_name: str, logic, *args):
+    authorize()
+    try:
+        async with tool_session(f"mcp.{tool_name}") as db:
+            return await logic(db, *args)
+    except HTTPException as e:
+        raise ToolError(str(e.detail))
+
+
+@server.tool
+async def find_students(
+    department_id: Optional[int] = None,
+    batch_id: Optional[int] = None,
+    roll_prefix: Optional[str] = None,
+    name: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+    page_size: int = students_logics.STUDENT_PAGE_SIZE,
+    after_student_id: Optional[int] = None,
+) -> dict:
+    """Look students up, one page at a time.
+
+    Args:
+        department_id: Only students of this department.
+        batch_id: Only students of this batch.
+        roll_prefix: Only roll numbers starting with this, e.g. "D01-B1".
+        name: Part of the first or last name.
+        fields: Columns to return (default: student_id, roll_number,
+            first_name, last_name, batch_id, department_id, email).
+        page_size: Rows per page, at most 100.
+        after_student_id: The "next_after" of the previous page.
+    """
+    page = await _call(
+        "find_students",
+        students_logics.search_students,
+        department_id,
+        batch_id,
+        roll_prefix,
+        name,
+        fields,
+        page_size,
+        after_student_id,
+    )
+    return cap_response(page, "students", "next_after", "student_id")
+
+
+@server.tool
+async def count_students(
+    department_id: Optional[int] = None,
+    batch_id: Optional[int] = None,
+    roll_prefix: Optional[str] = None,
+    name: Optional[str] = None,
+    group_by: Optional[str] = None,
+) -> dict:
+    """Count matching students, optionally per "department" or "batch"."""
+    counts = await _call(
+        "count_students",
+        students_logics.count_students,
+        department_id,
+        batch_id,
+        roll_prefix,
+        name,
+        group_by,
+    )
+    return cap_response(counts, "groups") if group_by else counts
+
+
+@server.tool
+async def batch_summary(batch_name: str) -> dict:
+    """Students, free seats, subjects and current-term results of a batch."""
+    return await _call("batch_summary", batches_logic.get_batch_summary, batch_name)
+
+
+@server.tool
+async def result_statistics(
+    batch_name: str,
+    semester: Optional[int] = None,
+    subject_id: Optional[int] = None,
+    exam_type: Optional[str] = None,
+    group_by: str = "subject",
+    term: Optional[int] = None,
+) -> dict:
+    """Result count, average/lowest/highest percentage and pass rate.
+
+    Args:
+        batch_name: The batch, e.g. "D01-B1".
+        semester: Only this semester.
+        subject_id: Only this subject.
+        exam_type: Only this exam type (MIDTERM, FINAL, QUIZ, ASSIGNMENT).
+        group_by: One row per "subject", "exam_type" or "semester".
+        term: Only this academic term, e.g. 20261 (reads one partition).
+    """
+    stats = await _call(
+        "result_statistics",
+        batches_logic.get_batch_result_stats,
+        batch_name,
+        semester,
+        subject_id,
+        exam_type,
+        group_by,
+        term,
+    )
+    return cap_response(stats, "groups")
+
+
+def api_server(token: str = MCP_API_TOKEN, names: dict = None) -> FastMCP:
+    """Every API route as a tool, called over HTTP through the ASGI app.
+
+    ``names`` renames tools by the route's operation id.
+    """
+    from uni.main import app as api
+
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    return FastMCP.from_fastapi(
+        app=api,
+        name="students_management",
+        version="1.0.0",
+        mcp_names=names,
+        httpx_client_kwargs={"headers": headers},
+    )
 
 
-app = FastMCP.from_fastapi(app=app,name="students_management",version="1.0.0")
+app = api_server() if MCP_MODE == "http" else server
 
 if __name__ == "__main__":
+    # Over stdio there are no request headers: MCP_API_TOKEN is the credential
+    if not MCP_API_TOKEN:
+        raise SystemExit("MCP_API_TOKEN is not set")
+    if MCP_MODE != "http":
+        try:
+            authorize()
+        except ToolError as e:
+            raise SystemExit(f"MCP_API_TOKEN rejected: {e}")
+    # The tool calls' metrics are recorded in this process, not the API's
+    if MCP_METRICS_PORT:
+        serve_metrics(MCP_METRICS_PORT)
     app.run()
@@ -0,0 +1,116 @@
+"""Database sessions for the chat agent's tools.
+
+An agent turn opens one session with ``agent_turn()`` and every tool called
+during that turn borrows it through ``tool_session(name)`` instead of checking
+out its own pooled connection. Each borrowed use ends its transaction, so the
+connection goes back to the pool between tool calls (rather than sitting idle
+in transaction while the model thinks) while the session itself is shared.
+Outside a turn (e.g. the login callback)
+``tool_session`` opens a short-lived session of its own.
+
+Agent sessions put a statement timeout on every transaction they begin, so a
+runaway tool query cannot hold a pooled connection for long, and each tool
+call is recorded in the metrics registry as ``method="TOOL"`` with its
+latency and statement count. That registry is the calling process's: the
+agent and the MCP server expose it with ``serve_metrics`` (AGENT_METRICS_PORT,
+MCP_METRICS_PORT), not through the API's ``/metrics``.
+"""
+
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, sessionmaker
+from uni.database.connection import engine
+from uni.utils.metrics import (
+    check_query_budget,
+    registry,
+    start_tracking,
+    stop_tracking,
+)
+
+AGENT_STATEMENT_TIMEOUT_MS = int(os.getenv("AGENT_STATEMENT_TIMEOUT_MS", "5000"))
+
+
+class AgentSyncSession(Session):
+    pass
+
+
+@event.listens_for(AgentSyncSession, "after_begin")
+def _apply_statement_timeout(session, transaction, connection):
+    # SET LOCAL ends with the transaction, so the pooled connection goes back
+    # without it. SQLite has no statement timeout.
+    if AGENT_STATEMENT_TIMEOUT_MS > 0 and connection.dialect.name == "postgresql":
+        connection.exec_driver_sql(
+            f"SET LOCAL statement_timeout = {AGENT_STATEMENT_TIMEOUT_MS}"
+        )
+
+
+AgentSessionLocal = sessionmaker(
+    bind=engine,
+    class_=AsyncSession,
+    sync_session_class=AgentSyncSession,
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+
+class _Turn:
+    __slots__ = ("db", "lock")
+
+    def __init__(self, db):
+        self.db = db
+        # The agent runner may call several tools concurrently; an
+        # AsyncSession must only be used by one of them at a time.
+        self.lock = asyncio.Lock()
+
+
+_current_turn: ContextVar = ContextVar("agent_turn", default=None)
+
+
+@asynccontextmanager
+async def agent_turn():
+    """Share one session between all tool calls made inside the block."""
+    async with AgentSessionLocal() as db:
+        token = _current_turn.set(_Turn(db))
+        try:
+            yield db
+        finally:
+            _current_turn.reset(token)
+
+
+@asynccontextmanager
+async def tool_session(tool_name: str):
+    """Session for one tool call, timed and counted under ``tool_name``."""
+    started = time.perf_counter()
+    stats, token = start_tracking()
+    status = "ok"
+    turn = _current_turn.get()
+    try:
+        if turn is None:
+            async with AgentSessionLocal() as db:
+                yield db
+        else:
+            async with turn.lock:
+                try:
+                    yield turn.db
+                except BaseException:
+                    # Leave the shared session usable for the next tool
+                    await turn.db.rollback()
+                    raise
+                # Releases the connection; loaded objects stay usable
+                # (expire_on_commit=False)
+                await turn.db.commit()
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        stop_tracking(token)
+        registry.record(
+            "TOOL", tool_name, status, time.perf_counter() - started, stats
+        )
+        check_query_budget(f"tool {tool_name}", stats)
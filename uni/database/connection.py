@@ -1,16 +1,50 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
 from dotenv import load_dotenv
+from uni.utils.metrics import install_query_hooks
+from uni.utils.slow_query import install_slow_query_log
 import os
 
 load_dotenv()
 
 DATABASE_URL = os.getenv("STUDENT_DB_URL")
+# Neon needs TLS; a local Postgres used for benchmarks usually has it off
+DB_SSL = os.getenv("DB_SSL", "require")
+IS_POSTGRES = DATABASE_URL.startswith("postgresql")
+# Per-connection asyncpg prepared statement cache. Set to 0 behind a
+# transaction-pooling pgbouncer, which cannot keep prepared statements.
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "500"))
+
+# Default loader for every relationship. In strict mode ("raise") touching a
+# relationship that the query did not load with selectinload/joinedload fails
+# loudly instead of issuing a hidden query (or MissingGreenlet under asyncpg).
+DB_STRICT_LOADING = os.getenv("DB_STRICT_LOADING", "false").lower() in ("1", "true")
+DEFAULT_LAZY = "raise" if DB_STRICT_LOADING else "select"
+
+# results is LIST-partitioned by academic term on Postgres
+# (uni/database/partitions.py).
+# Set to false for a database that has not run that migration yet.
+RESULTS_PARTITIONED = IS_POSTGRES and os.getenv(
+    "RESULTS_PARTITIONING", "true"
+).lower() in ("1", "true")
 
 
 engine = create_async_engine(
-    DATABASE_URL, echo=False, connect_args={"ssl": "require"}, future=True
+    DATABASE_URL,
+    echo=False,
+    connect_args=(
+        {
+            "ssl": DB_SSL,
+            "prepared_statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+            "statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+        }
+        if IS_POSTGRES
+        else {}
+    ),
+    future=True,
 )
+install_query_hooks(engine)
+install_slow_query_log()
 
 AsyncSessionLocal = sessionmaker(
     bind=engine,
@@ -0,0 +1,189 @@
+"""LIST partitions of the ``results`` table, one per academic term (Postgres only).
+
+The partition key is ``results.term``, the academic term the exam was held in
+(``uni/utils/terms.py``), not the batch's semester ordinal: every cohort's
+"semester 3" spans years, whereas a term only ever holds the results of one
+period. The current term's partition stays small, queries that pass a
+``term`` prune to it, and once a term's results are archived its partition
+is empty and can be truncated. Rows whose term has no partition yet land in
+``results_default``; creating the partition moves them out of it.
+
+Create the partitions of the current and next term (plus any term parked in
+the default partition) before a term starts, e.g. from cron::
+
+    python -m uni.database.partitions
+    python -m uni.database.partitions --ahead 3
+
+On SQLite ``results`` is a plain table and this is a no-op.
+"""
+
+import argparse
+import asyncio
+from datetime import datetime
+from sqlalchemy import text
+from uni.database.connection import RESULTS_PARTITIONED, engine
+from uni.utils.terms import academic_term, next_term
+
+DEFAULT_PARTITION = "results_default"
+
+
+def partition_name(term: int) -> str:
+    return f"results_t{int(term)}"
+
+
+async def is_partitioned(conn) -> bool:
+    if conn.dialect.name != "postgresql":
+        return False
+    result = await conn.execute(
+        text(
+            "SELECT 1 FROM pg_partitioned_table "
+            "WHERE partrelid = to_regclass('results')"
+        )
+    )
+    return result.first() is not None
+
+
+async def existing_partitions(conn) -> set:
+    result = await conn.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = to_regclass('results')"
+        )
+    )
+    return set(result.scalars().all())
+
+
+async def create_default_partition(conn):
+    await conn.execute(
+        text(
+            f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF results DEFAULT"
+        )
+    )
+
+
+async def create_term_partition(conn, term: int, existing: set = None) -> bool:
+    """Create the partition of one term; False if it already exists.
+
+    The table is built detached, filled with the rows of that term parked in
+    the default partition and then attached, so it also works after data for
+    the term was written.
+    """
+    name = partition_name(term)
+    existing = existing if existing is not None else await existing_partitions(conn)
+    if name in existing:
+        return False
+    await conn.execute(text(f"CREATE TABLE {name} (LIKE results INCLUDING DEFAULTS)"))
+    if DEFAULT_PARTITION in existing:
+        await conn.execute(
+            text(
+                f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+                f"WHERE term = :term RETURNING *) "
+                f"INSERT INTO {name} SELECT * FROM moved"
+            ),
+            {"term": int(term)},
+        )
+    await conn.execute(
+        text(f"ALTER TABLE results ATTACH PARTITION {name} FOR VALUES IN ({int(term)})")
+    )
+    existing.add(name)
+    return True
+
+
+async def ensure_results_partitions(conn, terms) -> list:
+    """Make sure every term in ``terms`` has its partition."""
+    if not await is_partitioned(conn):
+        return []
+    await create_default_partition(conn)
+    existing = await existing_partitions(conn)
+    return [
+        term
+        for term in sorted(set(terms))
+        if await create_term_partition(conn, term, existing)
+    ]
+
+
+async def upcoming_terms(conn, ahead: int = 1) -> list:
+    """The current term, the ``ahead`` terms after it and any parked ones."""
+    terms = [academic_term(datetime.utcnow())]
+    for _ in range(ahead):
+        terms.append(next_term(terms[-1]))
+    result = await conn.execute(text(f"SELECT DISTINCT term FROM {DEFAULT_PARTITION}"))
+    return terms + list(result.scalars().all())
+
+
+async def results_table_bytes(conn):
+    """On-disk size of results with its indexes (all partitions), or None."""
+    if conn.dialect.name == "postgresql":
+        result = await conn.execute(
+            text(
+                "SELECT coalesce(sum(pg_total_relation_size(relid)), 0) "
+                "FROM pg_partition_tree('results')"
+            )
+        )
+        return int(result.scalar())
+    if conn.dialect.name == "sqlite":
+        try:
+            result = await conn.execute(
+                text(
+                    "SELECT coalesce(sum(pgsize), 0) FROM dbstat WHERE name IN "
+                    "(SELECT name FROM sqlite_master WHERE tbl_name = 'results')"
+                )
+            )
+        except Exception:
+            return None  # SQLite built without the dbstat table
+        return int(result.scalar())
+    return None
+
+
+async def truncate_empty_partitions(conn, terms=None) -> dict:
+    """TRUNCATE partitions left empty, e.g. after archiving a whole term.
+
+    DELETE only marks rows dead; truncating hands the files back to the OS
+    right away instead of after a VACUUM FULL. Only the partitions of
+    ``terms`` are considered when given. Returns the size in bytes each
+    truncated partition had.
+    """
+    if not await is_partitioned(conn):
+        return {}
+    names = await existing_partitions(conn)
+    if terms is not None:
+        names &= {partition_name(term) for term in terms}
+    truncated = {}
+    for name in sorted(names):
+        result = await conn.execute(text(f"SELECT 1 FROM {name} LIMIT 1"))
+        if result.first() is None:
+            result = await conn.execute(
+                text("SELECT pg_total_relation_size(to_regclass(:name))"),
+                {"name": name},
+            )
+            truncated[name] = int(result.scalar())
+            await conn.execute(text(f"TRUNCATE {name}"))
+    return truncated
+
+
+async def main(ahead: int = 1):
+    if not RESULTS_PARTITIONED:
+        print("results is not partitioned on this database, nothing to do")
+        return
+    async with engine.begin() as conn:
+        await create_default_partition(conn)
+        terms = await upcoming_terms(conn, ahead)
+        created = await ensure_results_partitions(conn, terms)
+    await engine.dispose()
+    if created:
+        print("Created partitions: " + ", ".join(map(partition_name, created)))
+    else:
+        print(f"All partitions up to term {max(terms)} already exist")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create results partitions")
+    parser.add_argument(
+        "--ahead",
+        type=int,
+        default=1,
+        help="terms after the current one to create (default: 1)",
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.ahead))
@@ -0,0 +1,92 @@
+"""Prebuilt, parameterized statements for the hot lookups.
+
+Building a ``select()`` and generating its cache key on every call shows up in
+request CPU on the results and student endpoints. These statements are built
+once at import time with ``bindparam`` placeholders and executed with a params
+dict, e.g.::
+
+    await db.execute(BATCH_BY_NAME, {"batch_name": name})
+
+SQLAlchemy compiles each one once per dialect and asyncpg reuses the server
+side prepared statement on every pooled connection.
+"""
+
+from sqlalchemy import bindparam, select
+from sqlalchemy.orm import joinedload
+from uni.models import (
+    Batch,
+    Department,
+    Result,
+    Student,
+    Subject,
+    User,
+    department_subjects,
+    teaching_assignments,
+)
+
+USER_BY_EMAIL = select(User).where(User.email == bindparam("email"))
+# When a student's profile (user and student rows) last changed
+PROFILE_VERSION = (
+    select(User.updated_at, Student.updated_at)
+    .join(Student, Student.user_id == User.user_id)
+    .where(User.email == bindparam("email"))
+)
+
+BATCH_BY_NAME = select(Batch).where(Batch.batch_name == bindparam("batch_name"))
+BATCH_BY_ID = select(Batch).where(Batch.batch_id == bindparam("batch_id"))
+
+SUBJECT_BY_NAME = select(Subject).where(
+    Subject.subject_name == bindparam("subject_name")
+)
+SUBJECT_BY_ID = select(Subject).where(Subject.subject_id == bindparam("subject_id"))
+
+DEPARTMENT_BY_ID = select(Department).where(
+    Department.department_id == bindparam("department_id")
+)
+
+STUDENT_BY_ID = select(Student).where(Student.student_id == bindparam("student_id"))
+STUDENT_BY_ROLL_NUMBER = (
+    select(Student)
+    .options(joinedload(Student.department))
+    .where(Student.roll_number == bindparam("roll_number"))
+)
+
+RESULT_BY_ID = select(Result).where(Result.result_id == bindparam("result_id"))
+
+# Teaching assignments of each batch's active term (batches.current_semester).
+# Permission checks only ever look at this slice.
+ACTIVE_ASSIGNMENTS = select(
+    teaching_assignments.c.teacher_id,
+    teaching_assignments.c.department_id,
+    teaching_assignments.c.batch_id,
+    teaching_assignments.c.subject_id,
+).join(
+    Batch,
+    (Batch.batch_id == teaching_assignments.c.batch_id)
+    & (Batch.current_semester == teaching_assignments.c.semester),
+)
+
+# Existence checks only need one column of one row
+TEACHING_ASSIGNMENT = (
+    select(teaching_assignments.c.teacher_id)
+    .join(
+        Batch,
+        (Batch.batch_id == teaching_assignments.c.batch_id)
+        & (Batch.current_semester == teaching_assignments.c.semester),
+    )
+    .where(
+        teaching_assignments.c.teacher_id == bindparam("teacher_id"),
+        teaching_assignments.c.department_id == bindparam("department_id"),
+        teaching_assignments.c.batch_id == bindparam("batch_id"),
+        teaching_assignments.c.subject_id == bindparam("subject_id"),
+    )
+    .limit(1)
+)
+DEPARTMENT_SUBJECT = (
+    select(department_subjects.c.subject_id)
+    .where(
+        department_subjects.c.department_id == bindparam("department_id"),
+        department_subjects.c.subject_id == bindparam("subject_id"),
+    )
+    .limit(1)
+)
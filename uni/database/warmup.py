@@ -0,0 +1,55 @@
+import asyncio
+import logging
+import time
+from sqlalchemy import text
+from uni.database.connection import engine, AsyncSessionLocal
+from uni.database import statements
+
+logger = logging.getLogger(__name__)
+
+
+# Statements on the login / results hot path. Running each one once per pooled
+# connection fills SQLAlchemy's compiled cache and asyncpg's per-connection
+# prepared statement cache before the first real request arrives.
+HOT_STATEMENTS = [
+    (statements.USER_BY_EMAIL, {"email": ""}),
+    (statements.BATCH_BY_NAME, {"batch_name": ""}),
+    (statements.SUBJECT_BY_NAME, {"subject_name": ""}),
+    (statements.RESULT_BY_ID, {"result_id": 0}),
+    (statements.STUDENT_BY_ROLL_NUMBER, {"roll_number": ""}),
+    (
+        statements.TEACHING_ASSIGNMENT,
+        {"teacher_id": 0, "department_id": 0, "batch_id": 0, "subject_id": 0},
+    ),
+]
+
+
+async def _warm_connection():
+    async with AsyncSessionLocal() as db:
+        await db.execute(text("SELECT 1"))
+        for stmt, params in HOT_STATEMENTS:
+            await db.execute(stmt, params)
+
+
+async def warm_up(connections: int = None):
+    """Open ``connections`` pooled connections concurrently and prime them.
+
+    The sessions are held at the same time so the pool really opens that many
+    connections instead of reusing the first one. Defaults to the pool size,
+    or one connection for pools without one (NullPool, StaticPool). Returns
+    whether it succeeded.
+    """
+    started = time.perf_counter()
+    try:
+        if connections is None:
+            size = getattr(engine.pool, "size", None)
+            connections = size() if size else 1
+        await asyncio.gather(*(_warm_connection() for _ in range(connections)))
+    except Exception as e:
+        logger.warning(f"Database warm-up failed: {str(e)}")
+        return False
+    logger.info(
+        f"Warmed {connections} database connections in "
+        f"{(time.perf_counter() - started) * 1000:.1f} ms"
+    )
+    return True
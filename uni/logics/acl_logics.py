@@ -0,0 +1,112 @@
+import asyncio
+import logging
+import os
+from uni.models import teaching_assignments
+from uni.database.statements import ACTIVE_ASSIGNMENTS, TEACHING_ASSIGNMENT
+from uni.utils.acl import AssignmentACL
+
+logger = logging.getLogger(__name__)
+
+# The maintenance hooks below only reach the process that made the change, so
+# every worker re-reads the active assignments at least this often.
+ACL_TTL = int(os.getenv("ACL_TTL", "60"))
+
+acl = AssignmentACL()
+_reload_lock = asyncio.Lock()
+
+
+async def build_acl(db):
+    """Load the active-term assignments of every batch."""
+    result = await db.execute(ACTIVE_ASSIGNMENTS)
+    acl.load(result.all())
+    logger.info(f"Teaching ACL loaded with {len(acl)} assignments")
+
+
+async def reload_batch(db, batch_id):
+    """Re-read one batch's active assignments, e.g. after its term changed."""
+    acl.revoke_where(batch_id=batch_id)
+    result = await db.execute(
+        ACTIVE_ASSIGNMENTS.where(teaching_assignments.c.batch_id == batch_id)
+    )
+    for row in result.all():
+        acl.grant(*row)
+
+
+async def _refresh(db):
+    """Reload the ACL once it is older than ACL_TTL (one request does it)."""
+    if acl.age() < ACL_TTL:
+        return
+    async with _reload_lock:
+        if acl.age() >= ACL_TTL:
+            await build_acl(db)
+
+
+# A hit is answered from memory, which is at most ACL_TTL seconds behind
+# changes made by other workers. A miss is confirmed against the database, so
+# an assignment made through another worker is still honoured; it costs the
+# same single query every check used to cost. Writes pass confirm=True and
+# are always checked against the database.
+async def can_teacher_access(
+    db, teacher_id, department_id, batch_id, subject_id, confirm=False
+):
+    if not confirm:
+        await _refresh(db)
+        if acl.can_teacher_access(teacher_id, department_id, batch_id, subject_id):
+            return True
+    result = await db.execute(
+        TEACHING_ASSIGNMENT,
+        {
+            "teacher_id": teacher_id,
+            "department_id": department_id,
+            "batch_id": batch_id,
+            "subject_id": subject_id,
+        },
+    )
+    if result.first() is None:
+        # Revoked elsewhere: stop answering reads from the stale entry
+        acl.revoke_where(teacher_id, department_id, batch_id, subject_id)
+        return False
+    acl.grant(teacher_id, department_id, batch_id, subject_id)
+    return True
+
+
+async def can_teacher_access_many(db, teacher_id, targets):
+    """Check a list of (department_id, batch_id, subject_id) for one teacher.
+
+    Any misses are confirmed with one query for all of the teacher's
+    assignments instead of one query per target.
+    """
+    targets = list(targets)
+    await _refresh(db)
+    allowed = acl.can_teacher_access_many(teacher_id, targets)
+    if all(allowed):
+        return allowed
+    result = await db.execute(
+        ACTIVE_ASSIGNMENTS.where(teaching_assignments.c.teacher_id == teacher_id)
+    )
+    for row in result.all():
+        acl.grant(*row)
+    return acl.can_teacher_access_many(teacher_id, targets)
+
+
+# =========================
+# Maintenance hooks (called from the logics modules after commit)
+# =========================
+def grant_assignment(teacher_id, department_id, batch_id, subject_id):
+    acl.grant(teacher_id, department_id, batch_id, subject_id)
+
+
+def revoke_teacher(teacher_id):
+    acl.revoke_where(teacher_id=teacher_id)
+
+
+def revoke_batch(batch_id):
+    acl.revoke_where(batch_id=batch_id)
+
+
+def revoke_subject(subject_id):
+    acl.revoke_where(subject_id=subject_id)
+
+
+def revoke_department(department_id):
+    acl.revoke_where(department_id=department_id)
@@ -0,0 +1,52 @@
+import os
+from uni.database.statements import PROFILE_VERSION
+from uni.utils.ttl_cache import TTLCache
+
+AGENT_TOOL_CACHE_TTL = float(os.getenv("AGENT_TOOL_CACHE_TTL", "60"))
+AGENT_TOOL_CACHE_MAX_ENTRIES = int(os.getenv("AGENT_TOOL_CACHE_MAX_ENTRIES", "10000"))
+
+# Per-user agent tool results. The agent runs in its own process, so the
+# hooks below (called by the API's logics) cannot reach its entries: a cached
+# profile is only served while the users/students ``updated_at`` it was built
+# from are still current.
+tool_cache = TTLCache(
+    "agent_tools", ttl=AGENT_TOOL_CACHE_TTL, max_entries=AGENT_TOOL_CACHE_MAX_ENTRIES
+)
+
+
+def user_tag(user_id) -> str:
+    return f"user:{user_id}"
+
+
+def profile_key(email: str):
+    return ("get_my_profile", email.strip().lower())
+
+
+async def get_profile(db, email: str):
+    """The cached profile, unless the student or its user changed since."""
+    key = profile_key(email)
+    cached = tool_cache.get(key)
+    if cached is None:
+        return None
+    version, profile = cached
+    result = await db.execute(PROFILE_VERSION, {"email": email})
+    if tuple(result.one_or_none() or ()) != version:
+        tool_cache.stale(key)
+        return None
+    return profile
+
+
+def set_profile(email: str, student, profile: dict):
+    """Cache a profile built from ``student`` (with its ``user`` loaded)."""
+    version = (student.user.updated_at, student.updated_at)
+    tool_cache.set(
+        profile_key(email), (version, profile), tags=(user_tag(student.user_id),)
+    )
+
+
+# =========================
+# Maintenance hooks (called from the logics modules after commit)
+# =========================
+def invalidate_user(user_id):
+    """Drop the user's entries in this process (e.g. agent and API in one)."""
+    tool_cache.invalidate_tag(user_tag(user_id))
@@ -0,0 +1,122 @@
+from datetime import datetime
+from fastapi import HTTPException
+from sqlalchemy import delete, insert, literal, or_, select, true
+from uni.models import Batch, teaching_assignments, teaching_assignment_history
+from uni.utils.error_handler import handle_exception
+from uni.logics.acl_logics import reload_batch
+from uni.logics.batches_logic import get_batch_or_404
+
+_COLUMNS = (
+    "assignment_id",
+    "teacher_id",
+    "department_id",
+    "batch_id",
+    "semester",
+    "subject_id",
+)
+
+
+def _past_assignments(batch_id: int = None):
+    """Assignments whose semester is behind their batch's current one.
+
+    A NULL semester (left over from before semesters were tracked) never
+    matches the current term, so those rows grant nothing and go too.
+    """
+    semester = teaching_assignments.c.semester
+    stmt = (
+        select(*(teaching_assignments.c[name] for name in _COLUMNS))
+        .add_columns(teaching_assignments.c.created_at)
+        .join(Batch, Batch.batch_id == teaching_assignments.c.batch_id)
+        .where(or_(semester < Batch.current_semester, semester.is_(None)))
+    )
+    if batch_id is not None:
+        stmt = stmt.where(teaching_assignments.c.batch_id == batch_id)
+    return stmt
+
+
+async def archive_past_assignments(db, batch_id: int = None) -> int:
+    """Move past-term assignments into teaching_assignment_history.
+
+    Keeps teaching_assignments down to the current (and pre-planned future)
+    terms so the permission lookups never wade through years of history.
+    Does not commit; the caller owns the transaction.
+    """
+    past = _past_assignments(batch_id).subquery()
+    now = datetime.utcnow()
+    await db.execute(
+        insert(teaching_assignment_history).from_select(
+            [*_COLUMNS, "created_at", "archived_at"],
+            select(past, literal(now, teaching_assignment_history.c.archived_at.type)),
+        )
+    )
+    result = await db.execute(
+        delete(teaching_assignments).where(
+            teaching_assignments.c.assignment_id.in_(select(past.c.assignment_id))
+        )
+    )
+    return result.rowcount
+
+
+async def advance_semester(db, batch_name: str, semester: int = None):
+    """Start the next term of a batch and archive the assignments left behind."""
+    try:
+        batch = await get_batch_or_404(db, batch_name)
+        new_semester = semester if semester is not None else batch.current_semester + 1
+        if new_semester <= batch.current_semester:
+            raise HTTPException(
+                status_code=400,
+                detail="Semester must be after the batch's current semester",
+            )
+        batch.current_semester = new_semester
+        await db.flush()
+        archived = await archive_past_assignments(db, batch.batch_id)
+        await db.commit()
+        await reload_batch(db, batch.batch_id)
+        return {
+            "batch_name": batch.batch_name,
+            "current_semester": new_semester,
+            "archived_assignments": archived,
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        await handle_exception(db, e, "advancing semester")
+
+
+async def get_teacher_assignments(
+    db, teacher_id: int, semester: int = None, include_history: bool = False
+):
+    """A teacher's assignments for one term.
+
+    Without ``semester`` it returns the active term of each batch, which is
+    what the permission checks use. ``include_history`` adds archived rows of
+    the requested semester (or all of them when no semester is given).
+    """
+    live = teaching_assignments.c
+    stmt = (
+        select(
+            *(live[name] for name in _COLUMNS),
+            (live.semester == Batch.current_semester).label("active"),
+            literal(False).label("archived"),
+        )
+        .join(Batch, Batch.batch_id == live.batch_id)
+        .where(live.teacher_id == teacher_id)
+    )
+    if semester is None:
+        stmt = stmt.where(live.semester == Batch.current_semester)
+    else:
+        stmt = stmt.where(live.semester == semester)
+    rows = [dict(row._mapping) for row in (await db.execute(stmt)).all()]
+
+    if include_history:
+        history = teaching_assignment_history.c
+        stmt = select(
+            *(history[name] for name in _COLUMNS),
+            literal(False).label("active"),
+            literal(True).label("archived"),
+        ).where(
+            history.teacher_id == teacher_id,
+            history.semester == semester if semester is not None else true(),
+        )
+        rows.extend(dict(row._mapping) for row in (await db.execute(stmt)).all())
+    return rows
@@ -0,0 +1,144 @@
+import os
+import logging
+from fastapi import HTTPException
+from sqlalchemy import select
+from uni.models import Student, Teacher, User
+from uni.utils.prefix_index import PrefixIndex
+
+logger = logging.getLogger(__name__)
+
+AUTOCOMPLETE_MAX_ENTRIES = int(os.getenv("AUTOCOMPLETE_MAX_ENTRIES", "200000"))
+AUTOCOMPLETE_MAX_LIMIT = 50
+
+index = PrefixIndex(max_entries=AUTOCOMPLETE_MAX_ENTRIES)
+
+# teacher user_id -> (teacher_id, first_name, last_name), so an email change in
+# users_logics can rebuild the teacher entry without another query
+_teacher_users = {}
+# student user_id -> student_id, so deleting a user (which cascades to its
+# Student row) drops the student entry too
+_student_users = {}
+
+
+def _student_entry(student_id, roll_number, first_name, last_name):
+    full_name = f"{first_name} {last_name}"
+    payload = {
+        "kind": "student",
+        "id": student_id,
+        "label": f"{full_name} ({roll_number})",
+        "roll_number": roll_number,
+        "email": None,
+    }
+    return "student", student_id, payload, [roll_number, full_name, last_name]
+
+
+def _teacher_entry(teacher_id, first_name, last_name, email):
+    full_name = f"{first_name} {last_name}"
+    payload = {
+        "kind": "teacher",
+        "id": teacher_id,
+        "label": f"{full_name} <{email}>" if email else full_name,
+        "roll_number": None,
+        "email": email,
+    }
+    return "teacher", teacher_id, payload, [full_name, last_name, email]
+
+
+async def build_index(db):
+    """Load the index from lean projections instead of full ORM rows."""
+    students = await db.execute(
+        select(
+            Student.student_id,
+            Student.user_id,
+            Student.roll_number,
+            Student.first_name,
+            Student.last_name,
+        )
+    )
+    teachers = await db.execute(
+        select(
+            Teacher.teacher_id,
+            Teacher.user_id,
+            Teacher.first_name,
+            Teacher.last_name,
+            User.email,
+        ).join(User, Teacher.user_id == User.user_id)
+    )
+
+    records = []
+    _student_users.clear()
+    for student_id, user_id, roll_number, first_name, last_name in students.all():
+        _student_users[user_id] = student_id
+        records.append(_student_entry(student_id, roll_number, first_name, last_name))
+    _teacher_users.clear()
+    for teacher_id, user_id, first_name, last_name, email in teachers.all():
+        _teacher_users[user_id] = (teacher_id, first_name, last_name)
+        records.append(_teacher_entry(teacher_id, first_name, last_name, email))
+
+    index.bulk_load(records)
+    logger.info(f"Autocomplete index built with {len(index)} keys")
+
+
+def search(q: str, kind: str = None, limit: int = 10):
+    if kind and kind not in ("student", "teacher"):
+        raise HTTPException(status_code=400, detail="Invalid kind")
+    limit = max(1, min(limit, AUTOCOMPLETE_MAX_LIMIT))
+    return index.search(q, limit=limit, kind=kind)
+
+
+# =========================
+# Index maintenance hooks (called from the logics modules after commit)
+# =========================
+def index_student(student):
+    _student_users[student.user_id] = student.student_id
+    index.add(
+        *_student_entry(
+            student.student_id,
+            student.roll_number,
+            student.first_name,
+            student.last_name,
+        )
+    )
+
+
+def remove_student(student):
+    _student_users.pop(student.user_id, None)
+    index.remove("student", student.student_id)
+
+
+def index_teacher(teacher, email: str = None):
+    if email is None:
+        existing = index.get("teacher", teacher.teacher_id)
+        email = existing["email"] if existing else None
+    _teacher_users[teacher.user_id] = (
+        teacher.teacher_id,
+        teacher.first_name,
+        teacher.last_name,
+    )
+    index.add(
+        *_teacher_entry(
+            teacher.teacher_id, teacher.first_name, teacher.last_name, email
+        )
+    )
+
+
+def remove_teacher(teacher):
+    _teacher_users.pop(teacher.user_id, None)
+    index.remove("teacher", teacher.teacher_id)
+
+
+def remove_user(user_id):
+    teacher = _teacher_users.pop(user_id, None)
+    if teacher is not None:
+        index.remove("teacher", teacher[0])
+    student_id = _student_users.pop(user_id, None)
+    if student_id is not None:
+        index.remove("student", student_id)
+
+
+def update_user_email(user_id, email: str):
+    teacher = _teacher_users.get(user_id)
+    if teacher is None:
+        return
+    teacher_id, first_name, last_name = teacher
+    index.add(*_teacher_entry(teacher_id, first_name, last_name, email))
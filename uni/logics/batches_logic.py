@@ -1,15 +1,27 @@
 from fastapi import HTTPException
-from datetime import datetime
 from uni.models import Subject, Teacher, Student, Result
 from uni.models import Batch, Department
-from sqlalchemy import select, func
+from sqlalchemy import and_, case, select, func, tuple_
+from sqlalchemy.orm import joinedload
 from uni.models.assosiations import batch_subjects
 from uni.schemas.assosiations.batch_subjects import BatchSubjectResponse
 from uni.utils.error_handler import handle_exception
+from uni.database.statements import BATCH_BY_NAME, DEPARTMENT_BY_ID
+from uni.logics.acl_logics import revoke_batch
+from uni.utils.pagination import decode_cursor, encode_cursor
+
+RESULTS_PAGE_SIZE = 100
+RESULTS_MAX_PAGE_SIZE = 500
+RESULT_SORT_COLUMNS = {
+    "result_id": Result.result_id,
+    "semester": Result.semester,
+    "exam_date": Result.exam_date,
+    "marks_obtained": Result.marks_obtained,
+}
 
 
 async def get_batch_or_404(db, batch_name: str):
-    result = await db.execute(select(Batch).where(Batch.batch_name == batch_name.upper()))
+    result = await db.execute(BATCH_BY_NAME, {"batch_name": batch_name.upper()})
     batch = result.scalars().first()
     if not batch:
         raise HTTPException(status_code=404, detail="Batch not found")
@@ -17,7 +29,7 @@ async def get_batch_or_404(db, batch_name: str):
 
 
 async def get_department_or_404(db, department_id: int):
-    result = await db.execute(select(Department).where(Department.department_id == department_id))
+    result = await db.execute(DEPARTMENT_BY_ID, {"department_id": department_id})
     department = result.scalars().first()
     if not department:
         raise HTTPException(status_code=404, detail="Department not found")
@@ -50,6 +62,7 @@ async def create(db, batch):
             batch_name=batch.batch_name.upper(),
             department_id=batch.department_id,
             seats_limit=batch.seats_limit,
+            current_semester=batch.current_semester,
         )
         db.add(new_batch)
         await db.commit()
@@ -92,6 +105,7 @@ async def delete(db, batch_name: str):
         batch = await get_batch_or_404(db, batch_name)
         await db.delete(batch)
         await db.commit()
+        revoke_batch(batch.batch_id)
         return batch
     except Exception as e:
         await handle_exception(db, e, "deleting batch")
@@ -128,7 +142,7 @@ async def get_batch_teachers(db, batch_name: str):
 async def get_batch_students(db, batch_name: str):
     try:
         batch = await get_batch_or_404(db, batch_name)
-        result = await db.execute(select(Student).where(Student.batch_id == batch.batch_id))
+        result = await db.execute(select(Student).options(joinedload(Student.department)).where(Student.batch_id == batch.batch_id))
         return result.scalars().all()
     except Exception as e:
         await handle_exception(db, e, "getting batch students")
@@ -143,15 +157,294 @@ async def get_batch_subjects(db, batch_name: str):
         await handle_exception(db, e, "getting batch subjects")
 
 
-async def get_batch_results(db, batch_name: str):
+def _batch_result_filters(
+    batch, semester=None, subject_id=None, exam_type=None, grade=None, term=None
+):
+    filters = [Result.batch_id == batch.batch_id]
+    # The partition key: with it Postgres only scans that term's partition
+    if term is not None:
+        filters.append(Result.term == term)
+    if semester is not None:
+        filters.append(Result.semester == semester)
+    if subject_id is not None:
+        filters.append(Result.subject_id == subject_id)
+    if exam_type:
+        filters.append(Result.exam_type == exam_type.upper())
+    if grade:
+        filters.append(Result.grade == grade.upper())
+    return filters
+
+
+async def get_batch_results(
+    db,
+    batch_name: str,
+    semester: int = None,
+    subject_id: int = None,
+    exam_type: str = None,
+    grade: str = None,
+    roll_number: str = None,
+    order_by: str = "result_id",
+    limit: int = RESULTS_PAGE_SIZE,
+    cursor: str = None,
+    term: int = None,
+):
+    """One keyset page of a batch's results.
+
+    ``order_by`` is a column of RESULT_SORT_COLUMNS, prefixed with ``-`` for
+    descending order; result_id breaks ties. Pass the returned
+    ``next_cursor`` back to get the following page.
+    """
     try:
         batch = await get_batch_or_404(db, batch_name)
-        result = await db.execute(select(Result).where(Result.batch_id == batch.batch_id))
-        return result.scalars().all()
+        descending = order_by.startswith("-")
+        sort_column = RESULT_SORT_COLUMNS.get(order_by.lstrip("-"))
+        if sort_column is None:
+            raise HTTPException(
+                status_code=400,
+                detail=f"order_by must be one of {', '.join(RESULT_SORT_COLUMNS)}",
+            )
+        keys = [Result.result_id]
+        if sort_column is not Result.result_id:
+            keys.insert(0, sort_column)
+        limit = max(1, min(limit, RESULTS_MAX_PAGE_SIZE))
+
+        query = select(Result).where(
+            *_batch_result_filters(batch, semester, subject_id, exam_type, grade, term)
+        )
+        if roll_number:
+            query = query.join(Student, Student.student_id == Result.student_id).where(
+                Student.roll_number == roll_number
+            )
+        if cursor:
+            values = decode_cursor(cursor, *(key.type.python_type for key in keys))
+            position, last = tuple_(*keys), tuple_(*values)
+            query = query.where(position < last if descending else position > last)
+        query = query.order_by(
+            *(key.desc() if descending else key for key in keys)
+        ).limit(limit + 1)
+
+        result = await db.execute(query)
+        items = result.scalars().all()
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            next_cursor = encode_cursor(*(getattr(items[-1], key.key) for key in keys))
+        return {"items": items, "next_cursor": next_cursor}
+    except HTTPException:
+        raise
     except Exception as e:
         await handle_exception(db, e, "getting batch results")
 
 
+async def get_batch_marksheet(
+    db, batch_name: str, semester: int = None, exam_type: str = None, term: int = None
+):
+    """Pivot a batch's results: one row per student, one column per subject.
+
+    Each cell is the percentage over the matching exams, aggregated by the
+    database in one grouped query with a conditional sum per subject.
+    """
+    try:
+        batch = await get_batch_or_404(db, batch_name)
+        result = await db.execute(
+            select(Subject.subject_id, Subject.subject_name)
+            .join(batch_subjects, batch_subjects.c.subject_id == Subject.subject_id)
+            .where(batch_subjects.c.batch_id == batch.batch_id)
+            .order_by(Subject.subject_id)
+        )
+        subjects = result.all()
+
+        def percentage(condition=None):
+            obtained, total = Result.marks_obtained, Result.total_marks
+            if condition is not None:
+                obtained = case((condition, obtained))
+                total = case((condition, total))
+            return 100.0 * func.sum(obtained) / func.nullif(func.sum(total), 0)
+
+        stmt = (
+            select(
+                Student.student_id,
+                Student.roll_number,
+                Student.first_name,
+                Student.last_name,
+                percentage().label("percentage"),
+                *(
+                    percentage(Result.subject_id == subject_id)
+                    for subject_id, _ in subjects
+                ),
+            )
+            .outerjoin(
+                Result,
+                and_(
+                    Result.student_id == Student.student_id,
+                    *_batch_result_filters(
+                        batch, semester, exam_type=exam_type, term=term
+                    ),
+                ),
+            )
+            .where(Student.batch_id == batch.batch_id)
+            .group_by(
+                Student.student_id,
+                Student.roll_number,
+                Student.first_name,
+                Student.last_name,
+            )
+            .order_by(Student.roll_number)
+        )
+        result = await db.execute(stmt)
+
+        def rounded(value):
+            return None if value is None else round(float(value), 2)
+
+        rows = []
+        for row in result.all():
+            student_id, roll_number, first_name, last_name, overall, *cells = row
+            rows.append(
+                {
+                    "student_id": student_id,
+                    "roll_number": roll_number,
+                    "student_name": f"{first_name} {last_name}",
+                    "marks": {
+                        subject_id: rounded(cell)
+                        for (subject_id, _), cell in zip(subjects, cells)
+                    },
+                    "percentage": rounded(overall),
+                }
+            )
+        return {
+            "batch_name": batch.batch_name,
+            "semester": semester,
+            "exam_type": exam_type.upper() if exam_type else None,
+            "term": term,
+            "subjects": [
+                {"subject_id": subject_id, "subject_name": subject_name}
+                for subject_id, subject_name in subjects
+            ],
+            "rows": rows,
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        await handle_exception(db, e, "getting batch marksheet")
+
+
+RESULT_STAT_GROUPS = {
+    "subject": Result.subject_id,
+    "exam_type": Result.exam_type,
+    "semester": Result.semester,
+}
+
+
+async def get_batch_summary(db, batch_name: str):
+    """Headline numbers of a batch, counted by the database in one query."""
+    try:
+        batch = await get_batch_or_404(db, batch_name)
+        students = (
+            select(func.count(Student.student_id))
+            .where(Student.batch_id == batch.batch_id)
+            .scalar_subquery()
+        )
+        subjects = (
+            select(func.count())
+            .select_from(batch_subjects)
+            .where(batch_subjects.c.batch_id == batch.batch_id)
+            .scalar_subquery()
+        )
+        results = (
+            select(func.count(Result.result_id))
+            .where(
+                Result.batch_id == batch.batch_id,
+                Result.semester == batch.current_semester,
+            )
+            .scalar_subquery()
+        )
+        result = await db.execute(select(students, subjects, results))
+        student_count, subject_count, result_count = result.one()
+        return {
+            "batch_id": batch.batch_id,
+            "batch_name": batch.batch_name,
+            "department_id": batch.department_id,
+            "current_semester": batch.current_semester,
+            "seats_limit": batch.seats_limit,
+            "students": student_count,
+            "seats_free": max(0, batch.seats_limit - student_count),
+            "subjects": subject_count,
+            "current_semester_results": result_count,
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        await handle_exception(db, e, "getting batch summary")
+
+
+async def get_batch_result_stats(
+    db,
+    batch_name: str,
+    semester: int = None,
+    subject_id: int = None,
+    exam_type: str = None,
+    group_by: str = "subject",
+    term: int = None,
+):
+    """Count, average/min/max percentage and pass rate of a batch's results.
+
+    One row per subject, exam type or semester (``group_by``), aggregated by
+    the database instead of shipping the results out. Archived terms
+    (results_archive) are not included.
+    """
+    try:
+        column = RESULT_STAT_GROUPS.get(group_by)
+        if column is None:
+            raise HTTPException(
+                status_code=400,
+                detail=f"group_by must be one of {list(RESULT_STAT_GROUPS)}",
+            )
+        batch = await get_batch_or_404(db, batch_name)
+        percentage = 100.0 * Result.marks_obtained / func.nullif(Result.total_marks, 0)
+        result = await db.execute(
+            select(
+                column,
+                func.count(Result.result_id),
+                func.avg(percentage),
+                func.min(percentage),
+                func.max(percentage),
+                func.sum(case((Result.grade != "F", 1), else_=0)),
+            )
+            .where(
+                *_batch_result_filters(
+                    batch, semester, subject_id, exam_type, term=term
+                )
+            )
+            .group_by(column)
+            .order_by(column)
+        )
+
+        def rounded(value):
+            return None if value is None else round(float(value), 2)
+
+        groups = [
+            {
+                group_by: key,
+                "results": count,
+                "average": rounded(average),
+                "lowest": rounded(lowest),
+                "highest": rounded(highest),
+                "pass_rate": rounded(100.0 * passed / count) if count else None,
+            }
+            for key, count, average, lowest, highest, passed in result.all()
+        ]
+        return {
+            "batch_name": batch.batch_name,
+            "semester": semester,
+            "group_by": group_by,
+            "groups": groups,
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        await handle_exception(db, e, "getting batch result statistics")
+
+
 async def assign_subject(db, batch_name: str, subject_id: int):
     try:
         batch = await get_batch_or_404(db, batch_name)
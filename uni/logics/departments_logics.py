@@ -1,9 +1,11 @@
 from fastapi import HTTPException
 from sqlalchemy import and_, select
+from sqlalchemy.orm import joinedload
 from uni.models import Department, Subject, Batch, Student, Teacher
 from uni.models.assosiations import department_subjects
 from uni.schemas.assosiations.department_subjects import DepartSubjectResponse
 from uni.utils.error_handler import handle_exception
+from uni.logics.acl_logics import revoke_department
 
 
 async def get_department_or_404(db, department_code: str):
@@ -126,6 +128,7 @@ async def delete(db, department_code: str):
 
         await db.delete(department)
         await db.commit()
+        revoke_department(department.department_id)
         return {"detail": "Department deleted successfully"}
     except HTTPException:
         raise
@@ -154,7 +157,7 @@ async def get_department_batches(db, department_code: str):
 async def get_department_students(db, department_code: str):
     try:
         department = await get_department_or_404(db, department_code)
-        result = await db.execute(select(Student).where(Student.department_id == department.department_id))
+        result = await db.execute(select(Student).options(joinedload(Student.department)).where(Student.department_id == department.department_id))
         return result.scalars().all()
     except Exception as e:
         await handle_exception(db, e, "fetching department students")
@@ -0,0 +1,430 @@
+import csv
+import gzip
+import os
+from collections import Counter
+from datetime import datetime
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import bindparam, delete, func, insert, select, update
+from uni.database.connection import AsyncSessionLocal
+from uni.database.partitions import (
+    partition_name,
+    results_table_bytes,
+    truncate_empty_partitions,
+)
+from uni.models import Batch, Job, JobStatus, Result, ResultArchive, Subject
+from uni.utils.error_handler import handle_exception
+from uni.utils.job_queue import JobWorkerPool, PermanentJobError
+from uni.utils.terms import academic_term
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "2"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_RETRY_BASE_SECONDS = float(os.getenv("JOB_RETRY_BASE_SECONDS", "5"))
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "300"))
+JOB_EXPORT_DIR = os.getenv("JOB_EXPORT_DIR", "exports")
+RESULTS_ARCHIVE_DIR = os.getenv("RESULTS_ARCHIVE_DIR", "archive")
+
+CHUNK_SIZE = 1000
+
+
+# =========================
+# Handlers: async (context, payload) -> JSON-serialisable result
+# =========================
+async def _results_scope(db, payload):
+    """Resolve the optional batch_name / subject_name / semester filters."""
+    filters = []
+    if payload.get("semester") is not None:
+        filters.append(Result.semester == int(payload["semester"]))
+    if payload.get("batch_name"):
+        result = await db.execute(
+            select(Batch.batch_id).where(
+                Batch.batch_name == payload["batch_name"].upper()
+            )
+        )
+        batch_id = result.scalar()
+        if batch_id is None:
+            raise PermanentJobError("Batch not found")
+        filters.append(Result.batch_id == batch_id)
+    if payload.get("subject_name"):
+        result = await db.execute(
+            select(Subject.subject_id).where(
+                Subject.subject_name == payload["subject_name"]
+            )
+        )
+        subject_id = result.scalar()
+        if subject_id is None:
+            raise PermanentJobError("Subject not found")
+        filters.append(Result.subject_id == subject_id)
+    return filters
+
+
+async def delete_department_job(context, payload):
+    from uni.logics.departments_logics import delete
+
+    if not payload.get("department_code"):
+        raise PermanentJobError("department_code is required")
+    async with AsyncSessionLocal() as db:
+        return await delete(db, payload["department_code"])
+
+
+async def regrade_results_job(context, payload):
+    """Recompute grades in keyset-paginated chunks, committing per chunk."""
+    from uni.logics.results_logics import calculate_grade
+
+    updated = scanned = 0
+    last_id = 0
+    grade_update = (
+        update(Result.__table__)
+        .where(Result.__table__.c.result_id == bindparam("rid"))
+        .values(grade=bindparam("new_grade"))
+    )
+    async with AsyncSessionLocal() as db:
+        filters = await _results_scope(db, payload)
+        total = (
+            await db.execute(select(func.count(Result.result_id)).where(*filters))
+        ).scalar()
+        while True:
+            rows = (
+                await db.execute(
+                    select(
+                        Result.result_id,
+                        Result.marks_obtained,
+                        Result.total_marks,
+                        Result.grade,
+                    )
+                    .where(Result.result_id > last_id, *filters)
+                    .order_by(Result.result_id)
+                    .limit(CHUNK_SIZE)
+                )
+            ).all()
+            if not rows:
+                break
+            changes = []
+            for result_id, marks_obtained, total_marks, grade in rows:
+                new_grade = calculate_grade(marks_obtained, total_marks)
+                if new_grade != grade:
+                    changes.append({"rid": result_id, "new_grade": new_grade})
+            if changes:
+                await db.execute(grade_update, changes)
+            await db.commit()
+            updated += len(changes)
+            scanned += len(rows)
+            last_id = rows[-1][0]
+            await context.progress(
+                scanned / total if total else 1.0, f"{scanned}/{total} results"
+            )
+    return {"scanned": scanned, "updated": updated}
+
+
+async def export_results_job(context, payload):
+    """Write the selected results to a CSV under JOB_EXPORT_DIR."""
+    os.makedirs(JOB_EXPORT_DIR, exist_ok=True)
+    path = os.path.join(JOB_EXPORT_DIR, f"results-{context.job_id}.csv")
+    columns = (
+        Result.result_id,
+        Result.student_id,
+        Result.subject_id,
+        Result.batch_id,
+        Result.department_id,
+        Result.semester,
+        Result.exam_type,
+        Result.marks_obtained,
+        Result.total_marks,
+        Result.grade,
+        Result.exam_date,
+    )
+    written = 0
+    last_id = 0
+    async with AsyncSessionLocal() as db:
+        filters = await _results_scope(db, payload)
+        total = (
+            await db.execute(select(func.count(Result.result_id)).where(*filters))
+        ).scalar()
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow([column.key for column in columns])
+            while True:
+                rows = (
+                    await db.execute(
+                        select(*columns)
+                        .where(Result.result_id > last_id, *filters)
+                        .order_by(Result.result_id)
+                        .limit(CHUNK_SIZE)
+                    )
+                ).all()
+                if not rows:
+                    break
+                writer.writerows(rows)
+                written += len(rows)
+                last_id = rows[-1][0]
+                await context.progress(
+                    written / total if total else 1.0, f"{written}/{total} rows"
+                )
+    return {"file": path, "rows": written}
+
+
+async def import_students_job(context, payload):
+    """Create students one by one and report per-row errors."""
+    from uni.logics.students_logics import create
+    from uni.schemas.students import StudentCreate
+
+    rows = payload.get("students") or []
+    if not rows:
+        raise PermanentJobError("students list is empty")
+    created, errors = 0, []
+    async with AsyncSessionLocal() as db:
+        for number, row in enumerate(rows, start=1):
+            try:
+                await create(db, StudentCreate(**row))
+                created += 1
+            except ValidationError as e:
+                errors.append({"row": number, "detail": e.errors()[0]["msg"]})
+            except HTTPException as e:
+                errors.append({"row": number, "detail": e.detail})
+            if number % 25 == 0 or number == len(rows):
+                await context.progress(number / len(rows), f"{number}/{len(rows)}")
+    return {"created": created, "failed": len(errors), "errors": errors[:100]}
+
+
+async def archive_assignments_job(context, payload):
+    """Archive past-term assignments of every batch (or one batch_id)."""
+    from uni.logics.assignments_logics import archive_past_assignments
+
+    async with AsyncSessionLocal() as db:
+        archived = await archive_past_assignments(db, payload.get("batch_id"))
+        await db.commit()
+    return {"archived": archived}
+
+
+async def _write_archive_export(db, job_id: int, columns, path: str):
+    """Write the results a job moved to results_archive to a CSV.gz.
+
+    Read back from the archive once the rows are moved, not appended as each
+    chunk commits, so a retry after a crash rewrites the whole file and no
+    archived row is missing from it. Replaces ``path`` only when complete.
+    """
+    archive = ResultArchive.__table__.c
+    partial = f"{path}.partial"
+    last_id = 0
+    with gzip.open(partial, "wt", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        while True:
+            rows = (
+                await db.execute(
+                    select(*(archive[name] for name in columns))
+                    .where(archive.job_id == job_id, archive.result_id > last_id)
+                    .order_by(archive.result_id)
+                    .limit(CHUNK_SIZE)
+                )
+            ).all()
+            if not rows:
+                break
+            writer.writerows(rows)
+            last_id = rows[-1].result_id
+    os.replace(partial, path)
+
+
+async def archive_results_job(context, payload):
+    """Move results of finished terms to results_archive and a CSV.gz.
+
+    Archives whole academic terms: every result whose ``term`` is before
+    ``before_term`` (default: the current term), so a term's partition ends
+    up empty and is truncated. Results of a semester that is still open for
+    its batch (not yet behind its current_semester) are kept and counted as
+    ``kept_open``. Optional ``batch_name`` / ``subject_name`` / ``semester``
+    narrow it down and ``"export": false`` skips the file. Each chunk is
+    copied and deleted in one transaction, so a retried job carries on where
+    it stopped; the archive rows carry the job id and the file is written
+    from them at the end.
+    """
+    hot = Result.__table__.c
+    columns = [
+        column.key
+        for column in ResultArchive.__table__.c
+        if column.key not in ("archived_at", "job_id")
+    ]
+    before_term = int(payload.get("before_term") or academic_term(datetime.utcnow()))
+    finished = (
+        select(*(hot[name] for name in columns))
+        .join(Batch, Batch.batch_id == hot.batch_id)
+        .where(hot.term < before_term)
+    )
+    closed = finished.where(hot.semester < Batch.current_semester)
+    path = None
+    if payload.get("export", True):
+        os.makedirs(RESULTS_ARCHIVE_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_ARCHIVE_DIR, f"results-{context.job_id}.csv.gz")
+
+    moved = 0
+    last_id = 0
+    async with AsyncSessionLocal() as db:
+        filters = await _results_scope(db, payload)
+        bytes_before = await results_table_bytes(await db.connection())
+        total = (
+            await db.execute(
+                select(func.count()).select_from(closed.where(*filters).subquery())
+            )
+        ).scalar()
+        while True:
+            rows = (
+                await db.execute(
+                    closed.where(hot.result_id > last_id, *filters)
+                    .order_by(hot.result_id)
+                    .limit(CHUNK_SIZE)
+                )
+            ).all()
+            if not rows:
+                break
+            await db.execute(
+                insert(ResultArchive.__table__),
+                [{**row._mapping, "job_id": context.job_id} for row in rows],
+            )
+            # The term list lets Postgres prune the delete to its partitions
+            await db.execute(
+                delete(Result.__table__).where(
+                    hot.term.in_({row.term for row in rows}),
+                    hot.result_id.in_([row.result_id for row in rows]),
+                )
+            )
+            await db.commit()
+            moved += len(rows)
+            last_id = rows[-1].result_id
+            await context.progress(
+                moved / total if total else 1.0, f"{moved}/{total} results"
+            )
+        # Everything this job moved, including earlier attempts
+        result = await db.execute(
+            select(ResultArchive.term, func.count())
+            .where(ResultArchive.job_id == context.job_id)
+            .group_by(ResultArchive.term)
+        )
+        archived_by_term = Counter(dict(result.all()))
+        archived = sum(archived_by_term.values())
+        if path:
+            await _write_archive_export(db, context.job_id, columns, path)
+        kept_open = (
+            await db.execute(
+                select(func.count()).select_from(finished.where(*filters).subquery())
+            )
+        ).scalar()
+        truncated = await truncate_empty_partitions(
+            await db.connection(), archived_by_term
+        )
+        await db.commit()
+        bytes_after = await results_table_bytes(await db.connection())
+
+    # Rows deleted from a partition that still has live rows only become
+    # reusable space after (auto)vacuum; they are not returned to the OS.
+    awaiting_vacuum = sum(
+        count
+        for term, count in archived_by_term.items()
+        if partition_name(term) not in truncated
+    )
+    return {
+        "archived": archived,
+        "before_term": before_term,
+        "kept_open": kept_open,
+        "file": path,
+        "hot_bytes_before": bytes_before,
+        "hot_bytes_after": bytes_after,
+        "reclaimed_bytes": sum(truncated.values()),
+        "truncated_partitions": sorted(truncated),
+        "rows_awaiting_vacuum": awaiting_vacuum,
+    }
+
+
+JOB_HANDLERS = {
+    "delete_department": delete_department_job,
+    "regrade_results": regrade_results_job,
+    "export_results": export_results_job,
+    "import_students": import_students_job,
+    "archive_assignments": archive_assignments_job,
+    "archive_results": archive_results_job,
+}
+
+worker_pool = JobWorkerPool(
+    AsyncSessionLocal,
+    JOB_HANDLERS,
+    workers=JOB_WORKERS,
+    poll_interval=JOB_POLL_INTERVAL,
+    retry_base=JOB_RETRY_BASE_SECONDS,
+    lease_seconds=JOB_LEASE_SECONDS,
+)
+
+
+# =========================
+# Job records
+# =========================
+async def get_job_or_404(db, job_id: int):
+    result = await db.execute(select(Job).where(Job.job_id == job_id))
+    job = result.scalars().first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+async def enqueue(db, job_data, current_user):
+    if job_data.kind not in JOB_HANDLERS:
+        raise HTTPException(status_code=400, detail="Unknown job kind")
+    try:
+        job = Job(
+            kind=job_data.kind,
+            payload=job_data.payload,
+            status=JobStatus.QUEUED.value,
+            max_attempts=job_data.max_attempts or JOB_MAX_ATTEMPTS,
+            created_by=current_user["email"],
+        )
+        db.add(job)
+        await db.commit()
+        await db.refresh(job)
+        worker_pool.notify()
+        return job
+    except Exception as e:
+        await handle_exception(db, e, "enqueuing job")
+
+
+async def get(db, job_id: int):
+    return await get_job_or_404(db, job_id)
+
+
+async def get_all(db, status: str = None, kind: str = None, limit: int = 50):
+    query = select(Job).order_by(Job.job_id.desc()).limit(max(1, min(limit, 200)))
+    if status:
+        query = query.where(Job.status == status)
+    if kind:
+        query = query.where(Job.kind == kind)
+    result = await db.execute(query)
+    return result.scalars().all()
+
+
+async def cancel(db, job_id: int):
+    try:
+        job = await get_job_or_404(db, job_id)
+        if job.status == JobStatus.QUEUED.value:
+            job.status = JobStatus.CANCELLED.value
+        elif job.status == JobStatus.RUNNING.value:
+            # Picked up at the handler's next progress() call, or right away
+            # when the job runs in this process
+            job.cancel_requested = True
+        else:
+            raise HTTPException(status_code=400, detail=f"Job already {job.status}")
+        await db.commit()
+        worker_pool.cancel_running(job_id)
+        await db.refresh(job)
+        return job
+    except HTTPException:
+        raise
+    except Exception as e:
+        await handle_exception(db, e, "cancelling job")
+
+
+async def get_export_path(db, job_id: int):
+    job = await get_job_or_404(db, job_id)
+    path = (job.result or {}).get("file")
+    if job.status != JobStatus.SUCCEEDED.value or not path:
+        raise HTTPException(status_code=404, detail="No file for this job")
+    if not os.path.exists(path):
+        raise HTTPException(status_code=410, detail="Export file no longer exists")
+    return path
@@ -1,16 +1,20 @@
 from fastapi import HTTPException, Depends
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, literal, union_all
 from uni.utils.error_handler import handle_exception
-from uni.models import (
-    department_subjects,
-    teaching_assignments,
-    Result,
-    Student,
-    Subject,
-    Batch,
-    Department,
+from uni.models import Result, ResultArchive, Subject
+from uni.database.statements import (
+    BATCH_BY_ID,
+    BATCH_BY_NAME,
+    DEPARTMENT_BY_ID,
+    DEPARTMENT_SUBJECT,
+    RESULT_BY_ID,
+    STUDENT_BY_ID,
+    SUBJECT_BY_ID,
+    SUBJECT_BY_NAME,
 )
 from uni.utils.security import role_required
+from uni.logics.acl_logics import can_teacher_access
+from uni.logics.students_logics import get_student_or_404
 from enum import Enum
 
 
@@ -36,37 +40,39 @@ def calculate_grade(marks_obtained: float, total_marks: float) -> str:
     return "F"
 
 
-# ✅ Role-based access decorator
-
-
 # =========================
 # Get all results
 # =========================
 @role_required(["teacher", "admin"])
-async def get_all(batch_name: str, subject_name: str, current_user: dict, exam_type: str, db):
+async def get_all(
+    batch_name: str,
+    subject_name: str,
+    current_user: dict,
+    exam_type: str,
+    db,
+    semester: int = None,
+    term: int = None,
+):
     try:
-        result = await db.execute(select(Batch).where(Batch.batch_name == batch_name))
+        result = await db.execute(BATCH_BY_NAME, {"batch_name": batch_name})
         batch = result.scalars().first()
         if not batch:
             raise HTTPException(status_code=404, detail="Batch not found")
 
-        result = await db.execute(select(Subject).where(Subject.subject_name == subject_name))
+        result = await db.execute(SUBJECT_BY_NAME, {"subject_name": subject_name})
         subject = result.scalars().first()
         if not subject:
             raise HTTPException(status_code=404, detail="Subject not found")
 
         # Teacher-specific check
         if current_user["user_role"] == "teacher":
-            stmt = select(teaching_assignments).where(
-                and_(
-                    teaching_assignments.c.teacher_id == current_user["user_id"],
-                    teaching_assignments.c.batch_id == batch.batch_id,
-                    teaching_assignments.c.department_id == batch.department_id,
-                    teaching_assignments.c.subject_id == subject.subject_id,
-                )
+            assigned = await can_teacher_access(
+                db,
+                current_user["user_id"],
+                batch.department_id,
+                batch.batch_id,
+                subject.subject_id,
             )
-            result = await db.execute(stmt)
-            assigned = result.first()
             if not assigned:
                 raise HTTPException(status_code=403, detail="Access denied")
 
@@ -76,6 +82,11 @@ async def get_all(batch_name: str, subject_name: str, current_user: dict, exam_t
 
         if exam_type.upper() != "ALL":
             query = query.where(Result.exam_type == exam_type.upper())
+        if semester is not None:
+            query = query.where(Result.semester == semester)
+        # The partition key: with it Postgres only scans that term's partition
+        if term is not None:
+            query = query.where(Result.term == term)
 
         result = await db.execute(query)
         results = result.scalars().all()
@@ -84,6 +95,8 @@ async def get_all(batch_name: str, subject_name: str, current_user: dict, exam_t
 
         return results
 
+    except HTTPException:
+        raise
     except Exception as e:
         await db.rollback()
         return await handle_exception(db, e, action="get_all_results")
@@ -95,22 +108,28 @@ async def get_all(batch_name: str, subject_name: str, current_user: dict, exam_t
 @role_required(["teacher"])
 async def create_result(current_user, db, result_data):
     try:
-        result = await db.execute(select(Student).where(Student.student_id == result_data.student_id))
+        result = await db.execute(
+            STUDENT_BY_ID, {"student_id": result_data.student_id}
+        )
         student = result.scalars().first()
         if not student:
             raise HTTPException(status_code=404, detail="Student not found")
 
-        result = await db.execute(select(Subject).where(Subject.subject_id == result_data.subject_id))
+        result = await db.execute(
+            SUBJECT_BY_ID, {"subject_id": result_data.subject_id}
+        )
         subject = result.scalars().first()
         if not subject:
             raise HTTPException(status_code=404, detail="Subject not found")
 
-        result = await db.execute(select(Batch).where(Batch.batch_id == result_data.batch_id))
+        result = await db.execute(BATCH_BY_ID, {"batch_id": result_data.batch_id})
         batch = result.scalars().first()
         if not batch:
             raise HTTPException(status_code=404, detail="Batch not found")
 
-        result = await db.execute(select(Department).where(Department.department_id == result_data.department_id))
+        result = await db.execute(
+            DEPARTMENT_BY_ID, {"department_id": result_data.department_id}
+        )
         department = result.scalars().first()
         if not department:
             raise HTTPException(status_code=404, detail="Department not found")
@@ -126,13 +145,13 @@ async def create_result(current_user, db, result_data):
             )
 
         # Subject assignment
-        stmt = select(department_subjects).where(
-            and_(
-                department_subjects.c.subject_id == result_data.subject_id,
-                department_subjects.c.department_id == result_data.department_id,
-            )
+        result = await db.execute(
+            DEPARTMENT_SUBJECT,
+            {
+                "department_id": result_data.department_id,
+                "subject_id": result_data.subject_id,
+            },
         )
-        result = await db.execute(stmt)
         assigned_subject = result.first()
         if not assigned_subject:
             raise HTTPException(
@@ -140,17 +159,14 @@ async def create_result(current_user, db, result_data):
             )
 
         # Teacher assignment
-        stmt = select(teaching_assignments).where(
-            and_(
-                teaching_assignments.c.teacher_id == current_user["user_id"],
-                teaching_assignments.c.subject_id == result_data.subject_id,
-                teaching_assignments.c.batch_id == result_data.batch_id,
-                teaching_assignments.c.department_id == result_data.department_id,
-            )
+        teacher_assignment = await can_teacher_access(
+            db,
+            current_user["user_id"],
+            result_data.department_id,
+            result_data.batch_id,
+            result_data.subject_id,
+            confirm=True,
         )
-        result = await db.execute(stmt)
-        teacher_assignment = result.first()
-        
         if not teacher_assignment:
             raise HTTPException(
                 status_code=403, detail="You are not assigned to this subject/batch"
@@ -206,6 +222,8 @@ async def create_result(current_user, db, result_data):
         await db.refresh(new_result)
         return new_result
 
+    except HTTPException:
+        raise
     except Exception as e:
         await db.rollback()
         return await handle_exception(db, e, action="create_result")
@@ -217,23 +235,21 @@ async def create_result(current_user, db, result_data):
 @role_required(["teacher", "admin"])
 async def update_result(db, result_id, result_data, current_user):
     try:
-        result = await db.execute(select(Result).where(Result.result_id == result_id))
+        result = await db.execute(RESULT_BY_ID, {"result_id": result_id})
         result_obj = result.scalars().first()
         if not result_obj:
             raise HTTPException(status_code=404, detail="Result not found")
 
         # Teacher-specific check
         if current_user["user_role"] == "teacher":
-            stmt = select(teaching_assignments).where(
-                and_(
-                    teaching_assignments.c.teacher_id == current_user["user_id"],
-                    teaching_assignments.c.subject_id == result_obj.subject_id,
-                    teaching_assignments.c.batch_id == result_obj.batch_id,
-                    teaching_assignments.c.department_id == result_obj.department_id,
-                )
+            assigned = await can_teacher_access(
+                db,
+                current_user["user_id"],
+                result_obj.department_id,
+                result_obj.batch_id,
+                result_obj.subject_id,
+                confirm=True,
             )
-            result = await db.execute(stmt)
-            assigned = result.first()
             if not assigned:
                 raise HTTPException(
                     status_code=403, detail="You are not assigned to this subject"
@@ -286,6 +302,8 @@ async def update_result(db, result_id, result_data, current_user):
         await db.refresh(result_obj)
         return result_obj
 
+    except HTTPException:
+        raise
     except Exception as e:
         await db.rollback()
         return await handle_exception(db, e, action="update_result")
@@ -297,22 +315,20 @@ async def update_result(db, result_id, result_data, current_user):
 @role_required(["teacher", "admin"])
 async def delete_result(db, result_id, current_user):
     try:
-        result = await db.execute(select(Result).where(Result.result_id == result_id))
+        result = await db.execute(RESULT_BY_ID, {"result_id": result_id})
         result_obj = result.scalars().first()
         if not result_obj:
             raise HTTPException(status_code=404, detail="Result not found")
 
         if current_user["user_role"] == "teacher":
-            stmt = select(teaching_assignments).where(
-                and_(
-                    teaching_assignments.c.teacher_id == current_user["user_id"],
-                    teaching_assignments.c.subject_id == result_obj.subject_id,
-                    teaching_assignments.c.batch_id == result_obj.batch_id,
-                    teaching_assignments.c.department_id == result_obj.department_id,
-                )
+            assigned = await can_teacher_access(
+                db,
+                current_user["user_id"],
+                result_obj.department_id,
+                result_obj.batch_id,
+                result_obj.subject_id,
+                confirm=True,
             )
-            result = await db.execute(stmt)
-            assigned = result.first()
             if not assigned:
                 raise HTTPException(
                     status_code=403, detail="You are not assigned to this subject"
@@ -322,6 +338,58 @@ async def delete_result(db, result_id, current_user):
         await db.commit()
         return {"detail": "Result deleted successfully"}
 
+    except HTTPException:
+        raise
     except Exception as e:
         await db.rollback()
         return await handle_exception(db, e, action="delete_result")
+
+
+# =========================
+# Transcript (hot results + archive)
+# =========================
+def _transcript_rows(table, student_id: int, archived: bool):
+    return select(
+        table.result_id,
+        table.semester,
+        table.subject_id,
+        table.exam_type,
+        table.marks_obtained,
+        table.total_marks,
+        table.grade,
+        table.exam_date,
+        literal(archived).label("archived"),
+    ).where(table.student_id == student_id)
+
+
+@role_required(["admin", "student"])
+async def get_transcript(db, roll_number: str, current_user: dict):
+    """Every result of a student, reading through to archived semesters."""
+    try:
+        student = await get_student_or_404(db, roll_number)
+        if (
+            current_user["user_role"] == "student"
+            and student.user_id != current_user["user_id"]
+        ):
+            raise HTTPException(status_code=403, detail="Access denied")
+
+        rows = union_all(
+            _transcript_rows(Result, student.student_id, False),
+            _transcript_rows(ResultArchive, student.student_id, True),
+        ).subquery()
+        stmt = (
+            select(rows, Subject.subject_name)
+            .outerjoin(Subject, Subject.subject_id == rows.c.subject_id)
+            .order_by(rows.c.semester, rows.c.exam_date, rows.c.result_id)
+        )
+        result = await db.execute(stmt)
+        return {
+            "student_id": student.student_id,
+            "roll_number": student.roll_number,
+            "results": [dict(row._mapping) for row in result.all()],
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        return await handle_exception(db, e, action="get_transcript")
@@ -6,13 +6,20 @@ from pydantic import EmailStr
 from uni.models import User, Student, Department, Batch
 from uni.utils.security import hash_password
 from uni.utils.error_handler import handle_exception
+from uni.logics.autocomplete_logics import index_student, remove_student
+from uni.logics.agent_cache_logics import invalidate_user
 from sqlalchemy.orm import joinedload
+from uni.database.statements import (
+    BATCH_BY_ID,
+    DEPARTMENT_BY_ID,
+    STUDENT_BY_ROLL_NUMBER,
+    USER_BY_EMAIL,
+)
 
 
 async def create(db: AsyncSession, student):
     try:
-        stmt = select(User).where(User.email == student.email)
-        result = await db.execute(stmt)
+        result = await db.execute(USER_BY_EMAIL, {"email": student.email})
         student_exist = result.scalars().first()
 
         if student_exist:
@@ -21,17 +28,15 @@ async def create(db: AsyncSession, student):
         if student.date_of_birth >= date.today():
             raise HTTPException(status_code=400, detail="Invalid date of birth")
 
-        stmt = select(Department).where(
-            Department.department_id == student.department_id
+        result = await db.execute(
+            DEPARTMENT_BY_ID, {"department_id": student.department_id}
         )
-        result = await db.execute(stmt)
         department = result.scalars().first()
 
         if not department:
             raise HTTPException(status_code=400, detail="Invalid department ID")
 
-        stmt = select(Batch).where(Batch.batch_id == student.batch_id)
-        result = await db.execute(stmt)
+        result = await db.execute(BATCH_BY_ID, {"batch_id": student.batch_id})
         batch = result.scalars().first()
 
         if not batch:
@@ -89,7 +94,8 @@ async def create(db: AsyncSession, student):
         )
         db.add(new_student)
         await db.commit()
-        
+        index_student(new_student)
+
         # Re-fetch with eager loading for response schema
         stmt = select(Student).options(joinedload(Student.department)).where(Student.student_id == new_student.student_id)
         result = await db.execute(stmt)
@@ -101,11 +107,7 @@ async def create(db: AsyncSession, student):
 
 
 async def get_student_or_404(db, roll_number: str):
-    result = await db.execute(
-        select(Student)
-        .options(joinedload(Student.department))
-        .where(Student.roll_number == roll_number)
-    )
+    result = await db.execute(STUDENT_BY_ROLL_NUMBER, {"roll_number": roll_number})
     student = result.scalars().first()
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
@@ -188,6 +190,8 @@ async def update(db, roll_number: str, student_data):
 
         await db.commit()
         await db.refresh(student)
+        index_student(student)
+        invalidate_user(student.user_id)
         return student
     except Exception as e:
         await db.rollback()
@@ -199,6 +203,8 @@ async def delete(db, roll_number: str):
         student = await get_student_or_404(db, roll_number)
         await db.delete(student)
         await db.commit()
+        remove_student(student)
+        invalidate_user(student.user_id)
         return {"message": "Student deleted successfully"}
     except HTTPException:
         raise
@@ -255,3 +261,136 @@ async def get_class_roll_numbers(department_id: int, batch_id: int, db, current_
     )
     result = await db.execute(stmt)
     return result.scalars().all()
+
+
+# =========================
+# Projected / paginated student listing (agent and MCP tools)
+# =========================
+STUDENT_FIELDS = {
+    "student_id": Student.student_id,
+    "user_id": Student.user_id,
+    "first_name": Student.first_name,
+    "last_name": Student.last_name,
+    "father_name": Student.father_name,
+    "mother_name": Student.mother_name,
+    "roll_number": Student.roll_number,
+    "batch_id": Student.batch_id,
+    "department_id": Student.department_id,
+    "date_of_birth": Student.date_of_birth,
+    "address": Student.address,
+    "phone_number": Student.phone_number,
+    "created_at": Student.created_at,
+    "updated_at": Student.updated_at,
+    "email": User.email,
+}
+DEFAULT_STUDENT_FIELDS = (
+    "student_id",
+    "roll_number",
+    "first_name",
+    "last_name",
+    "batch_id",
+    "department_id",
+    "email",
+)
+STUDENT_PAGE_SIZE = 25
+STUDENT_MAX_PAGE_SIZE = 100
+STUDENT_GROUPS = {"department": Student.department_id, "batch": Student.batch_id}
+
+
+def student_filters(
+    department_id: int = None,
+    batch_id: int = None,
+    roll_prefix: str = None,
+    name: str = None,
+):
+    filters = []
+    if department_id is not None:
+        filters.append(Student.department_id == department_id)
+    if batch_id is not None:
+        filters.append(Student.batch_id == batch_id)
+    if roll_prefix:
+        filters.append(Student.roll_number.startswith(roll_prefix.upper()))
+    if name:
+        pattern = f"%{name}%"
+        filters.append(
+            Student.first_name.ilike(pattern)
+            | Student.last_name.ilike(pattern)
+            | (Student.first_name + " " + Student.last_name).ilike(pattern)
+        )
+    return filters
+
+
+async def search_students(
+    db,
+    department_id: int = None,
+    batch_id: int = None,
+    roll_prefix: str = None,
+    name: str = None,
+    fields=None,
+    limit: int = STUDENT_PAGE_SIZE,
+    after_student_id: int = None,
+):
+    """One page of students with only the requested fields.
+
+    A single query; users is only joined when ``email`` is requested. Pages
+    are keyed on student_id: pass the returned ``next_after`` to continue.
+    """
+    fields = list(fields or DEFAULT_STUDENT_FIELDS)
+    unknown = [field for field in fields if field not in STUDENT_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields {unknown}; choose from {list(STUDENT_FIELDS)}",
+        )
+    if "student_id" not in fields:
+        fields.insert(0, "student_id")
+    limit = max(1, min(limit, STUDENT_MAX_PAGE_SIZE))
+
+    stmt = select(*(STUDENT_FIELDS[field] for field in fields)).where(
+        *student_filters(department_id, batch_id, roll_prefix, name)
+    )
+    if "email" in fields:
+        stmt = stmt.join(User, User.user_id == Student.user_id)
+    if after_student_id is not None:
+        stmt = stmt.where(Student.student_id > after_student_id)
+    stmt = stmt.order_by(Student.student_id).limit(limit + 1)
+
+    result = await db.execute(stmt)
+    rows = result.all()
+    students = [
+        {
+            field: value.isoformat() if isinstance(value, date) else value
+            for field, value in zip(fields, row)
+        }
+        for row in rows[:limit]
+    ]
+    next_after = students[-1]["student_id"] if len(rows) > limit else None
+    return {"students": students, "next_after": next_after}
+
+
+async def count_students(
+    db,
+    department_id: int = None,
+    batch_id: int = None,
+    roll_prefix: str = None,
+    name: str = None,
+    group_by: str = None,
+):
+    """Count matching students, optionally per department or batch."""
+    filters = student_filters(department_id, batch_id, roll_prefix, name)
+    if not group_by:
+        result = await db.execute(select(func.count(Student.student_id)).where(*filters))
+        return {"total": result.scalar()}
+    column = STUDENT_GROUPS.get(group_by)
+    if column is None:
+        raise HTTPException(
+            status_code=400, detail=f"group_by must be one of {list(STUDENT_GROUPS)}"
+        )
+    result = await db.execute(
+        select(column, func.count(Student.student_id))
+        .where(*filters)
+        .group_by(column)
+        .order_by(column)
+    )
+    groups = [{f"{group_by}_id": key, "count": count} for key, count in result.all()]
+    return {"total": sum(group["count"] for group in groups), "groups": groups}
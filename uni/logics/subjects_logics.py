@@ -1,6 +1,7 @@
 from fastapi import HTTPException
 from sqlalchemy import select
 from uni.models.subjects_table import Subject
+from uni.logics.acl_logics import revoke_subject
 
 
 async def get_subject_or_404(db, subject_id: int):
@@ -54,6 +55,7 @@ async def delete(db, subject_id):
         subject = await get_subject_or_404(db, subject_id)
         await db.delete(subject)
         await db.commit()
+        revoke_subject(subject.subject_id)
         return {"detail": "Subject deleted successfully"}
     except Exception as e:
         await db.rollback()
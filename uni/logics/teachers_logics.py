@@ -1,5 +1,7 @@
 from fastapi import HTTPException
 from sqlalchemy import select, and_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
 from uni.models.teachers_table import Teacher
 from uni.models.users_table import User
 from uni.models.batches_table import Batch
@@ -9,6 +11,12 @@ from uni.models.assosiations import teaching_assignments
 from uni.schemas.users import UserRole
 from uni.schemas.teachers import TeacherAssign
 from uni.utils.security import hash_password
+from uni.logics.autocomplete_logics import index_teacher, remove_teacher
+from uni.logics.acl_logics import grant_assignment, revoke_teacher
+
+# INSERT ... ON CONFLICT of each supported dialect
+DIALECT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+SLOT_COLUMNS = ("batch_id", "subject_id", "semester")
 
 
 async def get_teacher_or_404(db, email: str):
@@ -48,6 +56,7 @@ async def create(db, teacher):
 
         await db.refresh(user_data)
         await db.refresh(teacher_data)
+        index_teacher(teacher_data, user_data.email)
 
         return teacher_data
     except Exception as e:
@@ -71,6 +80,7 @@ async def update(db, email, teacher_data):
 
         await db.commit()
         await db.refresh(teacher)
+        index_teacher(teacher)
         return teacher
     except Exception as e:
         await db.rollback()
@@ -82,6 +92,8 @@ async def delete(db, email):
         teacher = await get_teacher_or_404(db, email)
         await db.delete(teacher)
         await db.commit()
+        remove_teacher(teacher)
+        revoke_teacher(teacher.teacher_id)
         return {"detail": "Teacher deleted successfully"}
     except Exception as e:
         await db.rollback()
@@ -110,6 +122,13 @@ async def assign_teacher(db, teacher_data):
         batch = result.scalars().first()
         if not batch:
             raise HTTPException(status_code=404, detail="Batch not found")
+        # Without a semester the assignment is for the batch's active term
+        if teacher_data.semester is None:
+            teacher_data.semester = batch.current_semester
+        if teacher_data.semester < batch.current_semester:
+            raise HTTPException(
+                status_code=400, detail="Semester already finished for this batch"
+            )
 
         result = await db.execute(select(Department).where(Department.department_id == teacher_data.department_id))
         department = result.scalars().first()
@@ -159,11 +178,13 @@ async def assign_teacher(db, teacher_data):
         if not result.first():
             raise HTTPException(status_code=400, detail="Subject not assigned to batch")
 
+        # A slot is (department, batch, subject) within one semester
         stmt = select(teaching_assignments).where(
             and_(
                 teaching_assignments.c.subject_id == teacher_data.subject_id,
                 teaching_assignments.c.batch_id == teacher_data.batch_id,
                 teaching_assignments.c.department_id == teacher_data.department_id,
+                teaching_assignments.c.semester == teacher_data.semester,
             )
         )
         result = await db.execute(stmt)
@@ -180,6 +201,7 @@ async def assign_teacher(db, teacher_data):
                 teaching_assignments.c.subject_id == teacher_data.subject_id,
                 teaching_assignments.c.batch_id == teacher_data.batch_id,
                 teaching_assignments.c.department_id == teacher_data.department_id,
+                teaching_assignments.c.semester == teacher_data.semester,
             )
         )
         result = await db.execute(stmt)
@@ -196,8 +218,22 @@ async def assign_teacher(db, teacher_data):
             semester=teacher_data.semester,
         )
 
-        await db.execute(assignment)
-        await db.commit()
+        try:
+            await db.execute(assignment)
+            await db.commit()
+        except IntegrityError:
+            # Taken by a concurrent request since the check above
+            await db.rollback()
+            raise HTTPException(
+                status_code=400, detail="Subject already assigned to another teacher"
+            )
+        if teacher_data.semester == batch.current_semester:
+            grant_assignment(
+                teacher_data.teacher_id,
+                teacher_data.department_id,
+                teacher_data.batch_id,
+                teacher_data.subject_id,
+            )
         return {
             "massage": "Teacher assigned to batch successfully",
             "teacher_name": teacher.first_name + " " + teacher.last_name,
@@ -206,8 +242,220 @@ async def assign_teacher(db, teacher_data):
             "subject_name": subject.subject_name, # Fixed: subject.name -> subject.subject_name
             "semester": teacher_data.semester,
         }
+    except HTTPException:
+        raise
     except Exception as e:
         await db.rollback()
         raise HTTPException(
             status_code=500, detail=f"Error assigning teacher to batch: {str(e)}"
         )
+
+
+# =========================
+# Bulk assignment
+# =========================
+async def _load_eligibility(db, rows):
+    """Load everything the bulk checks need in a handful of set-based queries."""
+    from uni.models.assosiations import batch_subjects, department_subjects
+
+    teacher_ids = {row.teacher_id for row in rows}
+    batch_ids = {row.batch_id for row in rows}
+    subject_ids = {row.subject_id for row in rows}
+    semesters = {row.semester for row in rows}
+
+    result = await db.execute(
+        select(Teacher.teacher_id).where(Teacher.teacher_id.in_(teacher_ids))
+    )
+    teachers = set(result.scalars().all())
+
+    result = await db.execute(
+        select(Batch.batch_id, Batch.department_id, Batch.current_semester).where(
+            Batch.batch_id.in_(batch_ids)
+        )
+    )
+    # batch_id -> (department_id, current_semester)
+    batches = {batch_id: (department, term) for batch_id, department, term in result}
+
+    result = await db.execute(
+        select(Subject.subject_id).where(Subject.subject_id.in_(subject_ids))
+    )
+    subjects = set(result.scalars().all())
+
+    result = await db.execute(
+        select(department_subjects.c.department_id, department_subjects.c.subject_id).where(
+            department_subjects.c.subject_id.in_(subject_ids)
+        )
+    )
+    department_subject_pairs = set(result.all())
+
+    result = await db.execute(
+        select(batch_subjects.c.batch_id, batch_subjects.c.subject_id).where(
+            batch_subjects.c.batch_id.in_(batch_ids)
+        )
+    )
+    batch_subject_pairs = set(result.all())
+
+    # (department_id, batch_id, subject_id, semester) -> teacher_id teaching it,
+    # only for the semesters in this request
+    result = await db.execute(
+        select(
+            teaching_assignments.c.department_id,
+            teaching_assignments.c.batch_id,
+            teaching_assignments.c.subject_id,
+            teaching_assignments.c.semester,
+            teaching_assignments.c.teacher_id,
+        ).where(
+            teaching_assignments.c.semester.in_(semesters),
+            teaching_assignments.c.batch_id.in_(batch_ids),
+        )
+    )
+    taken = {(d, b, s, term): t for d, b, s, term, t in result.all()}
+
+    return (
+        teachers,
+        batches,
+        subjects,
+        department_subject_pairs,
+        batch_subject_pairs,
+        taken,
+    )
+
+
+def _check_assignment(row, eligibility, claimed):
+    (
+        teachers,
+        batches,
+        subjects,
+        department_subject_pairs,
+        batch_subject_pairs,
+        taken,
+    ) = eligibility
+
+    if row.teacher_id not in teachers:
+        return None, "Teacher not found"
+    if row.batch_id not in batches:
+        return None, "Batch not found"
+    if row.subject_id not in subjects:
+        return None, "Subject not found"
+    department_id, current_semester = batches[row.batch_id]
+    if row.semester < current_semester:
+        return None, "Semester already finished for this batch"
+    if row.department_id is not None and row.department_id != department_id:
+        return None, "Batch does not belong to given department"
+    if (department_id, row.subject_id) not in department_subject_pairs:
+        return None, "Subject not assigned to department"
+    if (row.batch_id, row.subject_id) not in batch_subject_pairs:
+        return None, "Subject not assigned to batch"
+
+    slot = (department_id, row.batch_id, row.subject_id, row.semester)
+    if slot in taken:
+        if taken[slot] == row.teacher_id:
+            return None, "Duplicate teaching assignment"
+        return None, "Subject already assigned to another teacher"
+    if slot in claimed:
+        return None, f"Conflicts with assignment #{claimed[slot]} in this request"
+    return slot, None
+
+
+def _conflict(index, row, reason):
+    return {
+        "index": index,
+        "teacher_id": row.teacher_id,
+        "batch_id": row.batch_id,
+        "subject_id": row.subject_id,
+        "semester": row.semester,
+        "reason": reason,
+    }
+
+
+async def _insert_assignments(db, assignments) -> set:
+    """One multi-row INSERT that skips taken slots; returns the slots inserted.
+
+    A slot taken by a concurrent request between the checks and the insert
+    is left alone by ON CONFLICT DO NOTHING instead of failing the batch.
+    """
+    insert = DIALECT_INSERTS[db.bind.dialect.name]
+    stmt = (
+        insert(teaching_assignments)
+        .values(assignments)
+        .on_conflict_do_nothing(index_elements=list(SLOT_COLUMNS))
+        .returning(*(teaching_assignments.c[name] for name in SLOT_COLUMNS))
+    )
+    result = await db.execute(stmt)
+    return {tuple(row) for row in result.all()}
+
+
+async def assign_teachers_bulk(db, data):
+    """Validate a whole timetable in memory and insert the valid rows at once.
+
+    Applies the same rules as ``assign_teacher`` (plus batch/department
+    consistency) but loads the eligibility (teachers, batches,
+    department/batch subjects, assignments of the requested semesters) once
+    instead of running eight queries per row.
+    """
+    rows = data.assignments
+    if not rows:
+        raise HTTPException(status_code=400, detail="No assignments given")
+    try:
+        eligibility = await _load_eligibility(db, rows)
+        batches = eligibility[1]
+
+        claimed = {}  # slot -> index of the row that took it in this request
+        valid, conflicts = [], []
+        indexes = []  # of the request row behind each valid assignment
+        for index, row in enumerate(rows):
+            slot, reason = _check_assignment(row, eligibility, claimed)
+            if reason:
+                conflicts.append(_conflict(index, row, reason))
+                continue
+            claimed[slot] = index
+            indexes.append(index)
+            valid.append(
+                {
+                    "teacher_id": row.teacher_id,
+                    "department_id": slot[0],
+                    "batch_id": row.batch_id,
+                    "subject_id": row.subject_id,
+                    "semester": row.semester,
+                }
+            )
+
+        inserted = []
+        if valid and not data.dry_run:
+            inserted_slots = await _insert_assignments(db, valid)
+            await db.commit()
+            for index, assignment in zip(indexes, valid):
+                slot = tuple(assignment[name] for name in SLOT_COLUMNS)
+                if slot not in inserted_slots:
+                    conflicts.append(
+                        _conflict(
+                            index,
+                            rows[index],
+                            "Subject already assigned to another teacher",
+                        )
+                    )
+                    continue
+                inserted.append(assignment)
+                if assignment["semester"] == batches[assignment["batch_id"]][1]:
+                    grant_assignment(
+                        assignment["teacher_id"],
+                        assignment["department_id"],
+                        assignment["batch_id"],
+                        assignment["subject_id"],
+                    )
+            valid = inserted
+
+        conflicts.sort(key=lambda conflict: conflict["index"])
+        return {
+            "requested": len(rows),
+            "valid": len(valid),
+            "inserted": len(inserted),
+            "conflicts": conflicts,
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=500, detail=f"Error assigning teachers in bulk: {str(e)}"
+        )
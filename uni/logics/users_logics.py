@@ -13,6 +13,10 @@ from uni.utils.security import (
 )
 import asyncio
 from uni.utils.security import role_required
+from uni.logics.autocomplete_logics import update_user_email, remove_user
+from uni.logics.agent_cache_logics import invalidate_user
+from uni.logics.acl_logics import revoke_teacher
+from uni.database.statements import USER_BY_EMAIL
 
 load_dotenv()
 
@@ -40,7 +44,7 @@ async def login(current_user, db):
                 "user_role": "admin",
                 "user_token": token,
             }
-        db_user = await db.execute(select(User).where(User.email == current_user.email))
+        db_user = await db.execute(USER_BY_EMAIL, {"email": current_user.email})
         db_user = db_user.scalars().first()
         if db_user and verify_password(current_user.password, db_user.password):
             token = create_access_token(
@@ -88,6 +92,8 @@ async def update_by_admin(db, user_id, user):
 
         await db.commit()
         await db.refresh(db_user)
+        update_user_email(db_user.user_id, db_user.email)
+        invalidate_user(db_user.user_id)
 
         return db_user
     except Exception as e:
@@ -114,6 +120,8 @@ async def update(db, user_id, user):
 
         await db.commit()
         await db.refresh(db_user)
+        update_user_email(db_user.user_id, db_user.email)
+        invalidate_user(db_user.user_id)
 
         return db_user
     except Exception as e:
@@ -127,9 +135,18 @@ async def delete(db, user_id):
         db_user = result.scalars().first()
         if not db_user:
             raise HTTPException(status_code=404, detail="User not found")
+        # The Teacher rows go with the user; their assignments must leave the ACL
+        result = await db.execute(
+            select(Teacher.teacher_id).where(Teacher.user_id == user_id)
+        )
+        teacher_ids = result.scalars().all()
 
         await db.delete(db_user)
         await db.commit()
+        remove_user(db_user.user_id)
+        invalidate_user(db_user.user_id)
+        for teacher_id in teacher_ids:
+            revoke_teacher(teacher_id)
 
         return {"message": "User deleted successfully"}
     except Exception as e:
@@ -1,6 +1,15 @@
-from fastapi import FastAPI
+import os
+import logging
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
+from uni.database.connection import AsyncSessionLocal, engine
+from uni.database.warmup import warm_up
+from uni.logics.autocomplete_logics import build_index
+from uni.logics.acl_logics import build_acl
+from uni.logics.jobs_logics import worker_pool
+from uni.utils.metrics import MetricsMiddleware
 from uni.routes import (
     users_routes,
     teachers_routes,
@@ -9,9 +18,57 @@ from uni.routes import (
     results_routes,
     subjects_routes,
     departments_routes,
+    autocomplete_routes,
+    metrics_routes,
+    jobs_routes,
 )
 
-app = FastAPI(title="UMS API", swagger_ui_parameters={"persistAuthorization": True})
+
+logger = logging.getLogger(__name__)
+
+DB_WARMUP_CONNECTIONS = os.getenv("DB_WARMUP_CONNECTIONS")
+
+
+async def prepare(connections: int = None) -> bool:
+    """Warm the pool and load the autocomplete index and the teaching ACL.
+
+    Returns whether all of it succeeded; with the database down the app still
+    starts, and /ready runs this again until it does.
+    """
+    if not await warm_up(connections):
+        return False
+    try:
+        async with AsyncSessionLocal() as db:
+            await build_index(db)
+            await build_acl(db)
+    except Exception as e:
+        logger.warning(f"Loading the autocomplete index and ACL failed: {str(e)}")
+        return False
+    return True
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Uvicorn only starts accepting requests once this block reaches `yield`,
+    # so the pool is warm before the worker reports ready.
+    prepared = await prepare(
+        int(DB_WARMUP_CONNECTIONS) if DB_WARMUP_CONNECTIONS else None
+    )
+    await worker_pool.start()
+    app.state.started = True
+    # A failed start is retried by /ready, which stays 503 until it works
+    app.state.ready = prepared
+    yield
+    app.state.started = app.state.ready = False
+    await worker_pool.stop()
+    await engine.dispose()
+
+
+app = FastAPI(
+    title="UMS API",
+    swagger_ui_parameters={"persistAuthorization": True},
+    lifespan=lifespan,
+)
 
 
 # React usually port 3000 par chalta hai
@@ -26,7 +83,10 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Saari requests allow karein (GET, POST, DELETE)
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
+# Added last so it wraps CORS too and times the whole request
+app.add_middleware(MetricsMiddleware)
 
 
 app.include_router(users_routes.router)
@@ -36,6 +96,19 @@ app.include_router(students_routes.router)
 app.include_router(results_routes.router)
 app.include_router(subjects_routes.router)
 app.include_router(departments_routes.router)
+app.include_router(autocomplete_routes.router)
+app.include_router(metrics_routes.router)
+app.include_router(jobs_routes.router)
+
+
+@app.get("/ready", include_in_schema=False)
+async def ready(response: Response):
+    if getattr(app.state, "started", False) and not app.state.ready:
+        app.state.ready = await prepare(1)
+    if not getattr(app.state, "ready", False):
+        response.status_code = 503
+        return {"ready": False}
+    return {"ready": True}
 
 
 def start():
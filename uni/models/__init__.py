@@ -7,12 +7,15 @@ from .subjects_table import Subject
 from .teachers_table import Teacher
 from .students_table import Student
 from .results_table import Result
+from .results_archive_table import ResultArchive
+from .jobs_table import Job, JobStatus
 
 # Association tables
 from .assosiations import (
     batch_subjects,
     department_subjects,
     teaching_assignments,
+    teaching_assignment_history,
 )
 
 __all__ = [
@@ -23,7 +26,11 @@ __all__ = [
     "Teacher",
     "Student",
     "Result",
+    "ResultArchive",
+    "Job",
+    "JobStatus",
     "batch_subjects",
     "department_subjects",
     "teaching_assignments",
+    "teaching_assignment_history",
 ]
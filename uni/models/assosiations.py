@@ -1,4 +1,13 @@
-from sqlalchemy import Table, Column, Integer, ForeignKey, DateTime, func
+from sqlalchemy import (
+    Table,
+    Column,
+    Integer,
+    ForeignKey,
+    DateTime,
+    Index,
+    UniqueConstraint,
+    func,
+)
 from uni.database.connection import Base
 
 department_subjects = Table(
@@ -43,4 +52,27 @@ teaching_assignments = Table(
     ),
     Column("created_at", DateTime, server_default=func.now()),
     Column("updated_at", DateTime, server_default=func.now(), onupdate=func.now()),
+    Index("ix_teaching_assignments_semester_teacher", "semester", "teacher_id"),
+    # One teacher per subject of a batch in a semester
+    UniqueConstraint(
+        "batch_id", "subject_id", "semester", name="uq_teaching_assignments_slot"
+    ),
+)
+
+# Assignments of past terms, moved out of teaching_assignments when a batch
+# advances its semester. No foreign keys: history outlives deleted teachers.
+# Nullable like their teaching_assignments columns, so legacy rows with gaps
+# are archived as they are.
+teaching_assignment_history = Table(
+    "teaching_assignment_history",
+    Base.metadata,
+    Column("assignment_id", Integer, primary_key=True),
+    Column("teacher_id", Integer),
+    Column("department_id", Integer),
+    Column("batch_id", Integer, nullable=False, index=True),
+    Column("semester", Integer),
+    Column("subject_id", Integer),
+    Column("created_at", DateTime),
+    Column("archived_at", DateTime, server_default=func.now()),
+    Index("ix_teaching_assignment_history_semester_teacher", "semester", "teacher_id"),
 )
@@ -1,5 +1,5 @@
 from sqlalchemy import Column, Integer, String, Boolean, DateTime, func, ForeignKey
-from uni.database.connection import Base
+from uni.database.connection import Base, DEFAULT_LAZY
 from sqlalchemy.orm import relationship
 
 
@@ -15,15 +15,24 @@ class Batch(Base):
         index=True,
     )
     seats_limit = Column(Integer, nullable=False, index=True)
+    # The active term: teaching assignments for this semester are the ones
+    # permission checks look at; older ones get archived
+    current_semester = Column(Integer, nullable=False, default=1, server_default="1")
 
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
-    department = relationship("Department", back_populates="batches")
+    department = relationship("Department", back_populates="batches", lazy=DEFAULT_LAZY)
     students = relationship(
-        "Student", back_populates="batches", cascade="all, delete-orphan"
+        "Student",
+        back_populates="batches",
+        cascade="all, delete-orphan",
+        lazy=DEFAULT_LAZY,
     )
     subjects = relationship(
-        "Subject", secondary="batch_subjects", back_populates="batches"
+        "Subject",
+        secondary="batch_subjects",
+        back_populates="batches",
+        lazy=DEFAULT_LAZY,
     )
-    results = relationship("Result", back_populates="batch")
+    results = relationship("Result", back_populates="batch", lazy=DEFAULT_LAZY)
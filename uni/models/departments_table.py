@@ -8,7 +8,7 @@ from sqlalchemy import (
     ForeignKey,
     Table,
 )
-from uni.database.connection import Base
+from uni.database.connection import Base, DEFAULT_LAZY
 from sqlalchemy.orm import relationship
 
 
@@ -27,17 +27,27 @@ class Department(Base):
         secondary="teaching_assignments",
         back_populates="departments",
         overlaps="subjects,teachers",
+        lazy=DEFAULT_LAZY,
     )
     batches = relationship(
-        "Batch", back_populates="department", cascade="all, delete-orphan"
+        "Batch",
+        back_populates="department",
+        cascade="all, delete-orphan",
+        lazy=DEFAULT_LAZY,
     )
 
     students = relationship(
-        "Student", back_populates="department", cascade="all, delete-orphan"
+        "Student",
+        back_populates="department",
+        cascade="all, delete-orphan",
+        lazy=DEFAULT_LAZY,
     )
 
     subjects = relationship(
-        "Subject", secondary="department_subjects", back_populates="departments"
+        "Subject",
+        secondary="department_subjects",
+        back_populates="departments",
+        lazy=DEFAULT_LAZY,
     )
 
-    results = relationship("Result", back_populates="department")
+    results = relationship("Result", back_populates="department", lazy=DEFAULT_LAZY)
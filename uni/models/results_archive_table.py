@@ -0,0 +1,34 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, Index, func
+from uni.database.connection import Base
+
+
+class ResultArchive(Base):
+    """Results of closed terms, moved out of ``results``.
+
+    Same columns as ``Result`` but only the one index transcripts need and no
+    foreign keys, so archived grades outlive deleted students and subjects.
+    """
+
+    __tablename__ = "results_archive"
+
+    result_id = Column(Integer, primary_key=True)
+    student_id = Column(Integer, nullable=False)
+    subject_id = Column(Integer, nullable=False)
+    batch_id = Column(Integer, nullable=False)
+    department_id = Column(Integer, nullable=False)
+    semester = Column(Integer, nullable=False)
+    term = Column(Integer, nullable=False)
+    exam_type = Column(String, nullable=False)
+    marks_obtained = Column(Float, nullable=False)
+    total_marks = Column(Float, nullable=False)
+    grade = Column(String, nullable=True)
+    exam_date = Column(DateTime, nullable=False)
+    created_at = Column(DateTime)
+    updated_at = Column(DateTime)
+    archived_at = Column(DateTime, server_default=func.now())
+    # The archive_results job that moved it; its export is read back by this
+    job_id = Column(Integer, nullable=True, index=True)
+
+    __table_args__ = (
+        Index("ix_results_archive_student_semester", "student_id", "semester"),
+    )
@@ -1,12 +1,22 @@
 from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, func, Enum
-from uni.database.connection import Base
+from uni.database.connection import Base, DEFAULT_LAZY, RESULTS_PARTITIONED
 from sqlalchemy.orm import relationship
+from uni.utils.terms import academic_term
 import enum
-from uni.database.connection import Base
+
+
+def _exam_term(context):
+    return academic_term(context.get_current_parameters().get("exam_date"))
 
 
 class Result(Base):
     __tablename__ = "results"
+    # On Postgres one LIST partition per academic term (uni/database/partitions.py).
+    # The partition key has to be part of the table's primary key there; the
+    # ORM still identifies a result by result_id alone.
+    __table_args__ = (
+        {"postgresql_partition_by": "LIST (term)"} if RESULTS_PARTITIONED else {}
+    )
 
     result_id = Column(Integer, primary_key=True, autoincrement=True, index=True)
 
@@ -36,6 +46,14 @@ class Result(Base):
     )
 
     semester = Column(Integer, nullable=False, index=True)  # e.g., 1, 2, 3, 4
+    # Academic term of exam_date, e.g. 20262 (uni/utils/terms.py)
+    term = Column(
+        Integer,
+        nullable=False,
+        index=True,
+        default=_exam_term,
+        primary_key=RESULTS_PARTITIONED,
+    )
     exam_type = Column(String, nullable=False, index=True)
 
     marks_obtained = Column(Float, nullable=False)
@@ -47,7 +65,9 @@ class Result(Base):
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
     # Relationships
-    student = relationship("Student", back_populates="results")
-    subject = relationship("Subject", back_populates="results")
-    batch = relationship("Batch", back_populates="results")
-    department = relationship("Department", back_populates="results")
+    student = relationship("Student", back_populates="results", lazy=DEFAULT_LAZY)
+    subject = relationship("Subject", back_populates="results", lazy=DEFAULT_LAZY)
+    batch = relationship("Batch", back_populates="results", lazy=DEFAULT_LAZY)
+    department = relationship("Department", back_populates="results", lazy=DEFAULT_LAZY)
+
+    __mapper_args__ = {"primary_key": [result_id]}
@@ -8,7 +8,7 @@ from sqlalchemy import (
     func,
     ForeignKey,
 )
-from uni.database.connection import Base
+from uni.database.connection import Base, DEFAULT_LAZY
 from sqlalchemy.orm import relationship
 
 
@@ -46,16 +46,21 @@ class Student(Base):
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
-    batches = relationship("Batch", back_populates="students")
-    department = relationship("Department", back_populates="students")
+    batches = relationship("Batch", back_populates="students", lazy=DEFAULT_LAZY)
+    department = relationship(
+        "Department", back_populates="students", lazy=DEFAULT_LAZY
+    )
     user = relationship(
         "User",
         back_populates="students",
         cascade="all, delete-orphan",
-        lazy="joined",
         single_parent=True,
+        lazy=DEFAULT_LAZY,
     )
 
     results = relationship(
-        "Result", back_populates="student", cascade="all, delete-orphan"
+        "Result",
+        back_populates="student",
+        cascade="all, delete-orphan",
+        lazy=DEFAULT_LAZY,
     )
@@ -1,5 +1,5 @@
 from sqlalchemy import Column, Integer, String, Boolean, DateTime, func, ForeignKey
-from uni.database.connection import Base
+from uni.database.connection import Base, DEFAULT_LAZY
 from sqlalchemy.orm import relationship
 
 
@@ -15,15 +15,22 @@ class Subject(Base):
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
     departments = relationship(
-        "Department", secondary="department_subjects", back_populates="subjects"
+        "Department",
+        secondary="department_subjects",
+        back_populates="subjects",
+        lazy=DEFAULT_LAZY,
     )
     batches = relationship(
-        "Batch", secondary="batch_subjects", back_populates="subjects"
+        "Batch",
+        secondary="batch_subjects",
+        back_populates="subjects",
+        lazy=DEFAULT_LAZY,
     )
     teachers = relationship(
         "Teacher",
         secondary="teaching_assignments",
         back_populates="subjects",
         overlaps="departments,teachers",
+        lazy=DEFAULT_LAZY,
     )
-    results = relationship("Result", back_populates="subject")
+    results = relationship("Result", back_populates="subject", lazy=DEFAULT_LAZY)
@@ -1,5 +1,5 @@
 from sqlalchemy import Column, Integer, String, Boolean, DateTime, func, ForeignKey
-from uni.database.connection import Base
+from uni.database.connection import Base, DEFAULT_LAZY
 from sqlalchemy.orm import relationship
 
 
@@ -22,12 +22,15 @@ class Teacher(Base):
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
-    user = relationship("User", back_populates="teachers")  # Removed incorrect cascade
+    user = relationship(
+        "User", back_populates="teachers", lazy=DEFAULT_LAZY
+    )  # Removed incorrect cascade
     departments = relationship(
         "Department",
         secondary="teaching_assignments",
         back_populates="teachers",
         overlaps="subjects,teachers",
+        lazy=DEFAULT_LAZY,
     )
 
     subjects = relationship(
@@ -35,4 +38,5 @@ class Teacher(Base):
         secondary="teaching_assignments",
         back_populates="teachers",
         overlaps="departments,teachers",
+        lazy=DEFAULT_LAZY,
     )
@@ -11,8 +11,8 @@ from sqlalchemy import (
 from sqlalchemy.orm import relationship
 
 
-from uni.database.connection import Base
-from uni.schemas.users import UserRole
+from uni.database.connection import Base, DEFAULT_LAZY
+from uni.schemas.roles import UserRole
 
 
 class User(Base):
@@ -27,8 +27,13 @@ class User(Base):
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
-    students = relationship("Student", back_populates="user", uselist=False)
+    students = relationship(
+        "Student", back_populates="user", uselist=False, lazy=DEFAULT_LAZY
+    )
 
     teachers = relationship(
-        "Teacher", back_populates="user", cascade="all, delete-orphan"
+        "Teacher",
+        back_populates="user",
+        cascade="all, delete-orphan",
+        lazy=DEFAULT_LAZY,
     )
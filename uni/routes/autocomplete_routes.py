@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Depends, Query
+from typing import List, Optional
+from uni.schemas.autocomplete import AutocompleteResponse
+from uni.logics.autocomplete_logics import search
+from uni.utils.security import is_admin_user
+
+router = APIRouter(
+    prefix="/autocomplete", tags=["autocomplete"], dependencies=[Depends(is_admin_user)]
+)
+
+
+@router.get("/", response_model=List[AutocompleteResponse])
+async def autocomplete(
+    q: str = Query(..., min_length=1),
+    kind: Optional[str] = None,
+    limit: int = 10,
+):
+    return search(q, kind, limit)
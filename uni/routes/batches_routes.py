@@ -1,10 +1,9 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 from uni.database.connection import get_db
-from uni.schemas.batches import BatchResponse, BatchUpdate, BatchCreate, massageResponse, BatchDropdownResponse
+from uni.schemas.batches import BatchResponse, BatchUpdate, BatchCreate, massageResponse, BatchDropdownResponse, AdvanceSemesterResponse, BatchResultsPage, MarksheetResponse
 from uni.schemas.teachers import TeacherResponse
 from uni.schemas.students import StudentResponse
-from uni.schemas.results import ResultResponse
 from uni.schemas.subjects import SubjectResponse
 from uni.schemas.assosiations.batch_subjects import BatchSubjectResponse
 from uni.schemas.frontend import DropdownResponse
@@ -19,9 +18,11 @@ from uni.logics.batches_logic import (
     get_batch_students,
     get_batch_subjects,
     get_batch_results,
+    get_batch_marksheet,
     assign_subject,
     get_batches_dropdown,
 )
+from uni.logics.assignments_logics import advance_semester
 
 router = APIRouter(prefix="/batches", tags=["batches"])
 
@@ -86,10 +87,49 @@ async def get_subjects(batch_name: str, db: Session = Depends(get_db)):
 @router.get(
     "/get_results/{batch_name}",
     dependencies=[Depends(is_admin_user)],
-    response_model=list[ResultResponse],
+    response_model=BatchResultsPage,
 )
-async def get_results(batch_name: str, db: Session = Depends(get_db)):
-    return await get_batch_results(db, batch_name)
+async def get_results(
+    batch_name: str,
+    semester: int = None,
+    subject_id: int = None,
+    exam_type: str = None,
+    grade: str = None,
+    roll_number: str = None,
+    order_by: str = "result_id",
+    limit: int = 100,
+    cursor: str = None,
+    term: int = None,
+    db: Session = Depends(get_db),
+):
+    return await get_batch_results(
+        db,
+        batch_name,
+        semester,
+        subject_id,
+        exam_type,
+        grade,
+        roll_number,
+        order_by,
+        limit,
+        cursor,
+        term,
+    )
+
+
+@router.get(
+    "/marksheet/{batch_name}",
+    dependencies=[Depends(is_admin_user)],
+    response_model=MarksheetResponse,
+)
+async def get_marksheet(
+    batch_name: str,
+    semester: int = None,
+    exam_type: str = None,
+    term: int = None,
+    db: Session = Depends(get_db),
+):
+    return await get_batch_marksheet(db, batch_name, semester, exam_type, term)
 
 
 @router.post(
@@ -110,3 +150,14 @@ async def assign_subject_to_batch(
 )
 async def get_dropdown(department_id: int = None, db: Session = Depends(get_db)):
     return await get_batches_dropdown(db, department_id)
+
+
+@router.post(
+    "/advance_semester/{batch_name}",
+    dependencies=[Depends(is_admin_user)],
+    response_model=AdvanceSemesterResponse,
+)
+async def advance_batch_semester(
+    batch_name: str, semester: int = None, db: Session = Depends(get_db)
+):
+    return await advance_semester(db, batch_name, semester)
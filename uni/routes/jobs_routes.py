@@ -0,0 +1,49 @@
+from fastapi import APIRouter, Depends, Response
+from fastapi.responses import FileResponse
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from uni.database.connection import get_db
+from uni.schemas.jobs import JobCreate, JobResponse
+from uni.logics.jobs_logics import enqueue, get, get_all, cancel, get_export_path
+from uni.utils.security import get_current_user, is_admin_user
+
+router = APIRouter(prefix="/jobs", tags=["jobs"], dependencies=[Depends(is_admin_user)])
+
+
+@router.post("/", response_model=JobResponse, status_code=202)
+async def create_job(
+    job: JobCreate,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    new_job = await enqueue(db, job, current_user)
+    response.headers["Location"] = f"/jobs/{new_job.job_id}"
+    return new_job
+
+
+@router.get("/", response_model=List[JobResponse])
+async def list_jobs(
+    status: Optional[str] = None,
+    kind: Optional[str] = None,
+    limit: int = 50,
+    db: Session = Depends(get_db),
+):
+    return await get_all(db, status, kind, limit)
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(job_id: int, db: Session = Depends(get_db)):
+    return await get(db, job_id)
+
+
+@router.post("/{job_id}/cancel", response_model=JobResponse)
+async def cancel_job(job_id: int, db: Session = Depends(get_db)):
+    return await cancel(db, job_id)
+
+
+@router.get("/{job_id}/download")
+async def download_job_file(job_id: int, db: Session = Depends(get_db)):
+    path = await get_export_path(db, job_id)
+    media_type = "application/gzip" if path.endswith(".gz") else "text/csv"
+    return FileResponse(path, media_type=media_type, filename=path.split("/")[-1])
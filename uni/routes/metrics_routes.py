@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import PlainTextResponse
+from uni.utils.metrics import PROMETHEUS_CONTENT_TYPE, registry
+from uni.utils.slow_query import slow_query_log
+from uni.utils.security import is_admin_user
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    return PlainTextResponse(
+        registry.render_prometheus(), media_type=PROMETHEUS_CONTENT_TYPE
+    )
+
+
+@router.get("/metrics/slow_queries", dependencies=[Depends(is_admin_user)])
+async def slow_queries(limit: int = 20, order_by: str = "total"):
+    if order_by not in ("total", "avg", "p99", "count"):
+        raise HTTPException(status_code=400, detail="Invalid order_by")
+    return slow_query_log.top(min(limit, 200), order_by)
+
+
+@router.delete("/metrics/slow_queries", dependencies=[Depends(is_admin_user)])
+async def reset_slow_queries():
+    slow_query_log.reset()
+    return {"detail": "Slow query statistics cleared"}
@@ -1,12 +1,18 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 from uni.database.connection import get_db
-from uni.schemas.results import ResultCreate, ResultUpdate, ResultResponse
+from uni.schemas.results import (
+    ResultCreate,
+    ResultUpdate,
+    ResultResponse,
+    TranscriptResponse,
+)
 from uni.logics.results_logics import (
     create_result,
     update_result,
     delete_result,
     get_all,
+    get_transcript,
 )
 
 from uni.utils.security import get_current_user
@@ -14,6 +20,15 @@ from uni.utils.security import get_current_user
 router = APIRouter(prefix="/results", tags=["results"])
 
 
+@router.get("/transcript/{roll_number}", response_model=TranscriptResponse)
+async def read_transcript(
+    roll_number: str,
+    user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    return await get_transcript(db, roll_number, user)
+
+
 @router.get(
     "/{batch_name}/{subject_name}/{exam_type}", response_model=list[ResultResponse]
 )
@@ -21,14 +36,16 @@ async def get_all_results(
     batch_name: str,
     subject_name: str,
     exam_type: str,
+    semester: int = None,
+    term: int = None,
     user: dict = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    return await get_all(batch_name, subject_name, user, exam_type, db)
+    return await get_all(batch_name, subject_name, user, exam_type, db, semester, term)
 
 
 @router.post("/create", response_model=ResultResponse)
-async def create_result(
+async def add_result(
     result: ResultCreate,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user),
@@ -37,7 +54,7 @@ async def create_result(
 
 
 @router.put("/update/{result_id}", response_model=ResultResponse)
-async def update_result(
+async def edit_result(
     result_id: int,
     result: ResultUpdate,
     current_user: dict = Depends(get_current_user),
@@ -47,7 +64,7 @@ async def update_result(
 
 
 @router.delete("/delete/{result_id}")
-async def delete_result(
+async def remove_result(
     result_id: int,
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db),
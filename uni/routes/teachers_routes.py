@@ -7,6 +7,9 @@ from uni.schemas.teachers import (
     TeacherResponse,
     TeacherAssign,
     TeacherAssignResponse,
+    TeacherAssignBulk,
+    TeacherAssignBulkResponse,
+    TeachingAssignmentResponse,
 )
 from uni.logics.teachers_logics import (
     create,
@@ -15,7 +18,11 @@ from uni.logics.teachers_logics import (
     delete,
     get_all,
     assign_teacher,
+    assign_teachers_bulk,
 )
+from uni.logics.assignments_logics import get_teacher_assignments
+from uni.utils.security import is_admin_user
+from typing import List, Optional
 
 router = APIRouter(prefix="/teachers", tags=["teachers"])
 
@@ -48,3 +55,26 @@ async def get_all_teachers(db: Session = Depends(get_db)):
 @router.post("/assign", response_model=TeacherAssignResponse)
 async def assign_teacher_to_batch(teacher_data: TeacherAssign, db: Session = Depends(get_db)):
     return await assign_teacher(db, teacher_data)
+
+
+@router.post(
+    "/assign_bulk",
+    response_model=TeacherAssignBulkResponse,
+    dependencies=[Depends(is_admin_user)],
+)
+async def assign_teachers(data: TeacherAssignBulk, db: Session = Depends(get_db)):
+    return await assign_teachers_bulk(db, data)
+
+
+@router.get(
+    "/assignments/{teacher_id}",
+    response_model=List[TeachingAssignmentResponse],
+    dependencies=[Depends(is_admin_user)],
+)
+async def teacher_assignments(
+    teacher_id: int,
+    semester: Optional[int] = None,
+    include_history: bool = False,
+    db: Session = Depends(get_db),
+):
+    return await get_teacher_assignments(db, teacher_id, semester, include_history)
@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+from typing import Optional
+
+
+class AutocompleteResponse(BaseModel):
+    kind: str
+    id: int
+    label: str
+    roll_number: Optional[str] = None
+    email: Optional[str] = None
+    matched: str
+
+    class Config:
+        model_config = {"from_attributes": True}
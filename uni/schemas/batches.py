@@ -1,12 +1,14 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Dict, List, Optional
 from datetime import datetime
+from uni.schemas.results import ResultResponse
 
 
 class BatchCreate(BaseModel):
     batch_name: str
     department_id: int
     seats_limit: int
+    current_semester: int = 1
 
 
 class BatchUpdate(BaseModel):
@@ -27,6 +29,7 @@ class BatchResponse(BaseModel):
     batch_name: Optional[str] = None
     department_id: Optional[int] = None
     seats_limit: Optional[int] = None
+    current_semester: Optional[int] = None
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
@@ -41,3 +44,37 @@ class BatchDropdownResponse(BaseModel):
 
     class Config:
         model_config = {"from_attributes": True}
+
+
+class AdvanceSemesterResponse(BaseModel):
+    batch_name: str
+    current_semester: int
+    archived_assignments: int
+
+
+class BatchResultsPage(BaseModel):
+    items: List[ResultResponse]
+    next_cursor: Optional[str] = None
+
+
+class MarksheetSubject(BaseModel):
+    subject_id: int
+    subject_name: str
+
+
+class MarksheetRow(BaseModel):
+    student_id: int
+    roll_number: str
+    student_name: str
+    # subject_id -> percentage of the filtered exams, None when no result yet
+    marks: Dict[int, Optional[float]]
+    percentage: Optional[float] = None
+
+
+class MarksheetResponse(BaseModel):
+    batch_name: str
+    semester: Optional[int] = None
+    exam_type: Optional[str] = None
+    term: Optional[int] = None
+    subjects: List[MarksheetSubject]
+    rows: List[MarksheetRow]
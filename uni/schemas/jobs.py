@@ -0,0 +1,31 @@
+from pydantic import BaseModel
+from typing import Any, Optional
+from datetime import datetime
+
+
+class JobCreate(BaseModel):
+    kind: str
+    payload: dict = {}
+    max_attempts: Optional[int] = None
+
+
+class JobResponse(BaseModel):
+    job_id: int
+    kind: str
+    status: str
+    payload: Optional[dict] = None
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    progress: float
+    progress_message: Optional[str] = None
+    attempts: int
+    max_attempts: int
+    cancel_requested: bool
+    run_after: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    created_by: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+    class Config:
+        model_config = {"from_attributes": True}
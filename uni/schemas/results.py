@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from enum import Enum
 
@@ -42,6 +42,8 @@ class ResultResponse(BaseModel):
     batch_id: Optional[int] = None
     department_id: Optional[int] = None
     semester: Optional[int] = None
+    # Academic term of exam_date (YYYYN), the ``term`` filter of the reads
+    term: Optional[int] = None
     exam_type: Optional[ExamType] = None
     marks_obtained: Optional[float] = None
     total_marks: Optional[float] = None
@@ -52,3 +54,22 @@ class ResultResponse(BaseModel):
 
     class Config:
         model_config = {"from_attributes": True}
+
+
+class TranscriptEntry(BaseModel):
+    result_id: int
+    semester: int
+    subject_id: int
+    subject_name: Optional[str] = None
+    exam_type: str
+    marks_obtained: float
+    total_marks: float
+    grade: Optional[str] = None
+    exam_date: Optional[datetime] = None
+    archived: bool = False
+
+
+class TranscriptResponse(BaseModel):
+    student_id: int
+    roll_number: str
+    results: List[TranscriptEntry]
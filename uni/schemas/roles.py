@@ -0,0 +1,9 @@
+from enum import Enum
+
+
+# Kept free of pydantic/email-validator imports so the models can use it
+# without pulling the request schemas in at import time.
+class UserRole(str, Enum):
+    ADMIN = "admin"
+    STUDENT = "student"
+    TEACHER = "teacher"
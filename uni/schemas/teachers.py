@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from pydantic import EmailStr
 
@@ -55,3 +55,45 @@ class TeacherAssignResponse(BaseModel):
 
     class Config:
         model_config = {"from_attributes": True}
+
+
+class TeacherAssignItem(BaseModel):
+    teacher_id: int
+    batch_id: int
+    subject_id: int
+    semester: int
+    # Taken from the batch when omitted
+    department_id: Optional[int] = None
+
+
+class TeacherAssignBulk(BaseModel):
+    assignments: List[TeacherAssignItem]
+    dry_run: bool = False
+
+
+class AssignmentConflict(BaseModel):
+    index: int
+    teacher_id: int
+    batch_id: int
+    subject_id: int
+    semester: int
+    reason: str
+
+
+class TeacherAssignBulkResponse(BaseModel):
+    requested: int
+    valid: int
+    inserted: int
+    conflicts: List[AssignmentConflict]
+
+
+class TeachingAssignmentResponse(BaseModel):
+    assignment_id: int
+    teacher_id: int
+    # Legacy rows (live or archived) may lack these
+    department_id: Optional[int] = None
+    batch_id: int
+    subject_id: Optional[int] = None
+    semester: Optional[int] = None
+    active: bool
+    archived: bool
@@ -1,12 +1,6 @@
 from pydantic import BaseModel, EmailStr
 from typing import Optional
-from enum import Enum
-
-
-class UserRole(str, Enum):
-    ADMIN = "admin"
-    STUDENT = "student"
-    TEACHER = "teacher"
+from uni.schemas.roles import UserRole
 
 
 class UserCreate(BaseModel):
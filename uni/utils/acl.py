@@ -0,0 +1,116 @@
+import time
+from threading import Lock
+
+_BITS = 32
+_MASK = (1 << _BITS) - 1
+
+
+def pack(teacher_id: int, department_id: int, batch_id: int, subject_id: int) -> int:
+    """Pack one teaching assignment into a single int (32 bits per id)."""
+    return (
+        (teacher_id << (3 * _BITS))
+        | (department_id << (2 * _BITS))
+        | (batch_id << _BITS)
+        | subject_id
+    )
+
+
+def unpack(key: int):
+    return (
+        key >> (3 * _BITS),
+        (key >> (2 * _BITS)) & _MASK,
+        (key >> _BITS) & _MASK,
+        key & _MASK,
+    )
+
+
+class AssignmentACL:
+    """In-memory copy of ``teaching_assignments`` for permission checks.
+
+    Every (teacher_id, department_id, batch_id, subject_id) row is stored as one
+    packed int in a set, so a check is a single hash lookup and the whole table
+    costs a few dozen bytes per assignment. Teachers are also tracked on their
+    own so a bulk check can tell "no assignments at all" apart quickly.
+    """
+
+    def __init__(self):
+        self._keys = set()
+        self._teachers = {}  # teacher_id -> number of assignments
+        self._lock = Lock()
+        self.loaded = False
+        self.loaded_at = None  # time.monotonic() of the last load()
+
+    def __len__(self):
+        return len(self._keys)
+
+    def load(self, rows):
+        """Replace the contents from (teacher, department, batch, subject) rows."""
+        keys = set()
+        teachers = {}
+        for teacher_id, department_id, batch_id, subject_id in rows:
+            if None in (teacher_id, department_id, batch_id, subject_id):
+                continue
+            key = pack(teacher_id, department_id, batch_id, subject_id)
+            if key not in keys:
+                keys.add(key)
+                teachers[teacher_id] = teachers.get(teacher_id, 0) + 1
+        with self._lock:
+            self._keys = keys
+            self._teachers = teachers
+            self.loaded = True
+            self.loaded_at = time.monotonic()
+
+    def age(self) -> float:
+        """Seconds since the last load(), infinite if never loaded."""
+        if self.loaded_at is None:
+            return float("inf")
+        return time.monotonic() - self.loaded_at
+
+    def grant(self, teacher_id, department_id, batch_id, subject_id):
+        key = pack(teacher_id, department_id, batch_id, subject_id)
+        with self._lock:
+            if key not in self._keys:
+                self._keys.add(key)
+                self._teachers[teacher_id] = self._teachers.get(teacher_id, 0) + 1
+
+    def revoke_where(
+        self, teacher_id=None, department_id=None, batch_id=None, subject_id=None
+    ):
+        """Drop every assignment matching the given ids (None matches any).
+
+        Used when a teacher, batch or subject is deleted and the database
+        cascades its assignments away. It scans the set, which is fine for
+        these rare admin operations.
+        """
+        wanted = (teacher_id, department_id, batch_id, subject_id)
+        with self._lock:
+            removed = [
+                key
+                for key in self._keys
+                if all(w is None or w == v for w, v in zip(wanted, unpack(key)))
+            ]
+            for key in removed:
+                self._keys.discard(key)
+                owner = key >> (3 * _BITS)
+                self._teachers[owner] -= 1
+                if not self._teachers[owner]:
+                    del self._teachers[owner]
+        return len(removed)
+
+    def has_teacher(self, teacher_id) -> bool:
+        return teacher_id in self._teachers
+
+    def can_teacher_access(
+        self, teacher_id, department_id, batch_id, subject_id
+    ) -> bool:
+        return pack(teacher_id, department_id, batch_id, subject_id) in self._keys
+
+    def can_teacher_access_many(self, teacher_id, targets):
+        """Check many (department_id, batch_id, subject_id) targets at once."""
+        if teacher_id not in self._teachers:
+            return [False] * len(targets)
+        keys = self._keys
+        return [
+            pack(teacher_id, department_id, batch_id, subject_id) in keys
+            for department_id, batch_id, subject_id in targets
+        ]
@@ -0,0 +1,157 @@
+"""Token-budgeted conversation history for the chat agent.
+
+``ChatHistory`` keeps the model input as a list of Responses-style items
+(``{"role": ..., "content": ...}``, ``function_call`` and
+``function_call_output`` items) that is appended to in place, together with a
+running token estimate, so a turn costs O(new items) instead of rebuilding the
+whole transcript. Two things keep it inside ``token_budget``:
+
+* tool outputs older than ``tool_output_turns`` turns are replaced by a short
+  placeholder (the call item stays, since a call needs its output);
+* once over budget, the oldest turns (all but ``keep_turns``) are folded into
+  a single summary message at the top.
+
+The default summary is extractive (first words of each turn) so compaction
+never costs a model call; pass ``summarize`` to use something smarter.
+"""
+
+import os
+
+HISTORY_TOKEN_BUDGET = int(os.getenv("HISTORY_TOKEN_BUDGET", "6000"))
+HISTORY_KEEP_TURNS = int(os.getenv("HISTORY_KEEP_TURNS", "4"))
+HISTORY_TOOL_OUTPUT_TURNS = int(os.getenv("HISTORY_TOOL_OUTPUT_TURNS", "2"))
+HISTORY_SUMMARY_TOKENS = int(os.getenv("HISTORY_SUMMARY_TOKENS", "800"))
+
+STALE_TOOL_OUTPUT = "[tool output omitted]"
+SUMMARY_PREFIX = "Summary of the earlier conversation:\n"
+
+
+def estimate_tokens(item) -> int:
+    """Rough token count (4 characters per token plus per-item overhead)."""
+    if isinstance(item, str):
+        return len(item) // 4 + 1
+    size = 4
+    for key in ("content", "output", "arguments", "name"):
+        value = item.get(key)
+        if isinstance(value, str):
+            size += len(value) // 4 + 1
+        elif isinstance(value, list):
+            size += sum(
+                len(part.get("text", "")) // 4 + 1
+                for part in value
+                if isinstance(part, dict)
+            )
+    return size
+
+
+def _text(item) -> str:
+    content = item.get("content")
+    if isinstance(content, list):
+        return " ".join(
+            part.get("text", "") for part in content if isinstance(part, dict)
+        )
+    return content if isinstance(content, str) else ""
+
+
+def extractive_summary(previous: str, turns, max_tokens: int) -> str:
+    """One line per turn: the user's request and the start of the answer."""
+    lines = previous.splitlines() if previous else []
+    for turn in turns:
+        user = next((_text(i) for i in turn if i.get("role") == "user"), "")
+        answer = next(
+            (_text(i) for i in reversed(turn) if i.get("role") == "assistant"), ""
+        )
+        line = f"- User: {' '.join(user.split())[:160]}"
+        if answer:
+            line += f" | Assistant: {' '.join(answer.split())[:200]}"
+        lines.append(line)
+    # Keep the most recent lines that fit
+    kept, used = [], 0
+    for line in reversed(lines):
+        used += estimate_tokens(line)
+        if used > max_tokens:
+            break
+        kept.append(line)
+    return "\n".join(reversed(kept))
+
+
+class ChatHistory:
+    def __init__(
+        self,
+        token_budget: int = HISTORY_TOKEN_BUDGET,
+        keep_turns: int = HISTORY_KEEP_TURNS,
+        tool_output_turns: int = HISTORY_TOOL_OUTPUT_TURNS,
+        summary_tokens: int = HISTORY_SUMMARY_TOKENS,
+        summarize=extractive_summary,
+    ):
+        self.token_budget = token_budget
+        self.keep_turns = max(1, keep_turns)
+        self.tool_output_turns = max(1, tool_output_turns)
+        self.summary_tokens = summary_tokens
+        self.summarize = summarize
+        self.summary = ""
+        self.turns = []  # one list of items per user turn
+        self.tokens = 0
+        self.compactions = 0
+        self._items = []  # the model input, kept in sync with the turns
+
+    def __len__(self):
+        return len(self.turns)
+
+    def input_items(self) -> list:
+        """The model input for the next run (a shallow copy)."""
+        return list(self._items)
+
+    def add_user(self, content: str):
+        self.turns.append([])
+        self._append({"role": "user", "content": content})
+
+    def add_assistant(self, content: str):
+        self._append({"role": "assistant", "content": content})
+
+    def add_items(self, items):
+        """Items produced by an agent run (messages, tool calls and outputs)."""
+        for item in items:
+            self._append(item)
+
+    def end_turn(self):
+        """Age tool outputs and compact once the turn's items are all in."""
+        stale = len(self.turns) - self.tool_output_turns - 1
+        if stale >= 0:
+            self._drop_tool_outputs(self.turns[stale])
+        if self.tokens > self.token_budget and len(self.turns) > self.keep_turns:
+            self._compact()
+
+    def _append(self, item):
+        if not self.turns:
+            self.turns.append([])
+        self.turns[-1].append(item)
+        self._items.append(item)
+        self.tokens += estimate_tokens(item)
+
+    def _drop_tool_outputs(self, turn):
+        for index, item in enumerate(turn):
+            if (
+                item.get("type") == "function_call_output"
+                and item.get("output") != STALE_TOOL_OUTPUT
+            ):
+                stripped = {**item, "output": STALE_TOOL_OUTPUT}
+                self.tokens += estimate_tokens(stripped) - estimate_tokens(item)
+                turn[index] = stripped
+                # Same position in the flat list; identity, not equality
+                for position, existing in enumerate(self._items):
+                    if existing is item:
+                        self._items[position] = stripped
+                        break
+
+    def _compact(self):
+        old = self.turns[: -self.keep_turns]
+        self.turns = self.turns[-self.keep_turns :]
+        self.summary = self.summarize(self.summary, old, self.summary_tokens)
+        self._items = [item for turn in self.turns for item in turn]
+        if self.summary:
+            self._items.insert(
+                0, {"role": "system", "content": SUMMARY_PREFIX + self.summary}
+            )
+        self.tokens = sum(estimate_tokens(item) for item in self._items)
+        self.compactions += 1
@@ -0,0 +1,265 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from fastapi import HTTPException
+from sqlalchemy import select, update
+from uni.models import Job, JobStatus
+
+logger = logging.getLogger(__name__)
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class PermanentJobError(Exception):
+    """Raise from a handler to fail the job without retrying it."""
+
+
+class JobContext:
+    """Handed to every job handler to report progress.
+
+    ``progress()`` is also the cancellation point: it raises ``JobCancelled``
+    once a cancel was requested for the job. The lease is kept by the pool's
+    heartbeat, so a handler need not report progress to stay alive.
+    """
+
+    def __init__(self, pool, job_id: int, attempt: int):
+        self.pool = pool
+        self.job_id = job_id
+        self.attempt = attempt
+
+    async def progress(self, fraction: float, message: str = None):
+        now = datetime.utcnow()
+        async with self.pool.session_factory() as db:
+            await db.execute(
+                update(Job)
+                .where(Job.job_id == self.job_id)
+                .values(
+                    progress=max(0.0, min(1.0, fraction)),
+                    progress_message=message,
+                    heartbeat_at=now,
+                )
+            )
+            result = await db.execute(
+                select(Job.cancel_requested).where(Job.job_id == self.job_id)
+            )
+            cancel_requested = result.scalar()
+            await db.commit()
+        if cancel_requested:
+            raise JobCancelled()
+
+
+class JobWorkerPool:
+    """asyncio workers that run jobs stored in the ``jobs`` table.
+
+    A job is claimed with a conditional UPDATE (queued -> running), so several
+    processes can share the table without double-running a job. Failures are
+    retried with exponential backoff until ``max_attempts``; 4xx
+    ``HTTPException`` and ``PermanentJobError`` fail immediately. While a
+    handler runs, a heartbeat task refreshes the job's ``heartbeat_at`` every
+    ``lease_seconds / 3``; running jobs whose heartbeat is older than
+    ``lease_seconds`` (a worker died) go back to the queue on start.
+    """
+
+    def __init__(
+        self,
+        session_factory,
+        handlers: dict,
+        workers: int = 2,
+        poll_interval: float = 2.0,
+        retry_base: float = 5.0,
+        retry_max: float = 300.0,
+        lease_seconds: float = 300.0,
+    ):
+        self.session_factory = session_factory
+        self.handlers = handlers
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.lease_seconds = lease_seconds
+        self.heartbeat_interval = lease_seconds / 3
+        self._tasks = []
+        self._running = {}  # job_id -> asyncio.Task of the handler
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+
+    def notify(self):
+        """Wake an idle worker right away instead of at the next poll."""
+        self._wakeup.set()
+
+    def cancel_running(self, job_id: int) -> bool:
+        task = self._running.get(job_id)
+        if task is None:
+            return False
+        task.cancel()
+        return True
+
+    async def start(self):
+        if self._tasks or self.workers <= 0:
+            return
+        self._stopping = False
+        try:
+            await self.recover_stale()
+        except Exception as e:
+            logger.warning(f"Could not requeue stale jobs: {str(e)}")
+        self._tasks = [
+            asyncio.create_task(self._worker(i)) for i in range(self.workers)
+        ]
+        logger.info(f"Started {self.workers} job workers")
+
+    async def stop(self):
+        self._stopping = True
+        self._wakeup.set()
+        for task in self._running.values():
+            task.cancel()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def recover_stale(self):
+        cutoff = datetime.utcnow() - timedelta(seconds=self.lease_seconds)
+        async with self.session_factory() as db:
+            result = await db.execute(
+                update(Job)
+                .where(
+                    Job.status == JobStatus.RUNNING.value,
+                    Job.heartbeat_at < cutoff,
+                )
+                .values(status=JobStatus.QUEUED.value, run_after=datetime.utcnow())
+            )
+            await db.commit()
+        if result.rowcount:
+            logger.warning(f"Requeued {result.rowcount} stale job(s)")
+
+    async def _worker(self, number: int):
+        while not self._stopping:
+            try:
+                claimed = await self._claim()
+            except Exception as e:
+                logger.error(f"Job worker {number} failed to poll: {str(e)}")
+                claimed = None
+            if claimed is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._run(*claimed)
+
+    async def _claim(self):
+        now = datetime.utcnow()
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(Job.job_id)
+                .where(Job.status == JobStatus.QUEUED.value, Job.run_after <= now)
+                .order_by(Job.run_after, Job.job_id)
+                .limit(self.workers)
+            )
+            for job_id in result.scalars().all():
+                claimed = await db.execute(
+                    update(Job)
+                    .where(Job.job_id == job_id, Job.status == JobStatus.QUEUED.value)
+                    .values(
+                        status=JobStatus.RUNNING.value,
+                        attempts=Job.attempts + 1,
+                        started_at=now,
+                        heartbeat_at=now,
+                    )
+                )
+                if claimed.rowcount != 1:
+                    continue  # another worker got it first
+                await db.commit()
+                result = await db.execute(
+                    select(Job.kind, Job.payload, Job.attempts, Job.max_attempts).where(
+                        Job.job_id == job_id
+                    )
+                )
+                return (job_id, *result.one())
+        return None
+
+    async def _heartbeat(self, job_id: int):
+        """Keep a running job's lease, however long the handler goes quiet."""
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                async with self.session_factory() as db:
+                    await db.execute(
+                        update(Job)
+                        .where(
+                            Job.job_id == job_id,
+                            Job.status == JobStatus.RUNNING.value,
+                        )
+                        .values(heartbeat_at=datetime.utcnow())
+                    )
+                    await db.commit()
+            except Exception as e:
+                logger.warning(f"Job {job_id} heartbeat failed: {str(e)}")
+
+    async def _finish(self, job_id: int, **values):
+        values.setdefault("finished_at", datetime.utcnow())
+        async with self.session_factory() as db:
+            await db.execute(update(Job).where(Job.job_id == job_id).values(**values))
+            await db.commit()
+
+    async def _run(self, job_id, kind, payload, attempts, max_attempts):
+        handler = self.handlers.get(kind)
+        if handler is None:
+            await self._finish(
+                job_id, status=JobStatus.FAILED.value, error=f"Unknown job kind {kind}"
+            )
+            return
+
+        context = JobContext(self, job_id, attempts)
+        task = asyncio.create_task(handler(context, payload or {}))
+        self._running[job_id] = task
+        heartbeat = asyncio.create_task(self._heartbeat(job_id))
+        try:
+            result = await task
+        except (JobCancelled, asyncio.CancelledError):
+            if self._stopping:
+                # Shutting down: hand the job back instead of losing it
+                await self._finish(
+                    job_id,
+                    status=JobStatus.QUEUED.value,
+                    attempts=max(attempts - 1, 0),
+                    finished_at=None,
+                )
+                raise
+            await self._finish(job_id, status=JobStatus.CANCELLED.value)
+            logger.info(f"Job {job_id} ({kind}) cancelled")
+        except Exception as e:
+            permanent = isinstance(e, PermanentJobError) or (
+                isinstance(e, HTTPException) and e.status_code < 500
+            )
+            error = e.detail if isinstance(e, HTTPException) else str(e)
+            if permanent or attempts >= max_attempts:
+                await self._finish(job_id, status=JobStatus.FAILED.value, error=error)
+                logger.error(f"Job {job_id} ({kind}) failed: {error}")
+            else:
+                delay = min(self.retry_max, self.retry_base * 2 ** (attempts - 1))
+                await self._finish(
+                    job_id,
+                    status=JobStatus.QUEUED.value,
+                    error=error,
+                    run_after=datetime.utcnow() + timedelta(seconds=delay),
+                    finished_at=None,
+                )
+                logger.warning(
+                    f"Job {job_id} ({kind}) attempt {attempts} failed, "
+                    f"retrying in {delay:.0f}s: {error}"
+                )
+        else:
+            await self._finish(
+                job_id,
+                status=JobStatus.SUCCEEDED.value,
+                result=result,
+                error=None,
+                progress=1.0,
+            )
+        finally:
+            heartbeat.cancel()
+            self._running.pop(job_id, None)
@@ -0,0 +1,368 @@
+import os
+import time
+import logging
+from collections import Counter
+from contextvars import ContextVar
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+from sqlalchemy import event
+from uni.utils.ttl_cache import CACHES
+
+logger = logging.getLogger(__name__)
+
+QUERY_BUDGET = int(os.getenv("QUERY_BUDGET", "15"))
+REPEATED_STATEMENT_LIMIT = int(os.getenv("REPEATED_STATEMENT_LIMIT", "5"))
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+FRAME_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class RequestStats:
+    """Per-request (or per agent tool call) database accounting."""
+
+    __slots__ = ("statements", "db_time", "rows", "sql")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_time = 0.0
+        self.rows = 0
+        self.sql = Counter()
+
+
+_current_stats: ContextVar = ContextVar("request_stats", default=None)
+
+
+def start_tracking():
+    stats = RequestStats()
+    return stats, _current_stats.set(stats)
+
+
+def stop_tracking(token):
+    _current_stats.reset(token)
+
+
+def current_stats():
+    return _current_stats.get()
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "total", "count")
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.total += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+
+class RouteMetrics:
+    __slots__ = ("latency", "db_time", "statements", "rows", "budget_exceeded")
+
+    def __init__(self):
+        self.latency = Histogram()
+        self.db_time = Histogram()
+        self.statements = 0
+        self.rows = 0
+        self.budget_exceeded = 0
+
+
+class StreamMetrics:
+    """Streamed agent replies: model deltas in, websocket frames out."""
+
+    __slots__ = ("messages", "deltas", "frames", "frames_per_message")
+
+    def __init__(self):
+        self.messages = 0
+        self.deltas = 0
+        self.frames = 0
+        self.frames_per_message = Histogram(FRAME_BUCKETS)
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._routes = {}
+        self._stream = StreamMetrics()
+        self._lock = Lock()
+
+    def record(self, method, route, status, elapsed, stats: RequestStats):
+        key = (method, route, status)
+        with self._lock:
+            metrics = self._routes.get(key)
+            if metrics is None:
+                metrics = self._routes[key] = RouteMetrics()
+            metrics.latency.observe(elapsed)
+            metrics.db_time.observe(stats.db_time)
+            metrics.statements += stats.statements
+            metrics.rows += stats.rows
+            if stats.statements > QUERY_BUDGET:
+                metrics.budget_exceeded += 1
+
+    def record_stream(self, deltas: int, frames: int):
+        with self._lock:
+            self._stream.messages += 1
+            self._stream.deltas += deltas
+            self._stream.frames += frames
+            self._stream.frames_per_message.observe(frames)
+
+    def stream_snapshot(self) -> dict:
+        with self._lock:
+            stream = self._stream
+            return {
+                "messages": stream.messages,
+                "deltas": stream.deltas,
+                "frames": stream.frames,
+            }
+
+    def reset(self):
+        with self._lock:
+            self._routes = {}
+            self._stream = StreamMetrics()
+
+    def snapshot(self, method: str = None) -> dict:
+        """Totals per (method, route, status), e.g. for a benchmark report."""
+        with self._lock:
+            items = list(self._routes.items())
+        return {
+            key: {
+                "count": metrics.latency.count,
+                "latency_s": metrics.latency.total,
+                "db_time_s": metrics.db_time.total,
+                "statements": metrics.statements,
+                "rows": metrics.rows,
+            }
+            for key, metrics in items
+            if method is None or key[0] == method
+        }
+
+    def render_prometheus(self) -> str:
+        lines = []
+        with self._lock:
+            items = sorted(self._routes.items())
+            stream = self._stream
+
+        def histogram(name, help_text, attr):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for (method, route, status), metrics in items:
+                hist = getattr(metrics, attr)
+                labels = f'method="{method}",route="{route}",status="{status}"'
+                cumulative = 0
+                for bound, count in zip(hist.buckets, hist.counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {hist.count}')
+                lines.append(f"{name}_sum{{{labels}}} {hist.total:.6f}")
+                lines.append(f"{name}_count{{{labels}}} {hist.count}")
+
+        def counter(name, help_text, attr):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for (method, route, status), metrics in items:
+                labels = f'method="{method}",route="{route}",status="{status}"'
+                lines.append(f"{name}{{{labels}}} {getattr(metrics, attr)}")
+
+        histogram(
+            "ums_request_duration_seconds", "Request latency per route.", "latency"
+        )
+        histogram("ums_request_db_seconds", "Time spent in SQL per request.", "db_time")
+        counter(
+            "ums_db_statements_total", "SQL statements issued per route.", "statements"
+        )
+        counter("ums_db_rows_total", "Rows returned by SQL per route.", "rows")
+        counter(
+            "ums_query_budget_exceeded_total",
+            f"Requests issuing more than {QUERY_BUDGET} statements.",
+            "budget_exceeded",
+        )
+
+        for name, help_text, value in (
+            ("ums_agent_stream_messages_total", "Streamed replies.", stream.messages),
+            ("ums_agent_stream_deltas_total", "Model text deltas.", stream.deltas),
+            ("ums_agent_stream_frames_total", "Frames sent.", stream.frames),
+        ):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            lines.append(f"{name} {value}")
+        hist = stream.frames_per_message
+        name = "ums_agent_stream_frames_per_message"
+        lines.append(f"# HELP {name} Frames sent per streamed reply.")
+        lines.append(f"# TYPE {name} histogram")
+        cumulative = 0
+        for bound, count in zip(hist.buckets, hist.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{le="+Inf"}} {hist.count}')
+        lines.append(f"{name}_sum {hist.total:.0f}")
+        lines.append(f"{name}_count {hist.count}")
+
+        caches = sorted(CACHES.items())
+        for name, help_text, attr in (
+            ("ums_cache_hits_total", "In-process cache hits.", "hits"),
+            ("ums_cache_misses_total", "In-process cache misses.", "misses"),
+            ("ums_cache_evictions_total", "LRU evictions.", "evictions"),
+            ("ums_cache_invalidations_total", "Invalidated entries.", "invalidations"),
+        ):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for cache_name, cache in caches:
+                lines.append(f'{name}{{cache="{cache_name}"}} {getattr(cache, attr)}')
+        lines.append("# HELP ums_cache_entries Entries currently cached.")
+        lines.append("# TYPE ums_cache_entries gauge")
+        for cache_name, cache in caches:
+            lines.append(f'ums_cache_entries{{cache="{cache_name}"}} {len(cache)}')
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+# =========================
+# Standalone endpoint
+# =========================
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = registry.render_prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_metrics_servers = {}
+
+
+def serve_metrics(port: int, host: str = "0.0.0.0"):
+    """Serve this process's ``registry`` on ``http://host:port/metrics``.
+
+    For the processes without the FastAPI app (the chainlit agent, the MCP
+    server): their tool, stream and cache metrics live in their own registry.
+    Runs in a daemon thread; a second call for the same port (e.g. a chainlit
+    reload re-importing the module) returns the running server.
+    """
+    server = _metrics_servers.get(port)
+    if server is None:
+        server = ThreadingHTTPServer((host, port), _MetricsHandler)
+        _metrics_servers[port] = server
+        Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+        logger.info(f"Serving metrics on {host}:{port}/metrics")
+    return server
+
+
+# =========================
+# SQLAlchemy hooks
+# =========================
+# Called with (statement, elapsed seconds) after every statement, e.g. by the
+# slow query log, so each statement is timed once by the hooks below
+_statement_observers = []
+
+
+def add_statement_observer(observer):
+    _statement_observers.append(observer)
+
+
+def install_query_hooks(engine):
+    """Attach statement timing to an engine (sync or the sync side of async)."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        for observer in _statement_observers:
+            observer(statement, elapsed)
+        stats = _current_stats.get()
+        if stats is None:
+            return
+        stats.statements += 1
+        stats.db_time += elapsed
+        rowcount = getattr(cursor, "rowcount", -1)
+        if rowcount and rowcount > 0:
+            stats.rows += rowcount
+        stats.sql[statement] += 1
+
+
+# =========================
+# ASGI middleware
+# =========================
+class MetricsMiddleware:
+    """Records latency, DB time and statement counts for every HTTP request.
+
+    Adds a ``Server-Timing`` header so the numbers show up in browser devtools,
+    and logs routes that go over ``QUERY_BUDGET`` statements or repeat the same
+    statement ``REPEATED_STATEMENT_LIMIT`` times (the usual N+1 shape).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        started = time.perf_counter()
+        stats, token = start_tracking()
+        status_holder = {"status": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_holder["status"] = message["status"]
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                header = (
+                    f"app;dur={elapsed_ms:.1f}, db;dur={stats.db_time * 1000:.1f};"
+                    f'desc="{stats.statements} queries"'
+                )
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [
+                    (b"server-timing", header.encode())
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            stop_tracking(token)
+            elapsed = time.perf_counter() - started
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            registry.record(
+                scope["method"], route_path, status_holder["status"], elapsed, stats
+            )
+            check_query_budget(f"{scope['method']} {route_path}", stats)
+
+
+def check_query_budget(label: str, stats: RequestStats):
+    if stats.statements > QUERY_BUDGET:
+        logger.warning(
+            f"Query budget exceeded on {label}: {stats.statements} statements "
+            f"(budget {QUERY_BUDGET}), {stats.db_time * 1000:.1f} ms in DB"
+        )
+    if stats.sql:
+        statement, count = stats.sql.most_common(1)[0]
+        if count >= REPEATED_STATEMENT_LIMIT:
+            logger.warning(
+                f"Possible N+1 on {label}: statement repeated {count} times: "
+                f"{' '.join(statement.split())[:200]}"
+            )
@@ -0,0 +1,43 @@
+import base64
+import json
+from datetime import datetime
+from fastapi import HTTPException
+
+
+def encode_cursor(*values) -> str:
+    """Opaque keyset cursor holding the sort key of the last row of a page."""
+    raw = json.dumps(
+        [
+            value.isoformat() if isinstance(value, datetime) else value
+            for value in values
+        ]
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _parse(value, expected: type):
+    if expected is datetime:
+        return datetime.fromisoformat(value)
+    if isinstance(value, bool):
+        raise TypeError("bool in cursor")
+    if expected is float and isinstance(value, int):
+        return float(value)
+    if not isinstance(value, expected):
+        raise TypeError(f"expected {expected.__name__}")
+    return value
+
+
+def decode_cursor(cursor: str, *types) -> list:
+    """The values of an ``encode_cursor`` cursor, one per type in ``types``.
+
+    Datetimes are parsed back from ISO format. A cursor that does not decode
+    or whose values do not match ``types`` is a 400.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError("wrong number of values")
+        return [_parse(value, expected) for value, expected in zip(values, types)]
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
@@ -0,0 +1,124 @@
+from bisect import bisect_left, insort
+from threading import Lock
+
+
+class PrefixIndex:
+    """Sorted-array prefix index for typeahead lookups.
+
+    Every indexed record is identified by a ``(kind, ref_id)`` pair and can be
+    reachable through several search keys (roll number, first name, full name,
+    email...). Keys are kept in one sorted list so a prefix lookup is a single
+    ``bisect`` followed by a short forward scan.
+    """
+
+    def __init__(self, max_entries: int = 200_000, max_key_length: int = 64):
+        self.max_entries = max_entries
+        self.max_key_length = max_key_length
+        self._keys = []  # sorted list of (key, kind, ref_id)
+        self._records = {}  # (kind, ref_id) -> payload dict
+        self._record_keys = {}  # (kind, ref_id) -> list of keys
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._keys)
+
+    @staticmethod
+    def normalize(value) -> str:
+        return " ".join(str(value).lower().split()) if value else ""
+
+    def clear(self):
+        with self._lock:
+            self._keys = []
+            self._records = {}
+            self._record_keys = {}
+
+    def add(self, kind: str, ref_id, payload: dict, keys):
+        """Insert or replace a record and all of its search keys."""
+        ref = (kind, ref_id)
+        normalized = []
+        for key in keys:
+            key = self.normalize(key)[: self.max_key_length]
+            if key and key not in normalized:
+                normalized.append(key)
+
+        with self._lock:
+            self._remove_locked(ref)
+            if len(self._keys) + len(normalized) > self.max_entries:
+                return False
+            for key in normalized:
+                insort(self._keys, (key, kind, ref_id))
+            self._records[ref] = payload
+            self._record_keys[ref] = normalized
+        return True
+
+    def bulk_load(self, records):
+        """Replace the whole index from ``(kind, ref_id, payload, keys)`` rows.
+
+        Sorting once is much cheaper than ``insort`` per row at startup.
+        """
+        keys = []
+        record_map = {}
+        record_keys = {}
+        for kind, ref_id, payload, raw_keys in records:
+            normalized = []
+            for key in raw_keys:
+                key = self.normalize(key)[: self.max_key_length]
+                if key and key not in normalized:
+                    normalized.append(key)
+            if len(keys) + len(normalized) > self.max_entries:
+                break
+            keys.extend((key, kind, ref_id) for key in normalized)
+            record_map[(kind, ref_id)] = payload
+            record_keys[(kind, ref_id)] = normalized
+        keys.sort()
+
+        with self._lock:
+            self._keys = keys
+            self._records = record_map
+            self._record_keys = record_keys
+
+    def remove(self, kind: str, ref_id):
+        with self._lock:
+            self._remove_locked((kind, ref_id))
+
+    def get(self, kind: str, ref_id):
+        return self._records.get((kind, ref_id))
+
+    def search(self, prefix: str, limit: int = 10, kind: str = None):
+        """Return up to ``limit`` payloads whose keys start with ``prefix``."""
+        prefix = self.normalize(prefix)
+        if not prefix:
+            return []
+
+        keys = self._keys
+        records = self._records
+        matches = []
+        seen = set()
+        position = bisect_left(keys, (prefix,))
+        while position < len(keys) and len(matches) < limit:
+            key, entry_kind, ref_id = keys[position]
+            if not key.startswith(prefix):
+                break
+            position += 1
+            if kind and entry_kind != kind:
+                continue
+            ref = (entry_kind, ref_id)
+            if ref in seen:
+                continue
+            seen.add(ref)
+            payload = records.get(ref)
+            if payload is not None:
+                matches.append({**payload, "matched": key})
+        return matches
+
+    def _remove_locked(self, ref):
+        kind, ref_id = ref
+        for key in self._record_keys.pop(ref, []):
+            position = bisect_left(self._keys, (key, kind, ref_id))
+            if position < len(self._keys) and self._keys[position] == (
+                key,
+                kind,
+                ref_id,
+            ):
+                del self._keys[position]
+        self._records.pop(ref, None)
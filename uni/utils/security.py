@@ -1,4 +1,9 @@
 from datetime import datetime, timedelta
+from functools import wraps
+import hashlib
+import inspect
+import logging
+import time
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from typing import Optional
@@ -6,6 +11,9 @@ from jose import JWTError, jwt  # type: ignore
 import os
 from dotenv import load_dotenv
 from fastapi.security import OAuth2PasswordBearer
+from uni.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/users/login")
@@ -15,6 +23,12 @@ load_dotenv()
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM")
+# With an asymmetric ALGORITHM (RS256, ES256, ...) SECRET_KEY is the private
+# key that signs and JWT_PUBLIC_KEY the key that verifies
+JWT_PUBLIC_KEY = os.getenv("JWT_PUBLIC_KEY") or SECRET_KEY
+JWT_CACHE_MAX_ENTRIES = int(os.getenv("JWT_CACHE_MAX_ENTRIES", "10000"))
+# A verified token is cached until its exp, but at most this long
+JWT_CACHE_TTL = float(os.getenv("JWT_CACHE_TTL", "300"))
 ADMIN_EMAIL = os.getenv("ADMIN_EMAIL")
 ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD")
 ADMIN_SECRET = os.getenv("ADMIN_SECRET")
@@ -30,18 +44,35 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
         to_encode.update({"exp": expire})
         jwt_token = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
         return jwt_token
-    except Exception as e:
-        print(f"Error creating access token: {e}")
+    except Exception:
+        logger.exception("Error creating access token")
         return None
 
 
+# Verified tokens by SHA-256 of the token, so a request with a token seen
+# before skips the signature check. Only valid tokens are cached.
+_verified_tokens = TTLCache(
+    "jwt", ttl=JWT_CACHE_TTL, max_entries=JWT_CACHE_MAX_ENTRIES
+)
+
+
 def verify_access_token(token: str):
+    key = hashlib.sha256(token.encode()).digest()
+    payload = _verified_tokens.get(key)
+    if payload is not None:
+        return dict(payload)
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
+        payload = jwt.decode(token, JWT_PUBLIC_KEY, algorithms=[ALGORITHM])
     except JWTError as e:
-        print(f"JWT Verification Error: {e}")
+        logger.info("JWT verification failed: %s", e)
         return None
+    expires_at = payload.get("exp")
+    ttl = JWT_CACHE_TTL
+    if isinstance(expires_at, (int, float)):
+        ttl = min(ttl, expires_at - time.time())
+    if ttl > 0:
+        _verified_tokens.set(key, dict(payload), ttl=ttl)
+    return payload
 
 
 def get_current_user(token: str = Depends(oauth2_scheme)):
@@ -88,11 +119,16 @@ def is_admin_user(user: dict = Depends(get_current_user)):
 
 def role_required(allowed_roles: list):
     def decorator(func):
-        def wrapper(*args, **kwargs):
-            user = kwargs.get("current_user")
+        signature = inspect.signature(func)
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            # current_user may be passed positionally by the routes
+            arguments = signature.bind_partial(*args, **kwargs).arguments
+            user = arguments.get("current_user")
             if not user or user["user_role"] not in allowed_roles:
                 raise HTTPException(status_code=403, detail="Access denied")
-            return func(*args, **kwargs)
+            return await func(*args, **kwargs)
 
         return wrapper
 
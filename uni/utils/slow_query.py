@@ -0,0 +1,151 @@
+import os
+import re
+import sys
+import logging
+from collections import OrderedDict, deque
+from functools import lru_cache
+from threading import Lock
+from greenlet import getcurrent
+from uni.utils.metrics import add_statement_observer
+
+logger = logging.getLogger(__name__)
+
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+SLOW_QUERY_MAX_FINGERPRINTS = int(os.getenv("SLOW_QUERY_MAX_FINGERPRINTS", "500"))
+SLOW_QUERY_SAMPLES = 256
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+# (?<!:) leaves Postgres ::type casts alone
+_BIND_PARAM = re.compile(r"\$\d+|%\(\w+\)s|%s|(?<!:):\w+|\?")
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*\?\s*,?)+\)", re.IGNORECASE)
+_POSTCOMPILE = re.compile(r"\(__\[POSTCOMPILE_\w+\]\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(statement: str) -> str:
+    """Normalize a statement so that calls differing only in values collapse."""
+    sql = _STRING_LITERAL.sub("?", statement)
+    sql = _POSTCOMPILE.sub("(?)", sql)
+    sql = _BIND_PARAM.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = _IN_LIST.sub("IN (...)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+class FingerprintStats:
+    __slots__ = ("count", "total", "max", "samples", "slow_count", "last_origin")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = deque(maxlen=SLOW_QUERY_SAMPLES)
+        self.slow_count = 0
+        self.last_origin = None
+
+    def percentile(self, pct: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+
+class SlowQueryLog:
+    """Bounded per-fingerprint statistics, least recently seen evicted first."""
+
+    def __init__(self, max_fingerprints=SLOW_QUERY_MAX_FINGERPRINTS):
+        self.max_fingerprints = max_fingerprints
+        self._stats = OrderedDict()
+        self._lock = Lock()
+
+    def record(self, statement: str, elapsed: float, origin: str = None):
+        key = fingerprint(statement)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                if len(self._stats) >= self.max_fingerprints:
+                    self._stats.popitem(last=False)
+                stats = self._stats[key] = FingerprintStats()
+            else:
+                self._stats.move_to_end(key)
+            stats.count += 1
+            stats.total += elapsed
+            stats.samples.append(elapsed)
+            if elapsed > stats.max:
+                stats.max = elapsed
+            if origin:
+                stats.slow_count += 1
+                stats.last_origin = origin
+
+    def top(self, limit: int = 20, order_by: str = "total"):
+        with self._lock:
+            rows = [
+                {
+                    "fingerprint": key,
+                    "count": stats.count,
+                    "total_ms": round(stats.total * 1000, 3),
+                    "avg_ms": round(stats.total / stats.count * 1000, 3),
+                    "p99_ms": round(stats.percentile(99) * 1000, 3),
+                    "max_ms": round(stats.max * 1000, 3),
+                    "slow_count": stats.slow_count,
+                    "last_origin": stats.last_origin,
+                }
+                for key, stats in self._stats.items()
+            ]
+        sort_key = {
+            "total": "total_ms",
+            "avg": "avg_ms",
+            "p99": "p99_ms",
+            "count": "count",
+        }[order_by]
+        rows.sort(key=lambda row: row[sort_key], reverse=True)
+        return rows[:limit]
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+slow_query_log = SlowQueryLog()
+
+
+def _logics_frame(frame):
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith("uni.logics."):
+            return f"{module}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return None
+
+
+def find_origin():
+    """Name the uni.logics function that issued the current statement.
+
+    Under AsyncSession the cursor events run inside SQLAlchemy's greenlet, so
+    the awaiting logics coroutine is on the parent greenlet's stack.
+    """
+    origin = _logics_frame(sys._getframe(2))
+    if origin is None:
+        parent = getcurrent().parent
+        if parent is not None:
+            origin = _logics_frame(parent.gr_frame)
+    return origin or "unknown"
+
+
+def _observe_statement(statement: str, elapsed: float):
+    origin = None
+    if elapsed >= SLOW_QUERY_THRESHOLD_MS / 1000:
+        origin = find_origin()
+        logger.warning(
+            f"Slow query ({elapsed * 1000:.1f} ms) from {origin}: "
+            f"{fingerprint(statement)[:500]}"
+        )
+    slow_query_log.record(statement, elapsed, origin)
+
+
+def install_slow_query_log():
+    """Feed the timings of ``install_query_hooks`` into the slow query log."""
+    add_statement_observer(_observe_statement)
@@ -0,0 +1,48 @@
+"""Academic terms: the calendar periods results are partitioned and archived by.
+
+A batch's ``semester`` is an ordinal (its 1st, 2nd, ... term), shared by every
+cohort. The academic term is the period an exam was actually held in, so all
+results of one term sit together whichever semester each batch was in.
+
+A term is encoded as ``YYYYN``: the year it starts in and its number within
+that year, counting the months in ACADEMIC_TERM_START_MONTHS (e.g. with the
+default "1,7", 20261 is January-June 2026 and 20262 July-December 2026; with
+"2,9" a January exam still belongs to the previous year's second term).
+"""
+
+import os
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import case, extract
+
+TERM_START_MONTHS = sorted(
+    int(month) for month in os.getenv("ACADEMIC_TERM_START_MONTHS", "1,7").split(",")
+)
+
+
+def academic_term(when: Optional[datetime]) -> Optional[int]:
+    if when is None:
+        return None
+    started = sum(1 for month in TERM_START_MONTHS if month <= when.month)
+    if not started:
+        return (when.year - 1) * 10 + len(TERM_START_MONTHS)
+    return when.year * 10 + started
+
+
+def next_term(term: int) -> int:
+    year, number = divmod(term, 10)
+    if number < len(TERM_START_MONTHS):
+        return term + 1
+    return (year + 1) * 10 + 1
+
+
+def term_expression(column):
+    """``academic_term`` of a date column, as SQL (for backfills)."""
+    year, month = extract("year", column), extract("month", column)
+    return case(
+        *(
+            (month >= start, year * 10 + number)
+            for number, start in reversed(list(enumerate(TERM_START_MONTHS, 1)))
+        ),
+        else_=(year - 1) * 10 + len(TERM_START_MONTHS),
+    )
@@ -0,0 +1,88 @@
+"""Coalescing of streamed model deltas into fewer client frames.
+
+The model streams a reply as many small text deltas; sending each one with
+``msg.stream_token`` costs a websocket frame per delta. ``TokenCoalescer``
+buffers deltas and sends them as one frame once ``max_chars`` characters are
+buffered or ``max_delay`` seconds have passed since the last frame, and
+sends whatever is left on ``close()``.
+
+It adapts to the stream: the first delta, and any delta arriving after a
+quiet gap longer than ``max_delay``, is sent right away, so slow streams and
+the time to first token are unaffected; only bursts are merged, and a
+buffered delta waits at most ``max_delay``.
+
+``close()`` records each message's deltas and frames in the metrics registry
+of the chainlit process, exposed with ``serve_metrics`` on AGENT_METRICS_PORT.
+"""
+
+import asyncio
+import os
+import time
+from uni.utils.metrics import registry
+
+STREAM_FLUSH_MS = float(os.getenv("STREAM_FLUSH_MS", "20"))
+STREAM_FLUSH_CHARS = int(os.getenv("STREAM_FLUSH_CHARS", "256"))
+
+
+class TokenCoalescer:
+    def __init__(
+        self,
+        send,
+        max_delay: float = STREAM_FLUSH_MS / 1000,
+        max_chars: int = STREAM_FLUSH_CHARS,
+        record_metrics: bool = True,
+    ):
+        self.send = send
+        self.max_delay = max_delay
+        self.max_chars = max_chars
+        self.record_metrics = record_metrics
+        self.deltas = 0
+        self.frames = 0
+        self._buffer = []
+        self._size = 0
+        self._last_flush = float("-inf")
+        self._timer = None
+        self._pending = None
+        # Frames go out in order even when a timer flush and a size flush
+        # overlap
+        self._lock = asyncio.Lock()
+
+    async def push(self, token: str):
+        if not token:
+            return
+        self.deltas += 1
+        self._buffer.append(token)
+        self._size += len(token)
+        waited = time.monotonic() - self._last_flush
+        if self._size >= self.max_chars or waited >= self.max_delay:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                self.max_delay - waited, self._flush_later
+            )
+
+    async def flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        async with self._lock:
+            if not self._buffer:
+                return
+            text = "".join(self._buffer)
+            self._buffer.clear()
+            self._size = 0
+            self._last_flush = time.monotonic()
+            self.frames += 1
+            await self.send(text)
+
+    async def close(self):
+        """Send what is buffered and record the message's frame count."""
+        await self.flush()
+        if self._pending is not None:
+            await self._pending
+        if self.record_metrics and self.deltas:
+            registry.record_stream(self.deltas, self.frames)
+
+    def _flush_later(self):
+        self._timer = None
+        self._pending = asyncio.ensure_future(self.flush())